@@ -0,0 +1,152 @@
+"""
+This file `benchmark_jit_compile.py` compares the training step of the DenseModel with and without the XLA
+compilation (`jit_compile` in the model section of the input file), for a few mesh and network sizes of the
+poisson problem on the unit square.
+
+For every configuration, it reports the time of the first step, which includes the tracing and the
+compilation, the median time per step of the following steps, and the speedup of the XLA compiled step.
+
+Usage: python benchmark_jit_compile.py [n_steps]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+from rich.console import Console
+from rich.table import Table
+
+from fastvpinns.Geometry.geometry_2d import Geometry_2D
+from fastvpinns.FE.fespace2d import Fespace2D
+from fastvpinns.data.datahandler2d import DataHandler2D
+from fastvpinns.model.model import DenseModel
+from fastvpinns.physics.poisson2d import pde_loss_poisson
+
+# (number of cells in every direction, fe order, quad order)
+MESH_SIZES = [(4, 6, 10), (8, 4, 6), (16, 3, 5)]
+
+# hidden layers of the network
+NETWORK_SIZES = [[30, 30, 30], [50, 50, 50, 50]]
+
+OUTPUT_PATH = "output/benchmark_jit_compile"
+
+
+def get_datahandler(n_cells, fe_order, quad_order):
+    """
+    Returns the data handler of the poisson problem on the unit square with n_cells x n_cells cells.
+    """
+    domain = Geometry_2D("quadrilateral", "internal", 100, 100, OUTPUT_PATH)
+    cells, boundary_points = domain.generate_quad_mesh_internal(
+        x_limits=[0, 1],
+        y_limits=[0, 1],
+        n_cells_x=n_cells,
+        n_cells_y=n_cells,
+        num_boundary_points=400,
+    )
+    fespace = Fespace2D(
+        mesh=domain.mesh,
+        cells=cells,
+        boundary_points=boundary_points,
+        cell_type=domain.mesh_type,
+        fe_order=fe_order,
+        fe_type="jacobi",
+        quad_order=quad_order,
+        quad_type="gauss-jacobi",
+        fe_transformation_type="bilinear",
+        bound_function_dict={key: lambda x, y: 0.0 * x for key in boundary_points},
+        bound_condition_dict={key: "dirichlet" for key in boundary_points},
+        forcing_function=lambda x, y: -2.0 * np.pi**2 * np.sin(np.pi * x) * np.sin(np.pi * y),
+        output_path=OUTPUT_PATH,
+        generate_mesh_plot=False,
+    )
+
+    return DataHandler2D(fespace, domain, dtype=tf.float32), fespace.n_cells
+
+
+def time_train_step(datahandler, n_cells, hidden_layers, jit_compile, n_steps):
+    """
+    Returns the time of the first training step and the median time of the following training steps.
+    """
+    tf.keras.utils.set_random_seed(0)
+    dirichlet_input, dirichlet_actual = datahandler.get_dirichlet_input()
+    bilinear_params_dict = datahandler.get_bilinear_params_dict_as_tensors(lambda: {"eps": 1.0})
+
+    model = DenseModel(
+        layer_dims=[2, *hidden_layers, 1],
+        learning_rate_dict={
+            "initial_learning_rate": 1e-3,
+            "use_lr_scheduler": False,
+            "decay_steps": 1000,
+            "decay_rate": 0.99,
+        },
+        params_dict={"n_cells": n_cells},
+        loss_function=pde_loss_poisson,
+        input_tensors_list=[datahandler.x_pde_list, dirichlet_input, dirichlet_actual],
+        orig_factor_matrices=[
+            datahandler.shape_val_mat_list,
+            datahandler.grad_x_mat_list,
+            datahandler.grad_y_mat_list,
+        ],
+        force_function_list=datahandler.forcing_function_list,
+        tensor_dtype=tf.float32,
+        jit_compile=jit_compile,
+    )
+    beta = tf.constant(10.0, dtype=tf.float32)
+
+    # the first step includes the tracing and the compilation
+    start_time = time.perf_counter()
+    model.train_step(beta=beta, bilinear_params_dict=bilinear_params_dict)["loss"].numpy()
+    first_step_time = time.perf_counter() - start_time
+
+    step_times = []
+    for _ in range(n_steps):
+        start_time = time.perf_counter()
+        model.train_step(beta=beta, bilinear_params_dict=bilinear_params_dict)["loss"].numpy()
+        step_times.append(time.perf_counter() - start_time)
+
+    return first_step_time, np.median(step_times)
+
+
+if __name__ == "__main__":
+    n_steps = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    Path(OUTPUT_PATH).mkdir(parents=True, exist_ok=True)
+
+    table = Table(show_header=True, header_style="bold magenta", title="XLA compiled training step")
+    for column in [
+        "Cells",
+        "FE / Quad order",
+        "Network",
+        "First step (s)",
+        "First step XLA (s)",
+        "Step (ms)",
+        "Step XLA (ms)",
+        "Speedup",
+    ]:
+        table.add_column(column)
+
+    for n_cells, fe_order, quad_order in MESH_SIZES:
+        datahandler, total_cells = get_datahandler(n_cells, fe_order, quad_order)
+
+        for hidden_layers in NETWORK_SIZES:
+            first_step, step = time_train_step(
+                datahandler, total_cells, hidden_layers, False, n_steps
+            )
+            first_step_xla, step_xla = time_train_step(
+                datahandler, total_cells, hidden_layers, True, n_steps
+            )
+
+            table.add_row(
+                str(total_cells),
+                f"{fe_order} / {quad_order}",
+                str(hidden_layers),
+                f"{first_step:.2f}",
+                f"{first_step_xla:.2f}",
+                f"{1e3 * step:.2f}",
+                f"{1e3 * step_xla:.2f}",
+                f"{step / step_xla:.2f}x",
+            )
+
+    Console().print(table)
@@ -76,6 +76,7 @@ if __name__ == "__main__":
     i_model_architecture = config['model']['model_architecture']
     i_activation = config['model']['activation']
     i_use_attention = config['model']['use_attention']
+    i_jit_compile = config['model'].get('jit_compile', False)
     i_epochs = config['model']['epochs']
     i_dtype = config['model']['dtype']
     if i_dtype == "float64":
@@ -169,6 +170,7 @@ if __name__ == "__main__":
         tensor_dtype=i_dtype,
         use_attention=i_use_attention,
         activation=i_activation,
+        jit_compile=i_jit_compile,
         hessian=False,
     )
 
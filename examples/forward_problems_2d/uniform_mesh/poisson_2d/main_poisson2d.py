@@ -76,6 +76,7 @@ if __name__ == "__main__":
     i_model_architecture = config['model']['model_architecture']
     i_activation = config['model']['activation']
     i_use_attention = config['model']['use_attention']
+    i_jit_compile = config['model'].get('jit_compile', False)
     i_epochs = config['model']['epochs']
     i_dtype = config['model']['dtype']
     if i_dtype == "float64":
@@ -165,6 +166,7 @@ if __name__ == "__main__":
         tensor_dtype=i_dtype,
         use_attention=i_use_attention,
         activation=i_activation,
+        jit_compile=i_jit_compile,
         hessian=False,
     )
 
@@ -205,66 +207,74 @@ if __name__ == "__main__":
     # ---------------------------------------------------------------#
     # ------------- TRAINING LOOP ---------------------------------- #
     # ---------------------------------------------------------------#
-    for epoch in range(num_epochs):
+    # the epochs are trained in chunks up to the next console output, every chunk runs within a
+    # single tf.function and returns the losses of all its epochs at the end of the chunk
+    for chunk_start in range(0, num_epochs, i_update_console_output):
+        n_steps = min(i_update_console_output, num_epochs - chunk_start)
+        epoch = chunk_start + n_steps - 1
 
         # Train the model
         batch_start_time = time.time()
-        loss = model.train_step(beta=beta, bilinear_params_dict=bilinear_params_dict)
+        # the number of steps is passed as a tensor, so that the shorter last chunk is not traced again
+        losses = model.train_n_steps(
+            tf.constant(n_steps, dtype=tf.int32), beta=beta, bilinear_params_dict=bilinear_params_dict
+        )
+        loss_array.extend(losses['loss'].numpy())
         elapsed = time.time() - batch_start_time
 
-        # print(elapsed)
-        time_array.append(elapsed)
+        # average time per epoch of the chunk
+        time_array.extend([elapsed / n_steps] * n_steps)
 
-        loss_array.append(loss['loss'])
+        # losses of the last epoch of the chunk
+        loss = {key: value[-1] for key, value in losses.items()}
 
         # ------ Intermediate results update ------ #
-        if (epoch + 1) % i_update_console_output == 0 or epoch == num_epochs - 1:
-            y_pred = model(test_points).numpy()
-            y_pred = y_pred.reshape(-1)
-
-            error = np.abs(y_exact - y_pred)
-
-            # get errors
-            (
-                l2_error,
-                linf_error,
-                l2_error_relative,
-                linf_error_relative,
-                l1_error,
-                l1_error_relative,
-            ) = compute_errors_combined(y_exact, y_pred)
-
-            loss_pde = float(loss['loss_pde'].numpy())
-            loss_dirichlet = float(loss['loss_dirichlet'].numpy())
-            total_loss = float(loss['loss'].numpy())
-
-            # Append test loss
-            test_loss_array.append(l1_error)
-
-            console.print(f"\nEpoch [bold]{epoch+1}/{num_epochs}[/bold]")
-            console.print("[bold]--------------------[/bold]")
-            console.print("[bold]Beta : [/bold]", beta.numpy(), end=" ")
-            console.print(
-                f"Variational Losses || Pde Loss : [red]{loss_pde:.3e}[/red] Dirichlet Loss : [red]{loss_dirichlet:.3e}[/red] Total Loss : [red]{total_loss:.3e}[/red]"
-            )
-            console.print(
-                f"Test Losses        || L1 Error : {l1_error:.3e} L2 Error : {l2_error:.3e} Linf Error : {linf_error:.3e}"
-            )
-
-            plot_results(
-                loss_array,
-                test_loss_array,
-                y_pred,
-                X,
-                Y,
-                Y_Exact_Matrix,
-                i_output_path,
-                epoch,
-                i_n_test_points_x,
-                i_n_test_points_y,
-            )
-
-        progress_bar.update(1)
+        y_pred = model(test_points).numpy()
+        y_pred = y_pred.reshape(-1)
+
+        error = np.abs(y_exact - y_pred)
+
+        # get errors
+        (
+            l2_error,
+            linf_error,
+            l2_error_relative,
+            linf_error_relative,
+            l1_error,
+            l1_error_relative,
+        ) = compute_errors_combined(y_exact, y_pred)
+
+        loss_pde = float(loss['loss_pde'].numpy())
+        loss_dirichlet = float(loss['loss_dirichlet'].numpy())
+        total_loss = float(loss['loss'].numpy())
+
+        # Append test loss
+        test_loss_array.append(l1_error)
+
+        console.print(f"\nEpoch [bold]{epoch+1}/{num_epochs}[/bold]")
+        console.print("[bold]--------------------[/bold]")
+        console.print("[bold]Beta : [/bold]", beta.numpy(), end=" ")
+        console.print(
+            f"Variational Losses || Pde Loss : [red]{loss_pde:.3e}[/red] Dirichlet Loss : [red]{loss_dirichlet:.3e}[/red] Total Loss : [red]{total_loss:.3e}[/red]"
+        )
+        console.print(
+            f"Test Losses        || L1 Error : {l1_error:.3e} L2 Error : {l2_error:.3e} Linf Error : {linf_error:.3e}"
+        )
+
+        plot_results(
+            loss_array,
+            test_loss_array,
+            y_pred,
+            X,
+            Y,
+            Y_Exact_Matrix,
+            i_output_path,
+            epoch,
+            i_n_test_points_x,
+            i_n_test_points_y,
+        )
+
+        progress_bar.update(n_steps)
 
     # Save the model
     model.save_weights(str(Path(i_output_path) / "model_weights"))
@@ -10,6 +10,9 @@ Implementation History : The grad_x_orig and grad_y_orig will actually store
 the magnitute with which we need to multiply this grad_x_ref and grad_y_ref
 to obtain the actual values of the gradient in the original cell
 this is done to improve efficiency
+
+18/Oct/2026 : The second derivatives of the basis functions are computed only when they are
+accessed (or when `compute_hessian` is set), since they are not needed by first order problems.
 """
 
 # Importing the required libraries
@@ -18,11 +21,15 @@ from .basis_function_2d import *
 # import Quadrature rules
 from .quadratureformulas_quad2d import *
 from .fe2d_setup_main import *
+from .fe2d_reference_cache import get_reference_element_data
 
 
 class FE2D_Cell:
     """
     This class is used to Store the FE Values, such as Coordinates, Basis Functions, Quadrature Rules, etc. for a given cell.
+
+    The second derivatives of the basis functions (`basis_gradxx_at_quad`, `basis_gradxy_at_quad` and
+    `basis_gradyy_at_quad`) are computed on their first access, unless `compute_hessian` is True.
     """
 
     def __init__(
@@ -35,6 +42,7 @@ class FE2D_Cell:
         quad_type: str,
         fe_transformation_type: str,
         forcing_function,
+        compute_hessian: bool = False,
     ):
         self.cell_coordinates = cell_coordinates
         self.cell_type = cell_type
@@ -44,6 +52,7 @@ class FE2D_Cell:
         self.quad_type = quad_type
         self.fe_transformation = fe_transformation_type
         self.forcing_function = forcing_function
+        self.compute_hessian = compute_hessian
 
         # Basis function Class
         self.basis_function = None
@@ -59,9 +68,11 @@ class FE2D_Cell:
         self.basis_at_quad = None
         self.basis_gradx_at_quad = None
         self.basis_grady_at_quad = None
-        self.basis_gradxy_at_quad = None
-        self.basis_gradxx_at_quad = None
-        self.basis_gradyy_at_quad = None
+
+        # Second derivatives of the basis functions ( computed on request )
+        self._basis_gradxy_at_quad = None
+        self._basis_gradxx_at_quad = None
+        self._basis_gradyy_at_quad = None
 
         # Quadrature Coordinates
         self.quad_actual_coordinates = None
@@ -81,6 +92,15 @@ class FE2D_Cell:
             quad_type=self.quad_type,
         )
 
+        # get the reference element data ( shared across all the cells with the same configuration )
+        self.reference_data = get_reference_element_data(
+            cell_type=self.cell_type,
+            fe_order=self.fe_order,
+            fe_type=self.fe_type,
+            quad_order=self.quad_order,
+            quad_type=self.quad_type,
+        )
+
         # Call the function to assign the basis function
         self.assign_basis_function()
 
@@ -96,6 +116,10 @@ class FE2D_Cell:
         # Calculate the basis function values at the quadrature points
         self.assign_basis_values_at_quadrature_points()
 
+        # Calculate the second derivatives of the basis functions, only if they are requested
+        if self.compute_hessian:
+            self.assign_basis_second_derivatives_at_quadrature_points()
+
         # calculate the actual coordinates of the quadrature points
         self.assign_quadrature_coordinates()
 
@@ -124,7 +148,7 @@ class FE2D_Cell:
 
         :return: An instance of the BasisFunction2D class.
         """
-        self.basis_function = self.fe_setup.assign_basis_function()
+        self.basis_function = self.reference_data.basis_function
 
     def assign_quadrature(self) -> None:
         """
@@ -132,7 +156,9 @@ class FE2D_Cell:
 
         :return: None
         """
-        self.quad_weight, self.quad_xi, self.quad_eta = self.fe_setup.assign_quadrature_rules()
+        self.quad_weight = self.reference_data.quad_weight
+        self.quad_xi = self.reference_data.quad_xi
+        self.quad_eta = self.reference_data.quad_eta
 
     def assign_fe_transformation(self) -> None:
         """
@@ -160,8 +186,8 @@ class FE2D_Cell:
 
         This method calculates the values of the basis functions and their gradients at the quadrature points.
         The basis function values are stored in `self.basis_at_quad`, while the gradients are stored in
-        `self.basis_gradx_at_quad`, `self.basis_grady_at_quad`, `self.basis_gradxy_at_quad`,
-        `self.basis_gradxx_at_quad`, and `self.basis_gradyy_at_quad`.
+        `self.basis_gradx_at_quad` and `self.basis_grady_at_quad`. The second derivatives are computed
+        separately in `assign_basis_second_derivatives_at_quadrature_points`.
 
         The basis function values are of size N_basis_functions x N_quad_points.
 
@@ -171,15 +197,13 @@ class FE2D_Cell:
         self.basis_at_quad = []
         self.basis_gradx_at_quad = []
         self.basis_grady_at_quad = []
-        self.basis_gradxy_at_quad = []
-        self.basis_gradxx_at_quad = []
-        self.basis_gradyy_at_quad = []
 
-        self.basis_at_quad = self.basis_function.value(self.quad_xi, self.quad_eta)
+        # The reference values are obtained from the shared reference element data
+        self.basis_at_quad = self.reference_data.basis_at_quad
 
         # For Gradients we need to perform a transformation to the original cell
-        grad_x_ref = self.basis_function.gradx(self.quad_xi, self.quad_eta)
-        grad_y_ref = self.basis_function.grady(self.quad_xi, self.quad_eta)
+        grad_x_ref = self.reference_data.basis_gradx_at_quad
+        grad_y_ref = self.reference_data.basis_grady_at_quad
 
         grad_x_orig, grad_y_orig = self.fetransformation.get_orig_from_ref_derivative(
             grad_x_ref, grad_y_ref, self.quad_xi, self.quad_eta
@@ -191,10 +215,26 @@ class FE2D_Cell:
         self.basis_gradx_at_quad_ref = grad_x_ref
         self.basis_grady_at_quad_ref = grad_y_ref
 
+        # Multiply each row with the quadrature weights
+        # Basis at Quad - n_test * N_quad
+        self.basis_at_quad = self.basis_at_quad * self.mult
+        self.basis_gradx_at_quad = self.basis_gradx_at_quad * self.mult
+        self.basis_grady_at_quad = self.basis_grady_at_quad * self.mult
+
+    def assign_basis_second_derivatives_at_quadrature_points(self) -> None:
+        """
+        Assigns the second derivatives of the basis functions in the original cell at the quadrature points,
+        pre-multiplied with the quadrature weights and the Jacobian.
+
+        The values are stored in `self.basis_gradxx_at_quad`, `self.basis_gradxy_at_quad` and
+        `self.basis_gradyy_at_quad`, each of size N_basis_functions x N_quad_points.
+
+        :return: None
+        """
         # get the double derivatives of the basis functions ( ref co-ordinates )
-        grad_xx_ref = self.basis_function.gradxx(self.quad_xi, self.quad_eta)
-        grad_xy_ref = self.basis_function.gradxy(self.quad_xi, self.quad_eta)
-        grad_yy_ref = self.basis_function.gradyy(self.quad_xi, self.quad_eta)
+        grad_xx_ref = self.reference_data.basis_gradxx_at_quad
+        grad_xy_ref = self.reference_data.basis_gradxy_at_quad
+        grad_yy_ref = self.reference_data.basis_gradyy_at_quad
 
         # get the double derivatives of the basis functions ( orig co-ordinates )
         grad_xx_orig, grad_xy_orig, grad_yy_orig = (
@@ -203,19 +243,50 @@ class FE2D_Cell:
             )
         )
 
-        # = the value
-        self.basis_gradxy_at_quad = grad_xy_orig
-        self.basis_gradxx_at_quad = grad_xx_orig
-        self.basis_gradyy_at_quad = grad_yy_orig
-
         # Multiply each row with the quadrature weights
-        # Basis at Quad - n_test * N_quad
-        self.basis_at_quad = self.basis_at_quad * self.mult
-        self.basis_gradx_at_quad = self.basis_gradx_at_quad * self.mult
-        self.basis_grady_at_quad = self.basis_grady_at_quad * self.mult
-        self.basis_gradxy_at_quad = self.basis_gradxy_at_quad * self.mult
-        self.basis_gradxx_at_quad = self.basis_gradxx_at_quad * self.mult
-        self.basis_gradyy_at_quad = self.basis_gradyy_at_quad * self.mult
+        self._basis_gradxy_at_quad = grad_xy_orig * self.mult
+        self._basis_gradxx_at_quad = grad_xx_orig * self.mult
+        self._basis_gradyy_at_quad = grad_yy_orig * self.mult
+
+    def free_basis_second_derivatives(self) -> None:
+        """
+        Releases the second derivatives of the basis functions. They are computed again on their next access.
+
+        :return: None
+        """
+        self._basis_gradxy_at_quad = None
+        self._basis_gradxx_at_quad = None
+        self._basis_gradyy_at_quad = None
+
+    @property
+    def basis_gradxx_at_quad(self) -> np.ndarray:
+        """
+        The second derivative of the basis functions with respect to x at the quadrature points,
+        of size N_basis_functions x N_quad_points. It is computed on the first access.
+        """
+        if self._basis_gradxx_at_quad is None:
+            self.assign_basis_second_derivatives_at_quadrature_points()
+        return self._basis_gradxx_at_quad
+
+    @property
+    def basis_gradxy_at_quad(self) -> np.ndarray:
+        """
+        The mixed second derivative of the basis functions at the quadrature points,
+        of size N_basis_functions x N_quad_points. It is computed on the first access.
+        """
+        if self._basis_gradxy_at_quad is None:
+            self.assign_basis_second_derivatives_at_quadrature_points()
+        return self._basis_gradxy_at_quad
+
+    @property
+    def basis_gradyy_at_quad(self) -> np.ndarray:
+        """
+        The second derivative of the basis functions with respect to y at the quadrature points,
+        of size N_basis_functions x N_quad_points. It is computed on the first access.
+        """
+        if self._basis_gradyy_at_quad is None:
+            self.assign_basis_second_derivatives_at_quadrature_points()
+        return self._basis_gradyy_at_quad
 
     def assign_quad_weights_and_jacobian(self) -> None:
         """
@@ -7,14 +7,13 @@ description: This file contains the class Basis2DQNChebyshev2 which defines the
              available at https://github.com/ehsankharazmi/hp-VPINNs/
 authors: Thivin Anandh D
 changelog: 30/Aug/2023 - Initial version
+           18/Oct/2026 - All the degrees are evaluated at once using the three-term recurrence
 known_issues: None
 """
 
-# import the legendre polynomials
-from scipy.special import jacobi
-
 import numpy as np
 from .basis_function_2d import BasisFunction2D
+from .jacobi_recurrence import jacobi_polynomials, jacobi_polynomials_derivatives
 
 
 class Basis2DQNChebyshev2(BasisFunction2D):
@@ -42,7 +41,24 @@ class Basis2DQNChebyshev2(BasisFunction2D):
         :rtype: array_like
         """
         x = np.array(x, dtype=np.float64)
-        return jacobi(n, a, b)(x)
+        return jacobi_polynomials(n, a, b, x)[n].reshape(x.shape)
+
+    def normalized_chebyshev(self, n_max, x):
+        """
+        Compute the Jacobi polynomials with parameters (-1/2, -1/2) of all the degrees 0..n_max, normalized
+        with their values at x = 1, and their first and second derivatives.
+
+        :param n_max: Maximum degree of the polynomials.
+        :type n_max: int
+        :param x: Points at which to evaluate the polynomials.
+        :type x: array_like
+        :return: Values, first derivatives and second derivatives, each of shape (n_max + 1, len(x)).
+        :rtype: tuple(ndarray, ndarray, ndarray)
+        """
+        norm = jacobi_polynomials(n_max, -1 / 2, -1 / 2, [1.0])
+        values = jacobi_polynomials_derivatives(n_max, -1 / 2, -1 / 2, x)
+
+        return tuple(value / norm for value in values)
 
     ## Helper Function
     def test_fcnx(self, n_test, x):
@@ -57,15 +73,9 @@ class Basis2DQNChebyshev2(BasisFunction2D):
         :return: Values of the x-component of the test functions.
         :rtype: array_like
         """
-        test_total = []
-        for n in range(1, n_test + 1):
-            test = self.jacobi_wrapper(n + 1, -1 / 2, -1 / 2, x) / self.jacobi_wrapper(
-                n + 1, -1 / 2, -1 / 2, 1
-            ) - self.jacobi_wrapper(n - 1, -1 / 2, -1 / 2, x) / self.jacobi_wrapper(
-                n - 1, -1 / 2, -1 / 2, 1
-            )
-            test_total.append(test)
-        return np.asarray(test_total, np.float64)
+        # test function of degree n is P_(n+1)(x) / P_(n+1)(1) - P_(n-1)(x) / P_(n-1)(1)
+        chebyshev = self.normalized_chebyshev(n_test + 1, x)[0]
+        return chebyshev[2:] - chebyshev[:-2]
 
     def test_fcny(self, n_test, y):
         """
@@ -78,15 +88,8 @@ class Basis2DQNChebyshev2(BasisFunction2D):
         :return: Values of the y-component of the test functions.
         :rtype: array_like
         """
-        test_total = []
-        for n in range(1, n_test + 1):
-            test = self.jacobi_wrapper(n + 1, -1 / 2, -1 / 2, y) / self.jacobi_wrapper(
-                n + 1, -1 / 2, -1 / 2, 1
-            ) - self.jacobi_wrapper(n - 1, -1 / 2, -1 / 2, y) / self.jacobi_wrapper(
-                n - 1, -1 / 2, -1 / 2, 1
-            )
-            test_total.append(test)
-        return np.asarray(test_total, np.float64)
+        chebyshev = self.normalized_chebyshev(n_test + 1, y)[0]
+        return chebyshev[2:] - chebyshev[:-2]
 
     def dtest_fcn(self, n_test, x):
         """
@@ -99,61 +102,8 @@ class Basis2DQNChebyshev2(BasisFunction2D):
         :return: Array of first derivatives of the test function, Array of second derivatives of the test function.
         :rtype: tuple(ndarray, ndarray)
         """
-        d1test_total = []
-        d2test_total = []
-        for n in range(1, n_test + 1):
-            if n == 1:
-                d1test = (
-                    ((n + 1) / 2)
-                    * self.jacobi_wrapper(n, 1 / 2, 1 / 2, x)
-                    / self.jacobi_wrapper(n + 1, -1 / 2, -1 / 2, 1)
-                )
-                d2test = (
-                    ((n + 2) * (n + 1) / (2 * 2))
-                    * self.jacobi_wrapper(n - 1, 3 / 2, 3 / 2, x)
-                    / self.jacobi_wrapper(n + 1, -1 / 2, -1 / 2, 1)
-                )
-                d1test_total.append(d1test)
-                d2test_total.append(d2test)
-            elif n == 2:
-                d1test = ((n + 1) / 2) * self.jacobi_wrapper(
-                    n, 1 / 2, 1 / 2, x
-                ) / self.jacobi_wrapper(n + 1, -1 / 2, -1 / 2, 1) - (
-                    (n - 1) / 2
-                ) * self.jacobi_wrapper(
-                    n - 2, 1 / 2, 1 / 2, x
-                ) / self.jacobi_wrapper(
-                    n - 1, -1 / 2, -1 / 2, 1
-                )
-                d2test = (
-                    ((n + 2) * (n + 1) / (2 * 2))
-                    * self.jacobi_wrapper(n - 1, 3 / 2, 3 / 2, x)
-                    / self.jacobi_wrapper(n + 1, -1 / 2, -1 / 2, 1)
-                )
-                d1test_total.append(d1test)
-                d2test_total.append(d2test)
-            else:
-                d1test = ((n + 1) / 2) * self.jacobi_wrapper(
-                    n, 1 / 2, 1 / 2, x
-                ) / self.jacobi_wrapper(n + 1, -1 / 2, -1 / 2, 1) - (
-                    (n - 1) / 2
-                ) * self.jacobi_wrapper(
-                    n - 2, 1 / 2, 1 / 2, x
-                ) / self.jacobi_wrapper(
-                    n - 1, -1 / 2, -1 / 2, 1
-                )
-                d2test = ((n + 2) * (n + 1) / (2 * 2)) * self.jacobi_wrapper(
-                    n - 1, 3 / 2, 3 / 2, x
-                ) / self.jacobi_wrapper(n + 1, -1 / 2, -1 / 2, 1) - (
-                    (n) * (n - 1) / (2 * 2)
-                ) * self.jacobi_wrapper(
-                    n - 3, 3 / 2, 3 / 2, x
-                ) / self.jacobi_wrapper(
-                    n - 1, -1 / 2, -1 / 2, 1
-                )
-                d1test_total.append(d1test)
-                d2test_total.append(d2test)
-        return np.asarray(d1test_total), np.asarray(d2test_total)
+        _, d1chebyshev, d2chebyshev = self.normalized_chebyshev(n_test + 1, x)
+        return d1chebyshev[2:] - d1chebyshev[:-2], d2chebyshev[2:] - d2chebyshev[:-2]
 
     def value(self, xi, eta):
         """
@@ -294,3 +244,19 @@ class Basis2DQNChebyshev2(BasisFunction2D):
             )
 
         return values
+
+    def get_1d_test_functions(self, x):
+        """
+        This method returns the 1D test functions and their first derivatives at the given coordinates.
+        The 2D basis functions are the outer products of these 1D test functions in xi and eta.
+
+        :param x: 1D coordinates at which to evaluate the test functions.
+        :type x: array_like
+        :return: Values and first derivatives of the 1D test functions, each of shape (n_test_1d, len(x)).
+        :rtype: tuple
+        """
+        num_shape_func_in_1d = int(np.sqrt(self.num_shape_functions))
+        test = self.test_fcnx(num_shape_func_in_1d, x)
+        grad_test = self.dtest_fcn(num_shape_func_in_1d, x)[0]
+
+        return test, grad_test
@@ -8,17 +8,16 @@ https://github.com/ehsankharazmi/hp-VPINNs/
 Author: Thivin Anandh D
 
 Changelog: 30/Aug/2023 - Initial version
+           18/Oct/2026 - All the degrees are evaluated at once using the three-term recurrence
 
 Known issues: None
 
-Dependencies: scipy, numpy
+Dependencies: numpy
 """
 
-# import the jacobi polynomials
-from scipy.special import jacobi
-
 import numpy as np
 from .basis_function_2d import BasisFunction2D
+from .jacobi_recurrence import jacobi_polynomials, jacobi_polynomials_derivatives
 
 
 class Basis2DQNJacobi(BasisFunction2D):
@@ -46,7 +45,7 @@ class Basis2DQNJacobi(BasisFunction2D):
         :rtype: array_like
         """
         x = np.array(x, dtype=np.float64)
-        return jacobi(n, a, b)(x)
+        return jacobi_polynomials(n, a, b, x)[n].reshape(x.shape)
 
     # Derivative of the Jacobi polynomials
     def djacobi(self, n, a, b, x, k: int):
@@ -68,16 +67,10 @@ class Basis2DQNJacobi(BasisFunction2D):
         :rtype: array_like
 
         :raises ValueError: If the derivative order is not 1 or 2.
-
-        :raises ImportError: If the required module 'jacobi' is not found.
-
-        :raises Exception: If an unknown error occurs during the computation.
         """
         x = np.array(x, dtype=np.float64)
-        if k == 1:
-            return jacobi(n, a, b).deriv()(x)
-        if k == 2:
-            return jacobi(n, a, b).deriv(2)(x)
+        if k in [1, 2]:
+            return jacobi_polynomials_derivatives(n, a, b, x)[k][n].reshape(x.shape)
         else:
             print(f"Invalid derivative order {k} in {__name__}.")
             raise ValueError("Derivative order should be 1 or 2.")
@@ -95,11 +88,7 @@ class Basis2DQNJacobi(BasisFunction2D):
         :return: Values of the x-component of the test functions.
         :rtype: array_like
         """
-        test_total = []
-        for n in range(1, n_test + 1):
-            test = self.jacobi_wrapper(n - 1, 0, 0, x)
-            test_total.append(test)
-        return np.asarray(test_total, np.float64)
+        return jacobi_polynomials(n_test - 1, 0, 0, x)
 
     def test_fcny(self, n_test, y):
         """
@@ -112,11 +101,7 @@ class Basis2DQNJacobi(BasisFunction2D):
         Returns:
             array_like: Values of the y-component of the test functions.
         """
-        test_total = []
-        for n in range(1, n_test + 1):
-            test = self.jacobi_wrapper(n - 1, 0, 0, y)
-            test_total.append(test)
-        return np.asarray(test_total, np.float64)
+        return jacobi_polynomials(n_test - 1, 0, 0, y)
 
     def dtest_fcn(self, n_test, x):
         """
@@ -130,11 +115,7 @@ class Basis2DQNJacobi(BasisFunction2D):
         :return: Values of the x-derivatives of the test functions.
         :rtype: array_like
         """
-        d1test_total = []
-        for n in range(1, n_test + 1):
-            d1test = self.djacobi(n - 1, 0, 0, x, 1)
-            d1test_total.append(d1test)
-        return np.asarray(d1test_total)
+        return jacobi_polynomials_derivatives(n_test - 1, 0, 0, x)[1]
 
     def ddtest_fcn(self, n_test, x):
         """
@@ -148,11 +129,7 @@ class Basis2DQNJacobi(BasisFunction2D):
         :return: Values of the x-derivatives of the test functions.
         :rtype: array_like
         """
-        d1test_total = []
-        for n in range(1, n_test + 1):
-            d1test = self.djacobi(n - 1, 0, 0, x, 2)
-            d1test_total.append(d1test)
-        return np.asarray(d1test_total)
+        return jacobi_polynomials_derivatives(n_test - 1, 0, 0, x)[2]
 
     def value(self, xi, eta):
         """
@@ -295,3 +272,19 @@ class Basis2DQNJacobi(BasisFunction2D):
             )
 
         return values
+
+    def get_1d_test_functions(self, x):
+        """
+        This method returns the 1D test functions and their first derivatives at the given coordinates.
+        The 2D basis functions are the outer products of these 1D test functions in xi and eta.
+
+        :param x: 1D coordinates at which to evaluate the test functions.
+        :type x: array_like
+        :return: Values and first derivatives of the 1D test functions, each of shape (n_test_1d, len(x)).
+        :rtype: tuple
+        """
+        num_shape_func_in_1d = int(np.sqrt(self.num_shape_functions))
+        test = self.test_fcnx(num_shape_func_in_1d, x)
+        grad_test = self.dtest_fcn(num_shape_func_in_1d, x)
+
+        return test, grad_test
@@ -7,16 +7,15 @@ description: This file contains the class Basis2DQNLegendre which is used
              available at https://github.com/ehsankharazmi/hp-VPINNs/
 authors: Thivin Anandh D
 changelog: 30/Aug/2023 - Initial version
+           18/Oct/2026 - All the degrees are evaluated at once using the three-term recurrence
 known_issues: None
-dependencies: Requires scipy and numpy.
+dependencies: Requires numpy.
 """
 
 import numpy as np
 
-# import the legendre polynomials
-from scipy.special import jacobi
-
 from .basis_function_2d import BasisFunction2D
+from .jacobi_recurrence import jacobi_polynomials, jacobi_polynomials_derivatives
 
 
 class Basis2DQNLegendre(BasisFunction2D):
@@ -44,7 +43,7 @@ class Basis2DQNLegendre(BasisFunction2D):
         :rtype: array_like
         """
         x = np.array(x, dtype=np.float64)
-        return jacobi(n, a, b)(x)
+        return jacobi_polynomials(n, a, b, x)[n].reshape(x.shape)
 
     ## Helper Function
     def test_fcnx(self, n_test, x):
@@ -59,11 +58,9 @@ class Basis2DQNLegendre(BasisFunction2D):
         :return: Values of the x-component of the test functions.
         :rtype: array_like
         """
-        test_total = []
-        for n in range(1, n_test + 1):
-            test = self.jacobi_wrapper(n + 1, 0, 0, x) - self.jacobi_wrapper(n - 1, 0, 0, x)
-            test_total.append(test)
-        return np.asarray(test_total, np.float64)
+        # test function of degree n is P_(n+1) - P_(n-1)
+        legendre = jacobi_polynomials(n_test + 1, 0, 0, x)
+        return legendre[2:] - legendre[:-2]
 
     def test_fcny(self, n_test, y):
         """
@@ -77,11 +74,8 @@ class Basis2DQNLegendre(BasisFunction2D):
         :return: Values of the y-component of the test functions.
         :rtype: array_like
         """
-        test_total = []
-        for n in range(1, n_test + 1):
-            test = self.jacobi_wrapper(n + 1, 0, 0, y) - self.jacobi_wrapper(n - 1, 0, 0, y)
-            test_total.append(test)
-        return np.asarray(test_total, np.float64)
+        legendre = jacobi_polynomials(n_test + 1, 0, 0, y)
+        return legendre[2:] - legendre[:-2]
 
     def dtest_fcn(self, n_test, x):
         """
@@ -94,31 +88,8 @@ class Basis2DQNLegendre(BasisFunction2D):
         :return: Values of the first and second x-derivatives of the test functions.
         :rtype: tuple
         """
-        d1test_total = []
-        d2test_total = []
-        for n in range(1, n_test + 1):
-            if n == 1:
-                d1test = ((n + 2) / 2) * self.jacobi_wrapper(n, 1, 1, x)
-                d2test = ((n + 2) * (n + 3) / (2 * 2)) * self.jacobi_wrapper(n - 1, 2, 2, x)
-                d1test_total.append(d1test)
-                d2test_total.append(d2test)
-            elif n == 2:
-                d1test = ((n + 2) / 2) * self.jacobi_wrapper(n, 1, 1, x) - (
-                    (n) / 2
-                ) * self.jacobi_wrapper(n - 2, 1, 1, x)
-                d2test = ((n + 2) * (n + 3) / (2 * 2)) * self.jacobi_wrapper(n - 1, 2, 2, x)
-                d1test_total.append(d1test)
-                d2test_total.append(d2test)
-            else:
-                d1test = ((n + 2) / 2) * self.jacobi_wrapper(n, 1, 1, x) - (
-                    (n) / 2
-                ) * self.jacobi_wrapper(n - 2, 1, 1, x)
-                d2test = ((n + 2) * (n + 3) / (2 * 2)) * self.jacobi_wrapper(n - 1, 2, 2, x) - (
-                    (n) * (n + 1) / (2 * 2)
-                ) * self.jacobi_wrapper(n - 3, 2, 2, x)
-                d1test_total.append(d1test)
-                d2test_total.append(d2test)
-        return np.asarray(d1test_total), np.asarray(d2test_total)
+        _, d1legendre, d2legendre = jacobi_polynomials_derivatives(n_test + 1, 0, 0, x)
+        return d1legendre[2:] - d1legendre[:-2], d2legendre[2:] - d2legendre[:-2]
 
     def value(self, xi, eta):
         """
@@ -259,3 +230,19 @@ class Basis2DQNLegendre(BasisFunction2D):
             )
 
         return values
+
+    def get_1d_test_functions(self, x):
+        """
+        This method returns the 1D test functions and their first derivatives at the given coordinates.
+        The 2D basis functions are the outer products of these 1D test functions in xi and eta.
+
+        :param x: 1D coordinates at which to evaluate the test functions.
+        :type x: array_like
+        :return: Values and first derivatives of the 1D test functions, each of shape (n_test_1d, len(x)).
+        :rtype: tuple
+        """
+        num_shape_func_in_1d = int(np.sqrt(self.num_shape_functions))
+        test = self.test_fcnx(num_shape_func_in_1d, x)
+        grad_test = self.dtest_fcn(num_shape_func_in_1d, x)[0]
+
+        return test, grad_test
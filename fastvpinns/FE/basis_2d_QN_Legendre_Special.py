@@ -4,16 +4,16 @@ description: This file contains the class Basis2DQNLegendreSpecial which is used
              to define the basis functions for a 2D Quad element using a Legendre polynomial.
 authors: Thivin Anandh D
 changelog: 30/Aug/2023 - Initial version
+           18/Oct/2026 - All the degrees are evaluated at once using the three-term recurrence
 known_issues: None
 """
 
 import numpy as np
 
-# import the legendre polynomials
-from scipy.special import legendre
 import matplotlib.pyplot as plt
 
 from .basis_function_2d import BasisFunction2D
+from .jacobi_recurrence import jacobi_polynomials, jacobi_polynomials_derivatives
 
 
 class Basis2DQNLegendreSpecial(BasisFunction2D):
@@ -50,13 +50,9 @@ class Basis2DQNLegendreSpecial(BasisFunction2D):
         :return: An array containing the test function values for each test.
         :rtype: numpy.ndarray
         """
-        test_total = []
-        for n in range(1, n_test + 1):
-            obj1 = legendre(n + 1)
-            obj2 = legendre(n - 1)
-            test = obj1(x) - obj2(x)
-            test_total.append(test)
-        return np.asarray(test_total)
+        # test function of degree n is P_(n+1) - P_(n-1)
+        legendre = jacobi_polynomials(n_test + 1, 0, 0, x)
+        return legendre[2:] - legendre[:-2]
 
     def test_grad_fcn(self, n_test, x):
         """
@@ -69,13 +65,8 @@ class Basis2DQNLegendreSpecial(BasisFunction2D):
         :return: An array containing the gradients of the test functions at the given point.
         :rtype: np.ndarray
         """
-        test_total = []
-        for n in range(1, n_test + 1):
-            obj1 = legendre(n + 1).deriv()
-            obj2 = legendre(n - 1).deriv()
-            test = obj1(x) - obj2(x)
-            test_total.append(test)
-        return np.asarray(test_total)
+        d1legendre = jacobi_polynomials_derivatives(n_test + 1, 0, 0, x)[1]
+        return d1legendre[2:] - d1legendre[:-2]
 
     def test_grad_grad_fcn(self, n_test, x):
         """
@@ -88,14 +79,8 @@ class Basis2DQNLegendreSpecial(BasisFunction2D):
         :return: An array containing the results of the test cases.
         :rtype: ndarray
         """
-        test_total = []
-        for n in range(1, n_test + 1):
-            obj1 = legendre(n + 1).deriv(2)
-            obj2 = legendre(n - 1).deriv(2)
-            test = obj1(x) - obj2(x)
-
-            test_total.append(test)
-        return np.asarray(test_total)
+        d2legendre = jacobi_polynomials_derivatives(n_test + 1, 0, 0, x)[2]
+        return d2legendre[2:] - d2legendre[:-2]
 
     def value(self, xi, eta):
         """
@@ -264,3 +249,19 @@ class Basis2DQNLegendreSpecial(BasisFunction2D):
             )
 
         return values
+
+    def get_1d_test_functions(self, x):
+        """
+        This method returns the 1D test functions and their first derivatives at the given coordinates.
+        The 2D basis functions are the outer products of these 1D test functions in xi and eta.
+
+        :param x: 1D coordinates at which to evaluate the test functions.
+        :type x: array_like
+        :return: Values and first derivatives of the 1D test functions, each of shape (n_test_1d, len(x)).
+        :rtype: tuple
+        """
+        num_shape_func_in_1d = int(np.sqrt(self.num_shape_functions))
+        test = self.test_fcn(num_shape_func_in_1d, x)
+        grad_test = self.test_grad_fcn(num_shape_func_in_1d, x)
+
+        return test, grad_test
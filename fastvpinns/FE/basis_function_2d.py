@@ -98,6 +98,19 @@ class BasisFunction2D:
         """
         pass
 
+    @abstractmethod
+    def get_1d_test_functions(self, x):
+        """
+        Evaluates the 1D test functions and their first derivatives, whose outer products (in xi and eta)
+        form the 2D basis functions.
+
+        :param x: The 1D coordinates.
+        :type x: numpy.ndarray
+        :return: The values and the first derivatives of the 1D test functions, each of shape (n_test_1d, len(x)).
+        :rtype: tuple
+        """
+        pass
+
 
 # ---------------- Legendre -------------------------- #
 from .basis_2d_QN_Legendre import *  # Normal Legendre from Jacobi -> J(n) = J(n-1) - J(n+1)
@@ -0,0 +1,164 @@
+"""
+This module `fe2d_affine.py` is used to obtain the compact representation of the test function matrices
+of a mesh, in which the Jacobian of the transformation is constant within every cell.
+
+This is the case for the affine transformation, and for the bilinear transformation on meshes made of
+parallelograms (e.g. the uniform meshes generated by `Geometry_2D.generate_quad_mesh_internal`).
+Then every test function matrix (values and gradients, pre-multiplied with the quadrature weights and
+the Jacobian) is a linear combination of fixed reference matrices,
+
+    M[c] = sum_k cell_coefficients[k, c] * reference_matrices[k]
+
+so only the reference matrices and a small per-cell coefficient array are stored, instead of the
+dense (n_cells, n_test, n_quad) matrices.
+"""
+
+import numpy as np
+
+from .fe2d_setup_main import FE2DSetupMain
+from .fe2d_reference_cache import get_reference_element_data
+
+
+class FE2DAffine:
+    """
+    This class is used to store the reference matrices and the per-cell coefficients of the
+    test function matrices of all the cells of a mesh with a constant Jacobian within every cell.
+
+    :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+    :type cell_coordinates: numpy.ndarray
+    :param cell_type: The type of the cell.
+    :type cell_type: str
+    :param fe_order: The order of the finite element.
+    :type fe_order: int
+    :param fe_type: The type of the finite element.
+    :type fe_type: str
+    :param quad_order: The order of the quadrature.
+    :type quad_order: int
+    :param quad_type: The type of the quadrature.
+    :type quad_type: str
+    :param fe_transformation_type: The type of the FE transformation.
+    :type fe_transformation_type: str
+    :param tolerance: The tolerance used to check that the Jacobian is constant within a cell, relative to the
+        magnitude of the Jacobian and the inverse Jacobian of the cell.
+    :type tolerance: float, optional
+    """
+
+    def __init__(
+        self,
+        cell_coordinates: np.ndarray,
+        cell_type: str,
+        fe_order: int,
+        fe_type: str,
+        quad_order: int,
+        quad_type: str,
+        fe_transformation_type: str,
+        tolerance: float = 1e-10,
+    ):
+        self.cell_coordinates = np.asarray(cell_coordinates, dtype=np.float64)
+        self.n_cells = self.cell_coordinates.shape[0]
+        self.fe_transformation = fe_transformation_type
+        self.tolerance = tolerance
+
+        self.reference_data = get_reference_element_data(
+            cell_type=cell_type,
+            fe_order=fe_order,
+            fe_type=fe_type,
+            quad_order=quad_order,
+            quad_type=quad_type,
+        )
+        self.fetransformation = FE2DSetupMain(
+            cell_type, fe_order, fe_type, quad_order, quad_type
+        ).get_fe_transformation_class(self.fe_transformation)
+
+        # Jacobian and the inverse Jacobian at the quadrature points - n_cells x N_quad
+        xi = self.reference_data.quad_xi
+        eta = self.reference_data.quad_eta
+        jacobian = self.fetransformation.get_jacobian_batch(self.cell_coordinates, xi, eta)
+        inverse_jacobian = self.fetransformation.get_inverse_jacobian_batch(
+            self.cell_coordinates, xi, eta
+        )
+
+        # the mesh is affine, if all the values are constant along the quadrature points of every cell.
+        # The deviations are compared with the magnitude of the (inverse) Jacobian of the cell, since the
+        # off-diagonal entries of nearly axis-aligned cells are zero up to rounding errors.
+        jacobian_scale = np.max(np.abs(jacobian), axis=1, keepdims=True)
+        inverse_jacobian_scale = np.max(np.abs(np.stack(inverse_jacobian)), axis=(0, 2))[:, None]
+        self.is_affine = all(
+            np.all(np.abs(values - values[:, :1]) <= self.tolerance * scale)
+            for values, scale in [(jacobian, jacobian_scale)]
+            + [(values, inverse_jacobian_scale) for values in inverse_jacobian]
+        )
+
+        # per-cell constants - n_cells
+        self.jacobian = jacobian[:, 0]
+        self.dxi_dx, self.deta_dx, self.dxi_dy, self.deta_dy = [
+            values[:, 0] for values in inverse_jacobian
+        ]
+
+    def check_affine_structure(self) -> None:
+        """
+        Checks that the Jacobian of the transformation is constant within every cell.
+
+        :return: None
+        :raises ValueError: If the Jacobian is not constant within a cell.
+        """
+        if not self.is_affine:
+            print(
+                f"The Jacobian is not constant within the cells for the {self.fe_transformation} transformation in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError(
+                "Affine representation is available only for the affine transformation or for meshes made of parallelograms."
+            )
+
+    def get_factors(self, reference_matrices, cell_coefficients):
+        """
+        Stacks the given terms into the arrays of the affine representation.
+
+        :param reference_matrices: The reference matrices of all the terms, each of shape (n_test, N_quad).
+        :type reference_matrices: list
+        :param cell_coefficients: The per-cell coefficients of all the terms, each of shape (n_cells,).
+        :type cell_coefficients: list
+        :return: The reference matrices, of shape (n_terms, n_test, N_quad), and the
+            per-cell coefficients, of shape (n_terms, n_cells).
+        :rtype: tuple
+        """
+        self.check_affine_structure()
+
+        quad_weight = self.reference_data.quad_weight
+        reference_matrices = np.stack(reference_matrices, axis=0) * quad_weight
+        cell_coefficients = np.stack(cell_coefficients, axis=0) * self.jacobian
+
+        return reference_matrices, cell_coefficients
+
+    def get_shape_function_val_factors(self):
+        """
+        Returns the affine representation of the shape function values of all the cells.
+
+        :return: The reference matrices and the per-cell coefficients.
+        :rtype: tuple
+        """
+        return self.get_factors([self.reference_data.basis_at_quad], [np.ones(self.n_cells)])
+
+    def get_shape_function_grad_x_factors(self):
+        """
+        Returns the affine representation of the x-derivatives of the shape functions of all the cells.
+
+        :return: The reference matrices and the per-cell coefficients.
+        :rtype: tuple
+        """
+        return self.get_factors(
+            [self.reference_data.basis_gradx_at_quad, self.reference_data.basis_grady_at_quad],
+            [self.dxi_dx, self.deta_dx],
+        )
+
+    def get_shape_function_grad_y_factors(self):
+        """
+        Returns the affine representation of the y-derivatives of the shape functions of all the cells.
+
+        :return: The reference matrices and the per-cell coefficients.
+        :rtype: tuple
+        """
+        return self.get_factors(
+            [self.reference_data.basis_gradx_at_quad, self.reference_data.basis_grady_at_quad],
+            [self.dxi_dy, self.deta_dy],
+        )
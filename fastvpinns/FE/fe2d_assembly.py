@@ -0,0 +1,425 @@
+"""
+This module `fe2d_assembly.py` is used to assemble the FE values (basis functions, gradients,
+quadrature coordinates and forcing terms) of all the cells of a mesh at once using batched
+numpy operations. It produces the same values as the per-cell `FE2D_Cell` objects, stacked
+along a leading cell axis.
+
+Implementation History : The basis functions and the quadrature rule are evaluated only once
+on the reference element, and the FE transformation is applied to all the cells together.
+As in `FE2D_Cell`, the stored values are pre-multiplied with the quadrature weights and the
+Jacobian of the transformation. The dense basis function values and first derivatives of all the
+cells are computed only when they are accessed, so that they are not assembled for the compact test
+matrix formats (see `FE2DTensorProduct` and `FE2DAffine`). The second derivatives are computed only
+when they are accessed (or when `compute_hessian` is set).
+"""
+
+import numpy as np
+
+from ..utils.compute_utils import evaluate_function_at_points
+from .fe2d_setup_main import FE2DSetupMain
+from .fe2d_reference_cache import get_reference_element_data
+from .fe2d_tensor_cache import CACHED_ARRAYS
+
+
+class FE2DAssembly:
+    """
+    This class is used to store the FE values of all the cells of a mesh as stacked arrays.
+
+    :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+    :type cell_coordinates: numpy.ndarray
+    :param cell_type: The type of the cell.
+    :type cell_type: str
+    :param fe_order: The order of the finite element.
+    :type fe_order: int
+    :param fe_type: The type of the finite element.
+    :type fe_type: str
+    :param quad_order: The order of the quadrature.
+    :type quad_order: int
+    :param quad_type: The type of the quadrature.
+    :type quad_type: str
+    :param fe_transformation_type: The type of the FE transformation.
+    :type fe_transformation_type: str
+    :param forcing_function: The forcing function.
+    :type forcing_function: function
+    :param cached_values: The previously assembled values of the same mesh and configuration
+        (see `FETensorCache`). If provided, the values are not assembled again. Defaults to None.
+    :type cached_values: dict, optional
+    :param compute_hessian: Whether to compute the second derivatives of the basis functions during the assembly.
+        Otherwise, they are computed on their first access. Defaults to False.
+    :type compute_hessian: bool, optional
+    """
+
+    def __init__(
+        self,
+        cell_coordinates: np.ndarray,
+        cell_type: str,
+        fe_order: int,
+        fe_type: str,
+        quad_order: int,
+        quad_type: str,
+        fe_transformation_type: str,
+        forcing_function,
+        cached_values: dict = None,
+        compute_hessian: bool = False,
+    ):
+        self.cell_coordinates = np.asarray(cell_coordinates, dtype=np.float64)
+        self.cell_type = cell_type
+        self.fe_order = fe_order
+        self.fe_type = fe_type
+        self.quad_order = quad_order
+        self.quad_type = quad_type
+        self.fe_transformation = fe_transformation_type
+        self.forcing_function = forcing_function
+        self.compute_hessian = compute_hessian
+
+        if self.cell_coordinates.ndim != 3 or self.cell_coordinates.shape[1:] != (4, 2):
+            print(
+                f"Invalid shape of cell coordinates {self.cell_coordinates.shape} in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError("Cell coordinates should be of shape (n_cells, 4, 2).")
+
+        self.n_cells = self.cell_coordinates.shape[0]
+
+        # get instance of the FE_setup class
+        self.fe_setup = FE2DSetupMain(
+            cell_type=self.cell_type,
+            fe_order=self.fe_order,
+            fe_type=self.fe_type,
+            quad_order=self.quad_order,
+            quad_type=self.quad_type,
+        )
+
+        # Basis function and quadrature rule ( shared across all the cells with the same configuration )
+        self.reference_data = get_reference_element_data(
+            cell_type=self.cell_type,
+            fe_order=self.fe_order,
+            fe_type=self.fe_type,
+            quad_order=self.quad_order,
+            quad_type=self.quad_type,
+        )
+        self.basis_function = self.reference_data.basis_function
+        self.quad_weight = self.reference_data.quad_weight
+        self.quad_xi = self.reference_data.quad_xi
+        self.quad_eta = self.reference_data.quad_eta
+
+        # FE Transformation Class (only the batched methods of the class are used)
+        self.fetransformation = self.fe_setup.get_fe_transformation_class(self.fe_transformation)
+
+        # Reference values - n_test x N_quad
+        self.basis_at_quad_ref = None
+        self.basis_gradx_at_quad_ref = None
+        self.basis_grady_at_quad_ref = None
+
+        # Stacked values - n_cells x n_test x N_quad (the basis values are computed on request)
+        self.jacobian = None
+        self.mult = None
+        self._basis_at_quad = None
+        self._basis_gradx_at_quad = None
+        self._basis_grady_at_quad = None
+
+        # Stacked second derivatives - n_cells x n_test x N_quad (computed on request)
+        self._basis_gradxx_at_quad = None
+        self._basis_gradxy_at_quad = None
+        self._basis_gradyy_at_quad = None
+
+        # Stacked quadrature coordinates - n_cells x N_quad x 2
+        self.quad_actual_coordinates = None
+
+        # Forcing function values - n_cells x n_test x 1 (computed on request)
+        self.forcing_at_quad = None
+
+        self.assign_reference_values()
+        if cached_values is not None:
+            self.assign_cached_values(cached_values)
+        else:
+            self.assign_quad_weights_and_jacobian()
+            self.assign_quadrature_coordinates()
+
+        if self.compute_hessian:
+            self.assign_basis_second_derivatives_at_quadrature_points()
+
+    def assign_reference_values(self) -> None:
+        """
+        Assigns the basis functions and their first derivatives on the reference element,
+        from the shared reference element data.
+
+        :return: None
+        """
+        self.basis_at_quad_ref = self.reference_data.basis_at_quad
+        self.basis_gradx_at_quad_ref = self.reference_data.basis_gradx_at_quad
+        self.basis_grady_at_quad_ref = self.reference_data.basis_grady_at_quad
+
+    def assign_cached_values(self, cached_values) -> None:
+        """
+        Assigns the previously assembled values of all the cells.
+
+        :param cached_values: The dictionary of the assembled values, with the same names as the attributes.
+        :type cached_values: dict
+        :return: None
+        :raises ValueError: If the values do not match the number of cells.
+        """
+        if cached_values["basis_at_quad"].shape[0] != self.n_cells:
+            print(
+                f"Cached values of {cached_values['basis_at_quad'].shape[0]} cells do not match {self.n_cells} cells in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError("Cached values should be of the same mesh.")
+
+        for name, value in cached_values.items():
+            setattr(self, name, value)
+
+        self.mult = self.quad_weight * self.jacobian[:, :, 0]
+
+    def get_cached_values(self) -> dict:
+        """
+        Returns the assembled values of all the cells, which can be stored in the cache.
+
+        :return: The dictionary of the assembled values.
+        :rtype: dict
+        """
+        return {name: getattr(self, name) for name in CACHED_ARRAYS}
+
+    def assign_quad_weights_and_jacobian(self) -> None:
+        """
+        Assigns the Jacobian of the transformation (n_cells x N_quad x 1) and the product of the
+        quadrature weights with the Jacobian (n_cells x N_quad) for all the cells.
+
+        :return: None
+        """
+        jacobian = self.fetransformation.get_jacobian_batch(
+            self.cell_coordinates, self.quad_xi, self.quad_eta
+        )
+        self.jacobian = jacobian[:, :, np.newaxis]
+        self.mult = self.quad_weight * jacobian
+
+    def assign_basis_values_at_quadrature_points(self) -> None:
+        """
+        Assigns the basis function values and the first derivatives in the original cells
+        at the quadrature points, pre-multiplied with the quadrature weights and the Jacobian.
+
+        :return: None
+        """
+        grad_x_orig, grad_y_orig = self.fetransformation.get_orig_from_ref_derivative_batch(
+            self.cell_coordinates,
+            self.basis_gradx_at_quad_ref,
+            self.basis_grady_at_quad_ref,
+            self.quad_xi,
+            self.quad_eta,
+        )
+
+        mult = self.mult[:, np.newaxis, :]
+
+        self._basis_at_quad = self.basis_at_quad_ref * mult
+        self._basis_gradx_at_quad = grad_x_orig * mult
+        self._basis_grady_at_quad = grad_y_orig * mult
+
+    @property
+    def basis_at_quad(self) -> np.ndarray:
+        """
+        The values of the basis functions at the quadrature points of all the cells, of shape
+        (n_cells, n_test, N_quad). It is computed on the first access.
+        """
+        if self._basis_at_quad is None:
+            self.assign_basis_values_at_quadrature_points()
+        return self._basis_at_quad
+
+    @basis_at_quad.setter
+    def basis_at_quad(self, value: np.ndarray) -> None:
+        self._basis_at_quad = value
+
+    @property
+    def basis_gradx_at_quad(self) -> np.ndarray:
+        """
+        The derivative of the basis functions with respect to x at the quadrature points of all the
+        cells, of shape (n_cells, n_test, N_quad). It is computed on the first access.
+        """
+        if self._basis_gradx_at_quad is None:
+            self.assign_basis_values_at_quadrature_points()
+        return self._basis_gradx_at_quad
+
+    @basis_gradx_at_quad.setter
+    def basis_gradx_at_quad(self, value: np.ndarray) -> None:
+        self._basis_gradx_at_quad = value
+
+    @property
+    def basis_grady_at_quad(self) -> np.ndarray:
+        """
+        The derivative of the basis functions with respect to y at the quadrature points of all the
+        cells, of shape (n_cells, n_test, N_quad). It is computed on the first access.
+        """
+        if self._basis_grady_at_quad is None:
+            self.assign_basis_values_at_quadrature_points()
+        return self._basis_grady_at_quad
+
+    @basis_grady_at_quad.setter
+    def basis_grady_at_quad(self, value: np.ndarray) -> None:
+        self._basis_grady_at_quad = value
+
+    def assign_basis_second_derivatives_at_quadrature_points(self) -> None:
+        """
+        Assigns the second derivatives of the basis functions in the original cells at the quadrature
+        points, pre-multiplied with the quadrature weights and the Jacobian.
+
+        :return: None
+        """
+        grad_xx_orig, grad_xy_orig, grad_yy_orig = (
+            self.fetransformation.get_orig_from_ref_second_derivative_batch(
+                self.cell_coordinates,
+                self.reference_data.basis_gradxx_at_quad,
+                self.reference_data.basis_gradxy_at_quad,
+                self.reference_data.basis_gradyy_at_quad,
+                self.quad_xi,
+                self.quad_eta,
+            )
+        )
+
+        mult = self.mult[:, np.newaxis, :]
+
+        self._basis_gradxx_at_quad = grad_xx_orig * mult
+        self._basis_gradxy_at_quad = grad_xy_orig * mult
+        self._basis_gradyy_at_quad = grad_yy_orig * mult
+
+    def free_basis_second_derivatives(self) -> None:
+        """
+        Releases the second derivatives of the basis functions. They are computed again on their next access.
+
+        :return: None
+        """
+        self._basis_gradxx_at_quad = None
+        self._basis_gradxy_at_quad = None
+        self._basis_gradyy_at_quad = None
+
+    @property
+    def basis_gradxx_at_quad(self) -> np.ndarray:
+        """
+        The second derivative of the basis functions with respect to x at the quadrature points of all
+        the cells, of shape (n_cells, n_test, N_quad). It is computed on the first access.
+        """
+        if self._basis_gradxx_at_quad is None:
+            self.assign_basis_second_derivatives_at_quadrature_points()
+        return self._basis_gradxx_at_quad
+
+    @property
+    def basis_gradxy_at_quad(self) -> np.ndarray:
+        """
+        The mixed second derivative of the basis functions at the quadrature points of all the cells,
+        of shape (n_cells, n_test, N_quad). It is computed on the first access.
+        """
+        if self._basis_gradxy_at_quad is None:
+            self.assign_basis_second_derivatives_at_quadrature_points()
+        return self._basis_gradxy_at_quad
+
+    @property
+    def basis_gradyy_at_quad(self) -> np.ndarray:
+        """
+        The second derivative of the basis functions with respect to y at the quadrature points of all
+        the cells, of shape (n_cells, n_test, N_quad). It is computed on the first access.
+        """
+        if self._basis_gradyy_at_quad is None:
+            self.assign_basis_second_derivatives_at_quadrature_points()
+        return self._basis_gradyy_at_quad
+
+    def assign_quadrature_coordinates(self) -> None:
+        """
+        Assigns the actual coordinates of the quadrature points of all the cells.
+
+        :return: None
+        """
+        self.quad_actual_coordinates = self.fetransformation.get_original_from_ref_batch(
+            self.cell_coordinates, self.quad_xi, self.quad_eta
+        )
+
+    def get_forcing_function_values(self, cell_indices=None) -> np.ndarray:
+        """
+        Computes the integral of the forcing function against all the test functions of the given cells.
+
+        The forcing function is evaluated once on all the quadrature points of the cells as arrays
+        (pointwise, only if the function is not array-safe).
+
+        :param cell_indices: The indices of the cells. Defaults to all the cells, whose values are also
+            stored in the `forcing_at_quad` attribute.
+        :type cell_indices: list or numpy.ndarray, optional
+        :return: The forcing function values, of shape (n_cells, n_test, 1).
+        :rtype: numpy.ndarray
+        """
+        return self.integrate_forcing_function(self.forcing_function, cell_indices)
+
+    def get_forcing_function_values_vector(self, component, cell_indices=None) -> np.ndarray:
+        """
+        Computes the integral of the given component of a vector valued forcing function against
+        all the test functions of the given cells.
+
+        :param component: The component of the RHS needed.
+        :type component: int
+        :param cell_indices: The indices of the cells. Defaults to all the cells, whose values are also
+            stored in the `forcing_at_quad` attribute.
+        :type cell_indices: list or numpy.ndarray, optional
+        :return: The forcing function values, of shape (n_cells, n_test, 1).
+        :rtype: numpy.ndarray
+        """
+        return self.integrate_forcing_function(
+            lambda x, y: self.forcing_function(x, y)[component], cell_indices
+        )
+
+    def integrate_forcing_function(self, forcing_function, cell_indices=None) -> np.ndarray:
+        """
+        Evaluates the given function at the quadrature points of the given cells, and computes its
+        integrals against all the test functions.
+
+        :param forcing_function: The function of x and y to integrate.
+        :type forcing_function: function
+        :param cell_indices: The indices of the cells. Defaults to all the cells.
+        :type cell_indices: list or numpy.ndarray, optional
+        :return: The integrals, of shape (n_cells, n_test, 1).
+        :rtype: numpy.ndarray
+        """
+        if cell_indices is None:
+            quad_actual_coordinates = self.quad_actual_coordinates
+        else:
+            quad_actual_coordinates = self.quad_actual_coordinates[cell_indices]
+
+        f_values = evaluate_function_at_points(
+            forcing_function, quad_actual_coordinates[:, :, 0], quad_actual_coordinates[:, :, 1]
+        )
+        f_integral = self.integrate_basis_functions(f_values, cell_indices)
+
+        if cell_indices is None:
+            self.forcing_at_quad = f_integral
+
+        return f_integral
+
+    def integrate_basis_functions(
+        self, f_values, cell_indices=None, chunk_size: int = 4096
+    ) -> np.ndarray:
+        """
+        Computes the integrals of the given values against all the test functions of the given cells.
+        The basis function values, pre-multiplied with the quadrature weights and the Jacobian, are
+        formed for chunks of cells from the reference values, if the dense basis function values of
+        all the cells have not been computed.
+
+        :param f_values: The values at the quadrature points of the cells, of shape (n_cells, N_quad).
+        :type f_values: numpy.ndarray
+        :param cell_indices: The indices of the cells. Defaults to all the cells.
+        :type cell_indices: list or numpy.ndarray, optional
+        :param chunk_size: The number of cells integrated at once. Defaults to 4096.
+        :type chunk_size: int, optional
+        :return: The integrals, of shape (n_cells, n_test, 1).
+        :rtype: numpy.ndarray
+        """
+        cell_ids = np.arange(self.n_cells)
+        if cell_indices is not None:
+            cell_ids = cell_ids[cell_indices]
+
+        if self._basis_at_quad is not None:
+            basis_at_quad = (
+                self._basis_at_quad if cell_indices is None else self._basis_at_quad[cell_ids]
+            )
+            return np.einsum("ijk,ik->ij", basis_at_quad, f_values)[:, :, np.newaxis]
+
+        integrals = np.empty((len(cell_ids), self.basis_at_quad_ref.shape[0], 1))
+        for start in range(0, len(cell_ids), chunk_size):
+            end = min(start + chunk_size, len(cell_ids))
+            mult = self.mult[cell_ids[start:end]]
+            basis_at_quad = self.basis_at_quad_ref * mult[:, np.newaxis, :]
+            integrals[start:end, :, 0] = np.einsum("ijk,ik->ij", basis_at_quad, f_values[start:end])
+
+        return integrals
@@ -0,0 +1,194 @@
+"""
+This module `fe2d_parallel_assembly.py` is used to assemble the FE values of all the cells of a large mesh
+in parallel, by splitting the cells into chunks across a pool of processes.
+
+Every worker assembles the geometric FE values (basis function values and derivatives, Jacobians and
+quadrature coordinates) of its chunk with `FE2DAssembly`, and writes them directly into preallocated
+shared memory arrays, so that the values are not pickled back to the parent process. The returned arrays
+are backed by the shared memory, which is released once the arrays are deleted.
+The user defined forcing and boundary functions are never sent to the workers (they may not be picklable),
+they are evaluated in the parent process on the assembled quadrature coordinates.
+
+The workers are started with the "spawn" method, since forking a process, in which TensorFlow has already
+started its threads, can deadlock. The spawned workers import the main script again (without running its
+`if __name__ == "__main__":` block, within which the Fespace2D object should be created), so that the
+start of the pool takes a few seconds, if the script imports TensorFlow.
+"""
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .fe2d_assembly import FE2DAssembly
+from .fe2d_tensor_cache import CACHED_ARRAYS
+
+
+class SharedMemoryArray:
+    """
+    This class keeps a shared memory block alive behind the numpy array, which is created from it with
+    `numpy.asarray`. The block is closed, once the array and all its views are deleted.
+
+    :param block: The shared memory block.
+    :type block: multiprocessing.shared_memory.SharedMemory
+    :param shape: The shape of the array.
+    :type shape: tuple
+    """
+
+    def __init__(self, block: shared_memory.SharedMemory, shape: tuple):
+        self.block = block
+
+        # the address is taken from a temporary view, the block cannot be closed while any view
+        # of its buffer exists
+        address = np.frombuffer(block.buf, dtype=np.uint8).ctypes.data
+        self.__array_interface__ = {
+            "shape": tuple(shape),
+            "typestr": np.dtype(np.float64).str,
+            "data": (address, False),
+            "version": 3,
+        }
+
+
+def get_assembled_shapes(n_cells: int, n_test: int, n_quad: int) -> dict:
+    """
+    Returns the shapes of the assembled arrays of all the cells.
+
+    :param n_cells: The number of cells.
+    :type n_cells: int
+    :param n_test: The number of test functions.
+    :type n_test: int
+    :param n_quad: The number of quadrature points.
+    :type n_quad: int
+    :return: The dictionary of shapes, with the names in `CACHED_ARRAYS`.
+    :rtype: dict
+    """
+    shapes = {name: (n_cells, n_test, n_quad) for name in CACHED_ARRAYS}
+    shapes["jacobian"] = (n_cells, n_quad, 1)
+    shapes["quad_actual_coordinates"] = (n_cells, n_quad, 2)
+
+    return shapes
+
+
+def assemble_chunk(shared_arrays, start, cell_coordinates, fe_config) -> None:
+    """
+    Assembles the FE values of a chunk of cells and writes them into the shared memory arrays.
+    This function is executed in the worker processes.
+
+    :param shared_arrays: The names and shapes of the shared memory blocks of all the arrays.
+    :type shared_arrays: dict
+    :param start: The index of the first cell of the chunk.
+    :type start: int
+    :param cell_coordinates: The coordinates of the cells of the chunk, of shape (n_chunk, 4, 2).
+    :type cell_coordinates: numpy.ndarray
+    :param fe_config: The cell type, FE order, FE type, quadrature order, quadrature type and FE transformation.
+    :type fe_config: tuple
+    :return: None
+    """
+    fe_assembly = FE2DAssembly(cell_coordinates, *fe_config, forcing_function=None)
+    end = start + cell_coordinates.shape[0]
+
+    for name, (block_name, shape) in shared_arrays.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        try:
+            array = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+            array[start:end] = getattr(fe_assembly, name)
+            del array
+        finally:
+            block.close()
+
+
+def assemble_parallel(
+    cell_coordinates: np.ndarray,
+    cell_type: str,
+    fe_order: int,
+    fe_type: str,
+    quad_order: int,
+    quad_type: str,
+    fe_transformation_type: str,
+    n_workers: int = None,
+    chunk_size: int = None,
+) -> dict:
+    """
+    Assembles the FE values of all the cells in parallel, using a pool of processes.
+
+    :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+    :type cell_coordinates: numpy.ndarray
+    :param cell_type: The type of the cell.
+    :type cell_type: str
+    :param fe_order: The order of the finite element.
+    :type fe_order: int
+    :param fe_type: The type of the finite element.
+    :type fe_type: str
+    :param quad_order: The order of the quadrature.
+    :type quad_order: int
+    :param quad_type: The type of the quadrature.
+    :type quad_type: str
+    :param fe_transformation_type: The type of the FE transformation.
+    :type fe_transformation_type: str
+    :param n_workers: The number of worker processes. Defaults to the number of CPUs.
+    :type n_workers: int, optional
+    :param chunk_size: The number of cells assembled by a worker at once. Defaults to an even split
+        of the cells into four chunks per worker.
+    :type chunk_size: int, optional
+    :return: The dictionary of the assembled values, with the names in `CACHED_ARRAYS`, which can be
+        passed to `FE2DAssembly` as `cached_values`.
+    :rtype: dict
+    :raises ValueError: If the number of workers or the chunk size is less than 1.
+    """
+    cell_coordinates = np.ascontiguousarray(cell_coordinates, dtype=np.float64)
+    n_cells = cell_coordinates.shape[0]
+    fe_config = (cell_type, fe_order, fe_type, quad_order, quad_type, fe_transformation_type)
+
+    n_workers = os.cpu_count() if n_workers is None else n_workers
+    if n_workers < 1 or (chunk_size is not None and chunk_size < 1):
+        print(f"Invalid number of workers {n_workers} or chunk size {chunk_size} in {__name__}.")
+        raise ValueError("Number of workers and chunk size should be greater than or equal to 1.")
+
+    if chunk_size is None:
+        chunk_size = max(1, int(np.ceil(n_cells / (4 * n_workers))))
+    chunks = [(start, min(start + chunk_size, n_cells)) for start in range(0, n_cells, chunk_size)]
+
+    # assemble in the current process, if there is no work to split
+    if n_workers == 1 or len(chunks) == 1:
+        fe_assembly = FE2DAssembly(cell_coordinates, *fe_config, forcing_function=None)
+        return fe_assembly.get_cached_values()
+
+    n_test = fe_order * fe_order
+    n_quad = quad_order * quad_order
+    shapes = get_assembled_shapes(n_cells, n_test, n_quad)
+
+    blocks = {}
+    values = None
+    try:
+        for name, shape in shapes.items():
+            blocks[name] = shared_memory.SharedMemory(
+                create=True, size=max(1, int(np.prod(shape)) * 8)
+            )
+        shared_arrays = {name: (blocks[name].name, shapes[name]) for name in shapes}
+
+        with ProcessPoolExecutor(
+            max_workers=min(n_workers, len(chunks)), mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = [
+                executor.submit(
+                    assemble_chunk, shared_arrays, start, cell_coordinates[start:end], fe_config
+                )
+                for start, end in chunks
+            ]
+            for future in futures:
+                future.result()
+
+        # the values are not copied out of the shared memory, the blocks are kept alive by the arrays
+        values = {
+            name: np.asarray(SharedMemoryArray(blocks[name], shapes[name])) for name in shapes
+        }
+    finally:
+        # the names of the blocks are removed, the memory is released once the arrays are deleted
+        for block in blocks.values():
+            if values is None:
+                block.close()
+            block.unlink()
+
+    return values
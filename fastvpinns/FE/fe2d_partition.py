@@ -0,0 +1,195 @@
+"""
+This module `fe2d_partition.py` is used to split the cells of a quadrilateral mesh into balanced subdomains,
+which can be trained on separate workers or processes.
+
+The cells are split with recursive coordinate bisection (RCB) of their centroids: the set of cells is
+sorted along the longest extent of its centroids and cut into two halves, whose sizes are proportional to
+the number of subdomains assigned to each half, until every set holds the cells of a single subdomain.
+The interfaces between the subdomains are the edges, which are shared by two cells of different subdomains.
+"""
+
+import numpy as np
+
+
+def partition_cells_rcb(cell_centers: np.ndarray, n_parts: int) -> np.ndarray:
+    """
+    Splits the cells into balanced subdomains with recursive coordinate bisection of their centroids.
+    The sizes of the subdomains differ by at most one cell.
+
+    :param cell_centers: The centroids of the cells, of shape (n_cells, 2).
+    :type cell_centers: numpy.ndarray
+    :param n_parts: The number of subdomains.
+    :type n_parts: int
+    :return: The subdomain of every cell, of shape (n_cells,).
+    :rtype: numpy.ndarray
+    """
+    cell_parts = np.zeros(cell_centers.shape[0], dtype=np.int64)
+
+    # sets of cells to be split - (cell ids, first subdomain id, number of subdomains)
+    stack = [(np.arange(cell_centers.shape[0]), 0, n_parts)]
+
+    while stack:
+        cell_ids, first_part, parts = stack.pop()
+
+        if parts == 1:
+            cell_parts[cell_ids] = first_part
+            continue
+
+        centers = cell_centers[cell_ids]
+        axis = int(np.argmax(np.ptp(centers, axis=0)))
+
+        # sort along the longest extent, the ties are broken with the other coordinate
+        order = np.lexsort((centers[:, 1 - axis], centers[:, axis]))
+
+        left_parts = parts // 2
+        n_left = (cell_ids.shape[0] * left_parts) // parts
+        stack.append((cell_ids[order[n_left:]], first_part + left_parts, parts - left_parts))
+        stack.append((cell_ids[order[:n_left]], first_part, left_parts))
+
+    return cell_parts
+
+
+class MeshPartition2D:
+    """
+    This class holds the split of the cells of a mesh into subdomains, and the interfaces between them.
+
+    :param cells: The coordinates of all the cells, of shape (n_cells, 4, 2).
+    :type cells: numpy.ndarray
+    :param n_parts: The number of subdomains.
+    :type n_parts: int
+    :param method: The partitioning method. Only "rcb" (recursive coordinate bisection) is supported.
+        Defaults to "rcb".
+    :type method: str, optional
+    :raises ValueError: If the cells are not of shape (n_cells, 4, 2), if the number of subdomains is not
+        between 1 and the number of cells, or if the method is not supported.
+    """
+
+    def __init__(self, cells: np.ndarray, n_parts: int, method: str = "rcb"):
+        self.cells = np.asarray(cells, dtype=np.float64)
+
+        if self.cells.ndim != 3 or self.cells.shape[1:] != (4, 2):
+            print(
+                f"Invalid shape of cells {self.cells.shape} in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError("Cells should be of shape (n_cells, 4, 2).")
+
+        self.n_cells = self.cells.shape[0]
+
+        if not 1 <= int(n_parts) <= self.n_cells:
+            print(
+                f"Invalid number of subdomains {n_parts} in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError("Number of subdomains should be between 1 and the number of cells.")
+
+        if method != "rcb":
+            print(
+                f"Invalid partitioning method {method} in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError('Partitioning method should be "rcb".')
+
+        self.n_parts = int(n_parts)
+        self.method = method
+
+        # subdomain of every cell
+        self.cell_parts = partition_cells_rcb(np.mean(self.cells, axis=1), self.n_parts)
+
+        # cells of every subdomain in the increasing order of their ids, and the index of
+        # every cell within its subdomain
+        order = np.argsort(self.cell_parts, kind="stable")
+        part_sizes = np.bincount(self.cell_parts, minlength=self.n_parts)
+        self.part_cells = np.split(order, np.cumsum(part_sizes)[:-1])
+        self.cell_local_index = np.empty(self.n_cells, dtype=np.int64)
+        self.cell_local_index[order] = np.arange(self.n_cells) - np.repeat(
+            np.cumsum(part_sizes) - part_sizes, part_sizes
+        )
+
+        # edges shared by two cells - (cell, local edge, neighbour cell, neighbour local edge)
+        self.shared_edges = self.find_shared_edges()
+
+        # shared edges between two different subdomains
+        self.interface_edges = self.shared_edges[
+            self.cell_parts[self.shared_edges[:, 0]] != self.cell_parts[self.shared_edges[:, 2]]
+        ]
+
+    def find_shared_edges(self) -> np.ndarray:
+        """
+        Finds the edges, which are shared by two cells. The nodes of the cells are identified by their
+        coordinates, and the local edge k of a cell joins its nodes k and (k + 1) % 4.
+
+        :return: The shared edges, of shape (n_shared_edges, 4), with the columns cell, local edge,
+            neighbour cell and local edge of the neighbour cell.
+        :rtype: numpy.ndarray
+        """
+        _, nodes = np.unique(self.cells.reshape(-1, 2), axis=0, return_inverse=True)
+        nodes = nodes.reshape(self.n_cells, 4).astype(np.int64)
+        n_nodes = np.max(nodes) + 1
+
+        # edges identified by their sorted pair of nodes
+        next_nodes = np.roll(nodes, -1, axis=1)
+        keys = (np.minimum(nodes, next_nodes) * n_nodes + np.maximum(nodes, next_nodes)).reshape(-1)
+
+        order = np.argsort(keys, kind="stable")
+        shared = np.flatnonzero(keys[order[1:]] == keys[order[:-1]])
+        first = order[shared]
+        second = order[shared + 1]
+
+        return np.column_stack([first // 4, first % 4, second // 4, second % 4])
+
+    def get_part_sizes(self) -> np.ndarray:
+        """
+        Returns the number of cells of every subdomain.
+
+        :return: The number of cells, of shape (n_parts,).
+        :rtype: numpy.ndarray
+        """
+        return np.bincount(self.cell_parts, minlength=self.n_parts)
+
+    def get_neighbour_parts(self, part: int) -> np.ndarray:
+        """
+        Returns the subdomains, which share an interface with the given subdomain.
+
+        :param part: The id of the subdomain.
+        :type part: int
+        :return: The ids of the neighbouring subdomains, in increasing order.
+        :rtype: numpy.ndarray
+        """
+        return np.unique(self.get_interface(part)["neighbour_parts"])
+
+    def get_interface(self, part: int) -> dict:
+        """
+        Returns the interface of the given subdomain with all the other subdomains, as seen from the
+        cells of the given subdomain.
+
+        :param part: The id of the subdomain.
+        :type part: int
+        :return: A dictionary with the index of the interface cells within the subdomain ("cells"), their
+            global ids ("global_cells"), the local edges of the interface ("edges"), the neighbouring
+            cells ("neighbour_cells"), their subdomains ("neighbour_parts"), their local edges
+            ("neighbour_edges") and the coordinates of the end points of the edges ("edge_coordinates"),
+            of shape (n_interface_edges, 2, 2).
+        :rtype: dict
+        :raises ValueError: If the subdomain id is not valid.
+        """
+        if not 0 <= part < self.n_parts:
+            print(f"Invalid subdomain {part} in {self.__class__.__name__} from {__name__}.")
+            raise ValueError(f"Subdomain should be between 0 and {self.n_parts - 1}.")
+
+        # every interface edge is seen from both its cells
+        edges = np.concatenate([self.interface_edges, self.interface_edges[:, [2, 3, 0, 1]]])
+        edges = edges[self.cell_parts[edges[:, 0]] == part]
+        edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+
+        cells, local_edges = edges[:, 0], edges[:, 1]
+        edge_coordinates = np.stack(
+            [self.cells[cells, local_edges], self.cells[cells, (local_edges + 1) % 4]], axis=1
+        )
+
+        return {
+            "cells": self.cell_local_index[cells],
+            "global_cells": cells,
+            "edges": local_edges,
+            "neighbour_cells": edges[:, 2],
+            "neighbour_parts": self.cell_parts[edges[:, 2]],
+            "neighbour_edges": edges[:, 3],
+            "edge_coordinates": edge_coordinates,
+        }
@@ -0,0 +1,202 @@
+"""
+This module `fe2d_reference_cache.py` holds a process-wide cache of the reference element data
+(basis function values and derivatives at the quadrature points, and the quadrature rule itself).
+
+The reference element data only depends on the cell type, the FE type and order and the quadrature
+type and order, so it is computed once and shared by all the cells and all the `Fespace2D` objects
+created in the same process (for example, across the trials of a hyperparameter sweep).
+
+Implementation History : The cache is bounded, and the least recently used entries are evicted
+once the maximum size is reached. The cached arrays are marked as read-only, since they are shared.
+The second derivatives of the basis functions are computed only on their first access.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .fe2d_setup_main import FE2DSetupMain
+
+# Maximum number of reference elements held in the cache
+_MAX_CACHE_SIZE = 32
+
+_reference_cache = OrderedDict()
+_reference_cache_lock = threading.Lock()
+
+
+class ReferenceElementData:
+    """
+    This class stores the basis function and quadrature data of the reference element.
+
+    :param cell_type: The type of the cell.
+    :type cell_type: str
+    :param fe_order: The order of the finite element.
+    :type fe_order: int
+    :param fe_type: The type of the finite element.
+    :type fe_type: str
+    :param quad_order: The order of the quadrature.
+    :type quad_order: int
+    :param quad_type: The type of the quadrature.
+    :type quad_type: str
+    """
+
+    def __init__(
+        self, cell_type: str, fe_order: int, fe_type: str, quad_order: int, quad_type: str
+    ):
+        fe_setup = FE2DSetupMain(
+            cell_type=cell_type,
+            fe_order=fe_order,
+            fe_type=fe_type,
+            quad_order=quad_order,
+            quad_type=quad_type,
+        )
+
+        # Basis function Class
+        self.basis_function = fe_setup.assign_basis_function()
+
+        # Quadrature Values
+        quad_weight, quad_xi, quad_eta = fe_setup.assign_quadrature_rules()
+        self.quad_weight = self._read_only(quad_weight)
+        self.quad_xi = self._read_only(quad_xi)
+        self.quad_eta = self._read_only(quad_eta)
+
+        # FE Values on the reference element - n_test x N_quad
+        self.basis_at_quad = self._read_only(self.basis_function.value(quad_xi, quad_eta))
+        self.basis_gradx_at_quad = self._read_only(self.basis_function.gradx(quad_xi, quad_eta))
+        self.basis_grady_at_quad = self._read_only(self.basis_function.grady(quad_xi, quad_eta))
+
+        # Second derivatives on the reference element - n_test x N_quad ( computed on request )
+        self._basis_gradxx_at_quad = None
+        self._basis_gradxy_at_quad = None
+        self._basis_gradyy_at_quad = None
+
+    def assign_second_derivatives(self) -> None:
+        """
+        Computes the second derivatives of the basis functions on the reference element.
+
+        :return: None
+        """
+        quad_xi, quad_eta = self.quad_xi, self.quad_eta
+        self._basis_gradxx_at_quad = self._read_only(self.basis_function.gradxx(quad_xi, quad_eta))
+        self._basis_gradxy_at_quad = self._read_only(self.basis_function.gradxy(quad_xi, quad_eta))
+        self._basis_gradyy_at_quad = self._read_only(self.basis_function.gradyy(quad_xi, quad_eta))
+
+    @property
+    def basis_gradxx_at_quad(self) -> np.ndarray:
+        """
+        The second derivative of the basis functions with respect to xi at the quadrature points.
+        """
+        if self._basis_gradxx_at_quad is None:
+            self.assign_second_derivatives()
+        return self._basis_gradxx_at_quad
+
+    @property
+    def basis_gradxy_at_quad(self) -> np.ndarray:
+        """
+        The mixed second derivative of the basis functions at the quadrature points.
+        """
+        if self._basis_gradxy_at_quad is None:
+            self.assign_second_derivatives()
+        return self._basis_gradxy_at_quad
+
+    @property
+    def basis_gradyy_at_quad(self) -> np.ndarray:
+        """
+        The second derivative of the basis functions with respect to eta at the quadrature points.
+        """
+        if self._basis_gradyy_at_quad is None:
+            self.assign_second_derivatives()
+        return self._basis_gradyy_at_quad
+
+    @staticmethod
+    def _read_only(array):
+        """
+        Returns a read-only copy of the given array, so that the shared values cannot be modified in place.
+
+        :param array: The array to be copied.
+        :type array: numpy.ndarray
+        :return: The read-only array.
+        :rtype: numpy.ndarray
+        """
+        array = np.array(array, dtype=np.float64)
+        array.setflags(write=False)
+        return array
+
+
+def get_reference_element_data(
+    cell_type: str, fe_order: int, fe_type: str, quad_order: int, quad_type: str
+) -> ReferenceElementData:
+    """
+    Returns the reference element data for the given configuration, computing it only if it is not
+    already available in the cache.
+
+    :param cell_type: The type of the cell.
+    :type cell_type: str
+    :param fe_order: The order of the finite element.
+    :type fe_order: int
+    :param fe_type: The type of the finite element.
+    :type fe_type: str
+    :param quad_order: The order of the quadrature.
+    :type quad_order: int
+    :param quad_type: The type of the quadrature.
+    :type quad_type: str
+    :return: The reference element data.
+    :rtype: ReferenceElementData
+    """
+    key = (cell_type, fe_type, fe_order, quad_order, quad_type)
+
+    with _reference_cache_lock:
+        if key in _reference_cache:
+            _reference_cache.move_to_end(key)
+            return _reference_cache[key]
+
+        reference_data = ReferenceElementData(cell_type, fe_order, fe_type, quad_order, quad_type)
+
+        _reference_cache[key] = reference_data
+        while len(_reference_cache) > _MAX_CACHE_SIZE:
+            _reference_cache.popitem(last=False)
+
+    return reference_data
+
+
+def set_reference_cache_size(max_size: int) -> None:
+    """
+    Sets the maximum number of reference elements held in the cache. The least recently used entries
+    are evicted if the cache is larger than the new size.
+
+    :param max_size: The maximum number of entries in the cache.
+    :type max_size: int
+    :return: None
+    :raises ValueError: If the maximum size is less than 1.
+    """
+    global _MAX_CACHE_SIZE
+
+    if max_size < 1:
+        print(f"Invalid reference cache size {max_size} in {__name__}.")
+        raise ValueError("Reference cache size should be greater than or equal to 1.")
+
+    with _reference_cache_lock:
+        _MAX_CACHE_SIZE = int(max_size)
+        while len(_reference_cache) > _MAX_CACHE_SIZE:
+            _reference_cache.popitem(last=False)
+
+
+def get_reference_cache_size() -> int:
+    """
+    Returns the number of reference elements currently held in the cache.
+
+    :return: The number of entries in the cache.
+    :rtype: int
+    """
+    return len(_reference_cache)
+
+
+def clear_reference_cache() -> None:
+    """
+    Removes all the entries from the cache.
+
+    :return: None
+    """
+    with _reference_cache_lock:
+        _reference_cache.clear()
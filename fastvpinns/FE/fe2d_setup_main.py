@@ -18,6 +18,10 @@ from .quadratureformulas_quad2d import *
 # import base class for FE transformation
 from .fe_transformation_2d import *
 
+# import the FE transformations explicitly, so that they are available irrespective of the import order
+from .quad_affine import QuadAffin
+from .quad_bilinear import QuadBilinear
+
 
 class FE2DSetupMain:
     """
@@ -118,11 +122,24 @@ class FE2DSetupMain:
         :rtype: FETransforamtion2D
         :raises ValueError: If the cell type or FE transformation type is invalid.
         """
+        return self.get_fe_transformation_class(fe_transformation_type)(cell_coordinates)
+
+    def get_fe_transformation_class(self, fe_transformation_type):
+        """
+        Returns the FE transformation class based on the cell type. The batched (static) methods of
+        the returned class can be used to transform all the cells of a mesh at once.
+
+        :param fe_transformation_type: The type of FE transformation.
+        :type fe_transformation_type: str
+        :return: The FE transformation class.
+        :rtype: type
+        :raises ValueError: If the cell type or FE transformation type is invalid.
+        """
         if self.cell_type == "quadrilateral":
             if fe_transformation_type == "affine":
-                return QuadAffin(cell_coordinates)
+                return QuadAffin
             elif fe_transformation_type == "bilinear":
-                return QuadBilinear(cell_coordinates)
+                return QuadBilinear
             else:
                 raise ValueError(
                     f"Invalid FE transformation type {fe_transformation_type} in {self.__class__.__name__} from {__name__}."
@@ -0,0 +1,255 @@
+"""
+This module `fe2d_tensor_cache.py` holds a persistent on-disk cache of the assembled FE values of a mesh
+(basis function values and derivatives at the quadrature points, Jacobians and quadrature coordinates).
+
+The entries are content-addressed: the key is a hash of the cell coordinates, the boundary points and
+the FE configuration (cell type, FE order and type, quadrature order and type, FE transformation).
+Every array is stored as a `.npy` file, so that a later run can memory-map it instead of assembling it.
+
+Implementation History : The cache is invalidated by a change of the mesh, the FE configuration or the
+cache format version (all of which change the key), and entries which cannot be read are removed and
+recomputed. The total size of the cache is bounded, and the least recently used entries are evicted.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Version of the format of the cache entries, which is a part of the key.
+# It has to be changed, whenever the stored values or their layout change.
+_CACHE_VERSION = "2"
+
+# Names of the arrays of an FE2DAssembly object stored in the cache. The second derivatives
+# of the basis functions are not stored, they are computed on request.
+CACHED_ARRAYS = [
+    "jacobian",
+    "basis_at_quad",
+    "basis_gradx_at_quad",
+    "basis_grady_at_quad",
+    "quad_actual_coordinates",
+]
+
+
+class FETensorCache:
+    """
+    This class is used to store and load the assembled FE values of a mesh in the given directory.
+
+    :param cache_dir: The directory of the cache. It is created if it does not exist.
+    :type cache_dir: str
+    :param max_size_mb: The maximum total size of the cache in MB. Defaults to 1024.
+    :type max_size_mb: float, optional
+    :raises ValueError: If the maximum size is not positive.
+    """
+
+    def __init__(self, cache_dir: str, max_size_mb: float = 1024.0):
+        if max_size_mb <= 0:
+            print(f"Invalid cache size {max_size_mb} in {self.__class__.__name__} from {__name__}.")
+            raise ValueError("Maximum cache size should be greater than 0.")
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+
+    @staticmethod
+    def get_cache_key(
+        cells,
+        boundary_points: dict,
+        cell_type: str,
+        fe_order: int,
+        fe_type: str,
+        quad_order: int,
+        quad_type: str,
+        fe_transformation_type: str,
+    ) -> str:
+        """
+        Computes the content-addressed key of the given mesh and FE configuration.
+
+        :param cells: The coordinates of all the cells, of shape (n_cells, 4, 2).
+        :type cells: numpy.ndarray
+        :param boundary_points: The dictionary of boundary points.
+        :type boundary_points: dict
+        :param cell_type: The type of the cell.
+        :type cell_type: str
+        :param fe_order: The order of the finite element.
+        :type fe_order: int
+        :param fe_type: The type of the finite element.
+        :type fe_type: str
+        :param quad_order: The order of the quadrature.
+        :type quad_order: int
+        :param quad_type: The type of the quadrature.
+        :type quad_type: str
+        :param fe_transformation_type: The type of the FE transformation.
+        :type fe_transformation_type: str
+        :return: The key of the cache entry.
+        :rtype: str
+        """
+        hasher = hashlib.sha256()
+
+        config = [
+            _CACHE_VERSION,
+            cell_type,
+            int(fe_order),
+            fe_type,
+            int(quad_order),
+            quad_type,
+            fe_transformation_type,
+        ]
+        hasher.update(json.dumps(config).encode("utf-8"))
+
+        cells = np.ascontiguousarray(cells, dtype=np.float64)
+        hasher.update(str(cells.shape).encode("utf-8"))
+        hasher.update(cells.tobytes())
+
+        for boundary_id in sorted(boundary_points.keys(), key=str):
+            points = np.ascontiguousarray(boundary_points[boundary_id], dtype=np.float64)
+            hasher.update(f"{boundary_id}:{points.shape}".encode("utf-8"))
+            hasher.update(points.tobytes())
+
+        return hasher.hexdigest()
+
+    def get_entry_path(self, key: str) -> Path:
+        """
+        Returns the directory of the cache entry with the given key.
+
+        :param key: The key of the cache entry.
+        :type key: str
+        :return: The directory of the entry.
+        :rtype: pathlib.Path
+        """
+        return self.cache_dir / key
+
+    def load(self, key: str):
+        """
+        Loads the arrays of the cache entry with the given key as read-only memory-mapped arrays.
+
+        :param key: The key of the cache entry.
+        :type key: str
+        :return: The dictionary of arrays, or None if the entry is not available.
+        :rtype: dict or None
+        """
+        entry_path = self.get_entry_path(key)
+        if not entry_path.is_dir():
+            return None
+
+        try:
+            with open(entry_path / "meta.json", "r", encoding="utf-8") as file:
+                meta = json.load(file)
+
+            if meta["version"] != _CACHE_VERSION:
+                raise ValueError("Cache format version mismatch")
+
+            values = {}
+            for name in CACHED_ARRAYS:
+                values[name] = np.load(entry_path / f"{name}.npy", mmap_mode="r")
+                if list(values[name].shape) != meta["shapes"][name]:
+                    raise ValueError(f"Shape mismatch of {name}")
+        except (OSError, KeyError, ValueError):
+            # incomplete or invalid entry, it will be recomputed
+            print(f"[WARNING] : Removing invalid FE cache entry {entry_path}")
+            shutil.rmtree(entry_path, ignore_errors=True)
+            return None
+
+        # mark the entry as recently used
+        os.utime(entry_path)
+
+        return values
+
+    def save(self, key: str, values: dict) -> None:
+        """
+        Stores the given arrays in the cache entry with the given key, and evicts the least recently
+        used entries if the cache is larger than the maximum size.
+
+        :param key: The key of the cache entry.
+        :type key: str
+        :param values: The dictionary of arrays, with all the names in `CACHED_ARRAYS`.
+        :type values: dict
+        :return: None
+        """
+        entry_path = self.get_entry_path(key)
+        if entry_path.is_dir():
+            return
+
+        # write into a temporary directory first, so that a partial entry is never visible
+        temp_path = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp_"))
+        try:
+            shapes = {}
+            for name in CACHED_ARRAYS:
+                array = np.asarray(values[name], dtype=np.float64)
+                np.save(temp_path / f"{name}.npy", array)
+                shapes[name] = list(array.shape)
+
+            with open(temp_path / "meta.json", "w", encoding="utf-8") as file:
+                json.dump({"version": _CACHE_VERSION, "shapes": shapes}, file)
+
+            os.replace(temp_path, entry_path)
+        except OSError:
+            # another process has stored the same entry, or the cache is not writable
+            print(f"[WARNING] : Unable to store the FE cache entry {entry_path}")
+        finally:
+            shutil.rmtree(temp_path, ignore_errors=True)
+
+        self.evict()
+
+    def get_cache_size(self) -> int:
+        """
+        Returns the total size of all the entries in the cache.
+
+        :return: The size of the cache in bytes.
+        :rtype: int
+        """
+        return sum(self.get_entry_size(entry) for entry in self.get_entries())
+
+    def get_entries(self) -> list:
+        """
+        Returns the directories of all the entries in the cache, from the least to the most recently used.
+
+        :return: The list of entry directories.
+        :rtype: list
+        """
+        entries = [
+            path for path in self.cache_dir.iterdir() if path.is_dir() and path.name[0] != "."
+        ]
+        return sorted(entries, key=lambda path: path.stat().st_mtime)
+
+    @staticmethod
+    def get_entry_size(entry_path: Path) -> int:
+        """
+        Returns the total size of the files of the given entry.
+
+        :param entry_path: The directory of the entry.
+        :type entry_path: pathlib.Path
+        :return: The size of the entry in bytes.
+        :rtype: int
+        """
+        return sum(file.stat().st_size for file in entry_path.iterdir() if file.is_file())
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries, until the cache is not larger than the maximum size.
+        The most recently used entry is always kept.
+
+        :return: None
+        """
+        entries = self.get_entries()
+        sizes = [self.get_entry_size(entry) for entry in entries]
+        total_size = sum(sizes)
+
+        for entry, size in zip(entries[:-1], sizes[:-1]):
+            if total_size <= self.max_size_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+
+    def clear(self) -> None:
+        """
+        Removes all the entries from the cache.
+
+        :return: None
+        """
+        for entry in self.get_entries():
+            shutil.rmtree(entry, ignore_errors=True)
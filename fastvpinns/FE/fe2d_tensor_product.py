@@ -0,0 +1,197 @@
+"""
+This module `fe2d_tensor_product.py` is used to obtain the sum-factorized (tensor-product) representation
+of the test function matrices of all the cells of a mesh.
+
+The 2D basis functions are outer products of 1D test functions in xi and eta, and the quadrature points
+form a tensor grid of 1D quadrature points. So, every test function matrix (values and gradients,
+pre-multiplied with the quadrature weights and the Jacobian) can be written as a sum of terms of the form
+
+    M[c, (i, j), (a, b)] = factor_x[i, b] * factor_y[j, a] * cell_weight[c, a, b]
+
+where (i, j) are the 1D test function indices and (a, b) are the 1D quadrature point indices in (eta, xi).
+Only the 1D factor matrices and the per-cell weights are stored, instead of the dense
+(n_cells, n_test, n_quad) matrices.
+"""
+
+import numpy as np
+
+from .fe2d_setup_main import FE2DSetupMain
+from .fe2d_reference_cache import get_reference_element_data
+
+
+class FE2DTensorProduct:
+    """
+    This class is used to store the 1D factor matrices and the per-cell geometric weights of the
+    test function matrices of all the cells of a mesh.
+
+    :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+    :type cell_coordinates: numpy.ndarray
+    :param cell_type: The type of the cell.
+    :type cell_type: str
+    :param fe_order: The order of the finite element.
+    :type fe_order: int
+    :param fe_type: The type of the finite element.
+    :type fe_type: str
+    :param quad_order: The order of the quadrature.
+    :type quad_order: int
+    :param quad_type: The type of the quadrature.
+    :type quad_type: str
+    :param fe_transformation_type: The type of the FE transformation.
+    :type fe_transformation_type: str
+    """
+
+    def __init__(
+        self,
+        cell_coordinates: np.ndarray,
+        cell_type: str,
+        fe_order: int,
+        fe_type: str,
+        quad_order: int,
+        quad_type: str,
+        fe_transformation_type: str,
+    ):
+        self.cell_coordinates = np.asarray(cell_coordinates, dtype=np.float64)
+        self.n_cells = self.cell_coordinates.shape[0]
+        self.fe_transformation = fe_transformation_type
+
+        self.reference_data = get_reference_element_data(
+            cell_type=cell_type,
+            fe_order=fe_order,
+            fe_type=fe_type,
+            quad_order=quad_order,
+            quad_type=quad_type,
+        )
+        self.fetransformation = FE2DSetupMain(
+            cell_type, fe_order, fe_type, quad_order, quad_type
+        ).get_fe_transformation_class(self.fe_transformation)
+
+        # 1D quadrature points ( xi varies fastest along the quadrature points )
+        self.n_quad_1d = int(round(np.sqrt(self.reference_data.quad_xi.shape[0])))
+        self.quad_xi_1d = self.reference_data.quad_xi[: self.n_quad_1d]
+        self.quad_eta_1d = self.reference_data.quad_eta[:: self.n_quad_1d]
+
+        # 1D test functions and their derivatives - n_test_1d x N_quad_1d
+        basis_function = self.reference_data.basis_function
+        self.test_x, self.grad_test_x = basis_function.get_1d_test_functions(self.quad_xi_1d)
+        self.test_y, self.grad_test_y = basis_function.get_1d_test_functions(self.quad_eta_1d)
+        self.n_test_1d = self.test_x.shape[0]
+
+        self.check_tensor_product_structure()
+
+        # per-cell geometric weights - n_cells x N_quad
+        xi = self.reference_data.quad_xi
+        eta = self.reference_data.quad_eta
+        jacobian = self.fetransformation.get_jacobian_batch(self.cell_coordinates, xi, eta)
+        self.mult = self.reference_data.quad_weight * jacobian
+
+        dxi_dx, deta_dx, dxi_dy, deta_dy = self.fetransformation.get_inverse_jacobian_batch(
+            self.cell_coordinates, xi, eta
+        )
+        self.dxi_dx_mult = dxi_dx * self.mult
+        self.deta_dx_mult = deta_dx * self.mult
+        self.dxi_dy_mult = dxi_dy * self.mult
+        self.deta_dy_mult = deta_dy * self.mult
+
+    def check_tensor_product_structure(self) -> None:
+        """
+        Checks that the quadrature points form a tensor grid and that the reference basis functions
+        are the outer products of the 1D test functions.
+
+        :return: None
+        :raises ValueError: If the quadrature or the basis functions are not of tensor-product form.
+        """
+        n_quad_1d = self.n_quad_1d
+        xi = self.reference_data.quad_xi
+        eta = self.reference_data.quad_eta
+
+        is_tensor_grid = (
+            n_quad_1d * n_quad_1d == xi.shape[0]
+            and np.allclose(xi.reshape(n_quad_1d, n_quad_1d), self.quad_xi_1d[np.newaxis, :])
+            and np.allclose(eta.reshape(n_quad_1d, n_quad_1d), self.quad_eta_1d[:, np.newaxis])
+        )
+
+        is_outer_product = is_tensor_grid and np.allclose(
+            self.outer_product(self.test_x, self.test_y), self.reference_data.basis_at_quad
+        )
+
+        if not is_outer_product:
+            print(
+                f"The basis functions or the quadrature rule are not of tensor-product form in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError(
+                "Tensor product representation is available only for tensor-product basis functions and quadrature rules."
+            )
+
+    @staticmethod
+    def outer_product(factor_x, factor_y):
+        """
+        Returns the 2D values (n_test, n_quad) formed by the outer product of the 1D factors.
+
+        :param factor_x: The 1D factor in xi, of shape (n_test_1d, N_quad_1d).
+        :type factor_x: numpy.ndarray
+        :param factor_y: The 1D factor in eta, of shape (n_test_1d, N_quad_1d).
+        :type factor_y: numpy.ndarray
+        :return: The 2D values, of shape (n_test_1d**2, N_quad_1d**2).
+        :rtype: numpy.ndarray
+        """
+        n_test_1d, n_quad_1d = factor_x.shape
+        values = np.einsum("ib,ja->ijab", factor_x, factor_y)
+
+        return values.reshape(n_test_1d * n_test_1d, n_quad_1d * n_quad_1d)
+
+    def get_factors(self, factors_x, factors_y, cell_weights):
+        """
+        Stacks the given terms into the arrays of the tensor-product representation.
+
+        :param factors_x: The 1D factors in xi of all the terms.
+        :type factors_x: list
+        :param factors_y: The 1D factors in eta of all the terms.
+        :type factors_y: list
+        :param cell_weights: The per-cell weights of all the terms, each of shape (n_cells, N_quad).
+        :type cell_weights: list
+        :return: The factors in xi and eta, of shape (n_terms, n_test_1d, N_quad_1d), and the
+            per-cell weights, of shape (n_terms, n_cells, N_quad_1d, N_quad_1d).
+        :rtype: tuple
+        """
+        shape = (self.n_cells, self.n_quad_1d, self.n_quad_1d)
+
+        return (
+            np.stack(factors_x, axis=0),
+            np.stack(factors_y, axis=0),
+            np.stack([weight.reshape(shape) for weight in cell_weights], axis=0),
+        )
+
+    def get_shape_function_val_factors(self):
+        """
+        Returns the tensor-product representation of the shape function values of all the cells.
+
+        :return: The factors in xi, the factors in eta and the per-cell weights.
+        :rtype: tuple
+        """
+        return self.get_factors([self.test_x], [self.test_y], [self.mult])
+
+    def get_shape_function_grad_x_factors(self):
+        """
+        Returns the tensor-product representation of the x-derivatives of the shape functions of all the cells.
+
+        :return: The factors in xi, the factors in eta and the per-cell weights.
+        :rtype: tuple
+        """
+        return self.get_factors(
+            [self.grad_test_x, self.test_x],
+            [self.test_y, self.grad_test_y],
+            [self.dxi_dx_mult, self.deta_dx_mult],
+        )
+
+    def get_shape_function_grad_y_factors(self):
+        """
+        Returns the tensor-product representation of the y-derivatives of the shape functions of all the cells.
+
+        :return: The factors in xi, the factors in eta and the per-cell weights.
+        :rtype: tuple
+        """
+        return self.get_factors(
+            [self.grad_test_x, self.test_x],
+            [self.test_y, self.grad_test_y],
+            [self.dxi_dy_mult, self.deta_dy_mult],
+        )
@@ -103,8 +103,8 @@ class Fespace:
         This function returns the boundary points and their corresponding values.
 
         :return: A tuple containing two arrays:
-            - The first array contains the boundary points as numpy arrays.
-            - The second array contains the values of the boundary points as numpy arrays.
+            - The first array contains the boundary points, of shape (N, 2).
+            - The second array contains the values of the boundary points, of shape (N, 1).
         :rtype: Tuple[np.ndarray, np.ndarray]
         """
 
@@ -14,12 +14,20 @@ Dependencies: None specified
 import numpy as np
 import meshio
 from .FE2D_Cell import FE2D_Cell
+from .fe2d_assembly import FE2DAssembly
+from .fe2d_tensor_product import FE2DTensorProduct
+from .fe2d_affine import FE2DAffine
+from .fe2d_tensor_cache import FETensorCache
+from .fe2d_parallel_assembly import assemble_parallel
+from .fe2d_point_locator import PointLocator2D
+from .fe2d_partition import MeshPartition2D
 
 # from rich.progress import Progress, TextColumn, BarColumn, TimeElapsedColumn
 from tqdm import tqdm
 
 # import plotting
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 
 # import path
 from pathlib import Path
@@ -28,6 +36,7 @@ from pathlib import Path
 import tensorflow as tf
 
 from ..utils.print_utils import print_table
+from ..utils.compute_utils import evaluate_function_at_points
 
 from pyDOE import lhs
 import pandas as pd
@@ -92,6 +101,23 @@ class Fespace2D(Fespace):
     :type output_path: str
     :param generate_mesh_plot: Whether to generate a plot of the mesh. Defaults to False.
     :type generate_mesh_plot: bool, optional
+    :param assembly_mode: The mode of assembly of the FE values. "cell" creates one `FE2D_Cell` object per cell,
+        "vectorized" assembles all the cells at once using `FE2DAssembly`, and "parallel" assembles chunks of
+        cells on a pool of processes (see `assemble_parallel`). Defaults to "cell".
+    :type assembly_mode: str, optional
+    :param cache_dir: The directory of the persistent cache of the assembled FE values (see `FETensorCache`).
+        The values are loaded from the cache, if the same mesh and FE configuration has been assembled before.
+        Only used with the "vectorized" and "parallel" assembly modes. Defaults to None (no cache).
+    :type cache_dir: str, optional
+    :param cache_max_size_mb: The maximum total size of the cache in MB. Defaults to 1024.
+    :type cache_max_size_mb: float, optional
+    :param n_workers: The number of worker processes of the "parallel" assembly mode, which are started
+        with the "spawn" method (see `assemble_parallel`). Defaults to None (the number of CPUs).
+    :type n_workers: int, optional
+    :param compute_hessian: Whether to compute the second derivatives of the basis functions during the setup,
+        for models or losses which need them. Otherwise, they are computed only on their first access.
+        Defaults to False.
+    :type compute_hessian: bool, optional
     """
 
     def __init__(
@@ -110,6 +136,11 @@ class Fespace2D(Fespace):
         forcing_function,
         output_path: str,
         generate_mesh_plot: bool = False,
+        assembly_mode: str = "cell",
+        cache_dir: str = None,
+        cache_max_size_mb: float = 1024.0,
+        n_workers: int = None,
+        compute_hessian: bool = False,
     ) -> None:
         """
         The constructor of the Fespace2D class.
@@ -138,6 +169,26 @@ class Fespace2D(Fespace):
 
         self.generate_mesh_plot = generate_mesh_plot
 
+        if assembly_mode not in ["cell", "vectorized", "parallel"]:
+            print(
+                f"Invalid assembly mode {assembly_mode} in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError('Assembly mode should be one of : "cell", "vectorized", "parallel"')
+        self.assembly_mode = assembly_mode
+        self.n_workers = n_workers
+        self.compute_hessian = compute_hessian
+
+        if cache_dir is not None and self.assembly_mode == "cell":
+            print(
+                f"FE cache is used with the {self.assembly_mode} assembly mode in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError(
+                'FE cache is available only with the "vectorized" and "parallel" assembly modes'
+            )
+        self.fe_cache = (
+            FETensorCache(cache_dir, cache_max_size_mb) if cache_dir is not None else None
+        )
+
         # to be calculated in the plot function
         self.total_dofs = 0
         self.total_boundary_dofs = 0
@@ -150,6 +201,12 @@ class Fespace2D(Fespace):
 
         self.fe_cell = []
 
+        # FE values of all the cells ( used only with the vectorized assembly mode )
+        self.fe_assembly = None
+
+        # point location index of the cells ( built on the first call of get_point_locator )
+        self.point_locator = None
+
         # Function which assigns the fe_cell for each cell
         self.set_finite_elements()
 
@@ -182,6 +239,20 @@ class Fespace2D(Fespace):
         # print the table
         print_table("FE Space Information", ["Property", "Value"], title, values)
 
+    @property
+    def forcing_function(self):
+        """
+        The forcing function. A new forcing function is also passed to the `FE2DAssembly` object of the
+        vectorized assembly, which computes the forcing terms in this mode.
+        """
+        return self._forcing_function
+
+    @forcing_function.setter
+    def forcing_function(self, forcing_function) -> None:
+        self._forcing_function = forcing_function
+        if getattr(self, "fe_assembly", None) is not None:
+            self.fe_assembly.forcing_function = forcing_function
+
     def set_finite_elements(self) -> None:
         """
         Assigns the finite elements to each cell.
@@ -196,6 +267,10 @@ class Fespace2D(Fespace):
 
         :return: None
         """
+        if self.assembly_mode in ["vectorized", "parallel"]:
+            self.set_finite_elements_vectorized()
+            return
+
         progress_bar = tqdm(
             total=self.n_cells,
             desc="Fe2D_cell Setup",
@@ -217,6 +292,7 @@ class Fespace2D(Fespace):
                     self.quad_type,
                     self.fe_transformation_type,
                     self.forcing_function,
+                    compute_hessian=self.compute_hessian,
                 )
             )
 
@@ -248,6 +324,90 @@ class Fespace2D(Fespace):
         # update the total number of dofs
         self.total_dofs = dof
 
+    def set_finite_elements_vectorized(self) -> None:
+        """
+        Assigns the finite element values of all the cells at once.
+
+        This method creates a single instance of the `FE2DAssembly` class, which evaluates the basis functions
+        and the quadrature rule only once on the reference element and applies the FE transformation to all
+        the cells using batched numpy operations. The values are identical to the ones obtained from the
+        per-cell `FE2D_Cell` objects.
+
+        :return: None
+        """
+        cache_key = None
+        cached_values = None
+        if self.fe_cache is not None:
+            cache_key = self.fe_cache.get_cache_key(
+                self.cells,
+                self.boundary_points,
+                self.cell_type,
+                self.fe_order,
+                self.fe_type,
+                self.quad_order,
+                self.quad_type,
+                self.fe_transformation_type,
+            )
+            cached_values = self.fe_cache.load(cache_key)
+            print(
+                f"[INFO] : FE cache {'hit' if cached_values is not None else 'miss'} for key {cache_key[:12]}"
+            )
+        is_cache_miss = self.fe_cache is not None and cached_values is None
+
+        # only the geometric values are assembled in the worker processes, the forcing function
+        # is evaluated in this process
+        if cached_values is None and self.assembly_mode == "parallel":
+            cached_values = assemble_parallel(
+                self.cells,
+                self.cell_type,
+                self.fe_order,
+                self.fe_type,
+                self.quad_order,
+                self.quad_type,
+                self.fe_transformation_type,
+                n_workers=self.n_workers,
+            )
+
+        self.fe_assembly = FE2DAssembly(
+            self.cells,
+            self.cell_type,
+            self.fe_order,
+            self.fe_type,
+            self.quad_order,
+            self.quad_type,
+            self.fe_transformation_type,
+            self.forcing_function,
+            cached_values=cached_values,
+            compute_hessian=self.compute_hessian,
+        )
+
+        if is_cache_miss:
+            self.fe_cache.save(cache_key, self.fe_assembly.get_cached_values())
+
+        # print the Shape details of all the matrices from cell 0 using print_table function
+        title = [
+            "Shape function Matrix Shape",
+            "Shape function Gradient Matrix Shape",
+            "Jacobian Matrix Shape",
+            "Quadrature Points Shape",
+            "Quadrature Weights Shape",
+            "Quadrature Actual Coordinates Shape",
+            "Forcing Function Shape",
+        ]
+        values = [
+            self.fe_assembly.basis_at_quad_ref.shape,
+            self.fe_assembly.basis_gradx_at_quad_ref.shape,
+            self.fe_assembly.jacobian[0].shape,
+            self.fe_assembly.quad_xi.shape,
+            self.fe_assembly.quad_weight.shape,
+            self.fe_assembly.quad_actual_coordinates[0].shape,
+            (self.fe_assembly.basis_function.num_shape_functions, 1),
+        ]
+        print_table("FE Matrix Shapes", ["Matrix", "Shape"], title, values)
+
+        # update the total number of dofs
+        self.total_dofs = self.fe_assembly.n_cells * self.fe_assembly.quad_xi.shape[0]
+
     def generate_plot(self, output_path) -> None:
         """
         Generate a plot of the mesh.
@@ -255,7 +415,6 @@ class Fespace2D(Fespace):
         :param output_path: The path to save the generated plot.
         :type output_path: str
         """
-        total_quad = 0
         marker_list = [
             "o",
             ".",
@@ -278,34 +437,31 @@ class Fespace2D(Fespace):
         print(f"[INFO] : Generating the plot of the mesh")
         # Plot the mesh
         plt.figure(figsize=(6.4, 4.8), dpi=300)
-
-        # label flag ( to add the label only once)
-        label_set = False
-
-        # plot every cell as a quadrilateral
-        # loop over all the cells
-        for i in range(self.n_cells):
-            # get the coordinates of the cell
-            x = self.fe_cell[i].cell_coordinates[:, 0]
-            y = self.fe_cell[i].cell_coordinates[:, 1]
-
-            # add the first point to the end of the array
-            x = np.append(x, x[0])
-            y = np.append(y, y[0])
-
-            plt.plot(x, y, "k-", linewidth=0.5)
-
-            # plot the quadrature points
-            x_quad = self.fe_cell[i].quad_actual_coordinates[:, 0]
-            y_quad = self.fe_cell[i].quad_actual_coordinates[:, 1]
-
-            total_quad += x_quad.shape[0]
-
-            if not label_set:
-                plt.scatter(x_quad, y_quad, marker="x", color="b", s=2, label="Quad Pts")
-                label_set = True
-            else:
-                plt.scatter(x_quad, y_quad, marker="x", color="b", s=2)
+        axis = plt.gca()
+
+        # plot all the cells as a single collection of closed polylines
+        cells = np.asarray(self.cells, dtype=np.float64)
+        cell_outlines = np.concatenate([cells, cells[:, :1, :]], axis=1)
+        axis.add_collection(LineCollection(cell_outlines, colors="k", linewidths=0.5))
+        axis.autoscale_view()
+
+        # plot the quadrature points of all the cells at once
+        if self.fe_assembly is not None:
+            quad_actual_coordinates = self.fe_assembly.quad_actual_coordinates.reshape(-1, 2)
+        else:
+            quad_actual_coordinates = np.concatenate(
+                [self.get_quadrature_actual_coordinates(i) for i in range(self.n_cells)]
+            )
+        total_quad = quad_actual_coordinates.shape[0]
+
+        plt.scatter(
+            quad_actual_coordinates[:, 0],
+            quad_actual_coordinates[:, 1],
+            marker="x",
+            color="b",
+            s=2,
+            label="Quad Pts",
+        )
 
         self.total_dofs = total_quad
 
@@ -334,6 +490,7 @@ class Fespace2D(Fespace):
 
         plt.savefig(str(Path(output_path) / "mesh.png"), bbox_inches="tight")
         plt.savefig(str(Path(output_path) / "mesh.svg"), bbox_inches="tight")
+        plt.close()
 
         # print the total number of quadrature points
         print(f"Plots generated")
@@ -341,61 +498,84 @@ class Fespace2D(Fespace):
         print(f"[INFO] : Total number of quadrature points = {self.total_dofs}")
         print(f"[INFO] : Total number of boundary points = {self.total_boundary_dofs}")
 
-    def generate_dirichlet_boundary_data(self) -> np.ndarray:
+    def evaluate_boundary_functions(self, component=None):
         """
-        Generate Dirichlet boundary data.
+        Evaluates the boundary functions at all the boundary points.
 
-        This function returns the boundary points and their corresponding values.
+        The boundary function of every boundary tag is evaluated once on the coordinate arrays of all the
+        boundary points of the tag (pointwise, only if the function is not array-safe).
 
-        :return: A tuple containing two arrays:
-            - The first array contains the boundary points as numpy arrays.
-            - The second array contains the values of the boundary points as numpy arrays.
-        :rtype: Tuple[np.ndarray, np.ndarray]
+        :param component: The component of a vector valued boundary function. Defaults to None, in which case
+            all the components of a vector valued boundary function are returned.
+        :type component: int, optional
+        :return: The boundary points, of shape (N, 2), and the values of the boundary function,
+            of shape (N, 1) (or (N, n_components) for vector valued functions without a component).
+        :rtype: tuple(numpy.ndarray, numpy.ndarray)
         """
         x = []
         y = []
         for bound_id, bound_pts in self.boundary_points.items():
-            # get the coordinates of the boundary points
-            for pt in bound_pts:
-                pt_new = np.array([pt[0], pt[1]], dtype=np.float64)
-                x.append(pt_new)
-                val = np.array(
-                    self.bound_function_dict[bound_id](pt[0], pt[1]), dtype=np.float64
+            # the points of an external mesh also carry the z-coordinate
+            bound_pts = np.asarray(bound_pts, dtype=np.float64)[..., :2].reshape(-1, 2)
+
+            bound_function = self.bound_function_dict[bound_id]
+            if component is not None:
+                bound_function = lambda x, y, f=bound_function: f(x, y)[component]
+
+            try:
+                values = evaluate_function_at_points(
+                    bound_function, bound_pts[:, 0], bound_pts[:, 1]
                 ).reshape(-1, 1)
-                y.append(val)
+            except (TypeError, ValueError):
+                # vector valued boundary function, evaluated pointwise
+                values = np.array(
+                    [np.ravel(bound_function(pt[0], pt[1])) for pt in bound_pts], dtype=np.float64
+                ).reshape(bound_pts.shape[0], -1)
+
+            x.append(bound_pts)
+            y.append(values)
+
+        if not x:
+            return np.zeros((0, 2), dtype=np.float64), np.zeros((0, 1), dtype=np.float64)
+
+        return np.concatenate(x, axis=0), np.concatenate(y, axis=0)
+
+    def generate_dirichlet_boundary_data(self) -> tuple:
+        """
+        Generate Dirichlet boundary data.
+
+        This function returns the boundary points and their corresponding values. The points and the values
+        are returned as arrays (instead of lists of the points and the values of every boundary point).
+
+        :return: A tuple containing two arrays:
+            - The first array contains the boundary points, of shape (N, 2).
+            - The second array contains the values of the boundary points, of shape (N, 1).
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        x, y = self.evaluate_boundary_functions()
 
         print(f"[INFO] : Total number of Dirichlet boundary points = {len(x)}")
         self.total_dirichlet_dofs = len(x)
-        print(f"[INFO] : Shape of Dirichlet-X = {np.array(x).shape}")
-        print(f"[INFO] : Shape of Y = {np.array(y).shape}")
+        print(f"[INFO] : Shape of Dirichlet-X = {x.shape}")
+        print(f"[INFO] : Shape of Y = {y.shape}")
 
         return x, y
 
-    def generate_dirichlet_boundary_data_vector(self, component) -> np.ndarray:
+    def generate_dirichlet_boundary_data_vector(self, component) -> tuple:
         """
         Generate the boundary data vector for the Dirichlet boundary condition.
 
         This function returns the boundary points and their corresponding values for a specific component.
+        The points and the values are returned as arrays (instead of lists of the points and the values of
+        every boundary point).
 
         :param component: The component for which the boundary data vector is generated.
         :type component: int
 
-        :return: The boundary points and their values as numpy arrays.
+        :return: The boundary points, of shape (N, 2), and their values, of shape (N, 1), as numpy arrays.
         :rtype: tuple(numpy.ndarray, numpy.ndarray)
         """
-        x = []
-        y = []
-        for bound_id, bound_pts in self.boundary_points.items():
-            # get the coordinates of the boundary points
-            for pt in bound_pts:
-                pt_new = np.array([pt[0], pt[1]], dtype=np.float64)
-                x.append(pt_new)
-                val = np.array(
-                    self.bound_function_dict[bound_id](pt[0], pt[1])[component], dtype=np.float64
-                ).reshape(-1, 1)
-                y.append(val)
-
-        return x, y
+        return self.evaluate_boundary_functions(component)
 
     def get_shape_function_val(self, cell_index) -> np.ndarray:
         """
@@ -409,11 +589,14 @@ class Fespace2D(Fespace):
 
         :raises ValueError: If the cell_index is greater than the number of cells.
         """
-        if cell_index >= len(self.fe_cell) or cell_index < 0:
+        if cell_index >= self.n_cells or cell_index < 0:
             raise ValueError(
                 f"cell_index should be less than {self.n_cells} and greater than or equal to 0"
             )
 
+        if self.fe_assembly is not None:
+            return self.fe_assembly.basis_at_quad[cell_index].copy()
+
         return self.fe_cell[cell_index].basis_at_quad.copy()
 
     def get_shape_function_grad_x(self, cell_index) -> np.ndarray:
@@ -430,11 +613,14 @@ class Fespace2D(Fespace):
 
         This function returns the actual values of the gradient of the shape function on a given cell.
         """
-        if cell_index >= len(self.fe_cell) or cell_index < 0:
+        if cell_index >= self.n_cells or cell_index < 0:
             raise ValueError(
                 f"cell_index should be less than {self.n_cells} and greater than or equal to 0"
             )
 
+        if self.fe_assembly is not None:
+            return self.fe_assembly.basis_gradx_at_quad[cell_index].copy()
+
         return self.fe_cell[cell_index].basis_gradx_at_quad.copy()
 
     def get_shape_function_grad_x_ref(self, cell_index) -> np.ndarray:
@@ -449,11 +635,14 @@ class Fespace2D(Fespace):
 
         :raises ValueError: If the cell_index is greater than the number of cells.
         """
-        if cell_index >= len(self.fe_cell) or cell_index < 0:
+        if cell_index >= self.n_cells or cell_index < 0:
             raise ValueError(
                 f"cell_index should be less than {self.n_cells} and greater than or equal to 0"
             )
 
+        if self.fe_assembly is not None:
+            return self.fe_assembly.basis_gradx_at_quad_ref.copy()
+
         return self.fe_cell[cell_index].basis_gradx_at_quad_ref.copy()
 
     def get_shape_function_grad_y(self, cell_index) -> np.ndarray:
@@ -468,11 +657,14 @@ class Fespace2D(Fespace):
 
         :raises ValueError: If the cell_index is greater than the total number of cells.
         """
-        if cell_index >= len(self.fe_cell) or cell_index < 0:
+        if cell_index >= self.n_cells or cell_index < 0:
             raise ValueError(
                 f"cell_index should be less than {self.n_cells} and greater than or equal to 0"
             )
 
+        if self.fe_assembly is not None:
+            return self.fe_assembly.basis_grady_at_quad[cell_index].copy()
+
         return self.fe_cell[cell_index].basis_grady_at_quad.copy()
 
     def get_shape_function_grad_y_ref(self, cell_index):
@@ -494,11 +686,14 @@ class Fespace2D(Fespace):
         .. note::
             The returned gradient values are copied from the `basis_grady_at_quad_ref` array to ensure immutability.
         """
-        if cell_index >= len(self.fe_cell) or cell_index < 0:
+        if cell_index >= self.n_cells or cell_index < 0:
             raise ValueError(
                 f"cell_index should be less than {self.n_cells} and greater than or equal to 0"
             )
 
+        if self.fe_assembly is not None:
+            return self.fe_assembly.basis_grady_at_quad_ref.copy()
+
         return self.fe_cell[cell_index].basis_grady_at_quad_ref.copy()
 
     def get_quadrature_actual_coordinates(self, cell_index) -> np.ndarray:
@@ -520,11 +715,14 @@ class Fespace2D(Fespace):
                 [0.3, 0.4],
                 [0.5, 0.6]])
         """
-        if cell_index >= len(self.fe_cell) or cell_index < 0:
+        if cell_index >= self.n_cells or cell_index < 0:
             raise ValueError(
                 f"cell_index should be less than {self.n_cells} and greater than or equal to 0"
             )
 
+        if self.fe_assembly is not None:
+            return self.fe_assembly.quad_actual_coordinates[cell_index].copy()
+
         return self.fe_cell[cell_index].quad_actual_coordinates.copy()
 
     def get_quadrature_weights(self, cell_index) -> np.ndarray:
@@ -543,11 +741,14 @@ class Fespace2D(Fespace):
         >>> print(weights)
         [0.1, 0.2, 0.3, 0.4]
         """
-        if cell_index >= len(self.fe_cell) or cell_index < 0:
+        if cell_index >= self.n_cells or cell_index < 0:
             raise ValueError(
                 f"cell_index should be less than {self.n_cells} and greater than or equal to 0"
             )
 
+        if self.fe_assembly is not None:
+            return self.fe_assembly.mult[cell_index].copy()
+
         return self.fe_cell[cell_index].mult.copy()
 
     def get_forcing_function_values(self, cell_index) -> np.ndarray:
@@ -563,19 +764,17 @@ class Fespace2D(Fespace):
         :raises ValueError: If cell_index is greater than the number of cells.
 
         This function computes the forcing function values at the quadrature points for a given cell.
-        It loops over all the basis functions and computes the integral using the actual coordinates
-        and the basis functions at the quadrature points. The resulting values are stored in the
-        `forcing_at_quad` attribute of the corresponding `fe_cell` object.
-
-        Note: The forcing function is evaluated using the `forcing_function` method of the `fe_cell`
-        object.
+        The forcing function is evaluated once on all the quadrature points of the cell (pointwise, only if
+        the function is not array-safe), and the integrals against all the basis functions are computed as a
+        single contraction with the basis functions at the quadrature points. The resulting values are stored
+        in the `forcing_at_quad` attribute of the corresponding `fe_cell` object.
 
         Example usage:
             >>> fespace = FESpace2D()
             >>> cell_index = 0
             >>> forcing_values = fespace.get_forcing_function_values(cell_index)
         """
-        if cell_index >= len(self.fe_cell) or cell_index < 0:
+        if cell_index >= self.n_cells or cell_index < 0:
             raise ValueError(
                 f"cell_index should be less than {self.n_cells} and greater than or equal to 0"
             )
@@ -583,31 +782,88 @@ class Fespace2D(Fespace):
         # Changed by Thivin: To assemble the forcing function at the quadrature points here in the fespace
         # so that it can be used to handle multiple dimensions on a vector valud problem
 
-        # get number of shape functions
-        n_shape_functions = self.fe_cell[cell_index].basis_function.num_shape_functions
-
-        # Loop over all the basis functions and compute the integral
-        f_integral = np.zeros((n_shape_functions, 1), dtype=np.float64)
+        if self.fe_assembly is not None:
+            return self.fe_assembly.get_forcing_function_values([cell_index])[0]
 
-        for i in range(n_shape_functions):
-            val = 0
-            for q in range(self.fe_cell[cell_index].basis_at_quad.shape[1]):
-                x = self.fe_cell[cell_index].quad_actual_coordinates[q, 0]
-                y = self.fe_cell[cell_index].quad_actual_coordinates[q, 1]
-                # print("f_values[q] = ",f_values[q])
+        basis_at_quad = self.fe_cell[cell_index].basis_at_quad
+        quad_actual_coordinates = self.fe_cell[cell_index].quad_actual_coordinates
 
-                # the Jacobian and the quadrature weights are pre multiplied to the basis functions
-                val += (self.fe_cell[cell_index].basis_at_quad[i, q]) * self.fe_cell[
-                    cell_index
-                ].forcing_function(x, y)
-                # print("val = ", val)
-
-            f_integral[i] = val
+        # the Jacobian and the quadrature weights are pre multiplied to the basis functions
+        f_values = evaluate_function_at_points(
+            self.forcing_function, quad_actual_coordinates[:, 0], quad_actual_coordinates[:, 1]
+        )
+        f_integral = np.dot(basis_at_quad, f_values).reshape(-1, 1)
 
         self.fe_cell[cell_index].forcing_at_quad = f_integral
 
         return self.fe_cell[cell_index].forcing_at_quad.copy()
 
+    def get_stacked_fe_values(self, name) -> np.ndarray:
+        """
+        Get the given FE values of all the cells, stacked along the first axis.
+
+        :param name: The name of the FE values, one of "basis_at_quad", "basis_gradx_at_quad",
+            "basis_grady_at_quad" and "quad_actual_coordinates".
+        :type name: str
+
+        :return: The FE values of all the cells, of shape (n_cells, n_test, n_quad) for the basis functions
+            and (n_cells, n_quad, 2) for the quadrature coordinates.
+        :rtype: np.ndarray
+
+        :raises ValueError: If the name is not valid.
+
+        With the vectorized assembly, the arrays of the `FE2DAssembly` object are returned without a copy,
+        and they are memory-mapped if they were loaded from the FE tensor cache.
+        """
+        if name not in [
+            "basis_at_quad",
+            "basis_gradx_at_quad",
+            "basis_grady_at_quad",
+            "quad_actual_coordinates",
+        ]:
+            print(f"Invalid FE values {name} in {self.__class__.__name__} from {__name__}.")
+            raise ValueError(
+                'FE values should be one of : "basis_at_quad", "basis_gradx_at_quad", '
+                '"basis_grady_at_quad", "quad_actual_coordinates"'
+            )
+
+        if self.fe_assembly is not None:
+            return getattr(self.fe_assembly, name)
+
+        return np.stack([getattr(fe_cell, name) for fe_cell in self.fe_cell], axis=0)
+
+    def get_forcing_function_values_all_cells(self) -> np.ndarray:
+        """
+        Get the forcing function values at the quadrature points of all the cells at once.
+
+        :return: The forcing function values of all the cells, of shape (n_cells, n_test, 1).
+        :rtype: np.ndarray
+
+        The forcing function is evaluated once on the quadrature points of the whole mesh, and the
+        integrals of all the cells are formed as a single batched contraction with the basis functions
+        at the quadrature points.
+        """
+        # the vectorized assembly integrates with the reference basis functions, without the dense
+        # basis function values of all the cells
+        if self.fe_assembly is not None:
+            return self.fe_assembly.get_forcing_function_values()
+
+        quad_actual_coordinates = self.get_stacked_fe_values("quad_actual_coordinates")
+
+        f_values = evaluate_function_at_points(
+            self.forcing_function,
+            quad_actual_coordinates[:, :, 0],
+            quad_actual_coordinates[:, :, 1],
+        )
+
+        basis_at_quad = self.get_stacked_fe_values("basis_at_quad")
+        f_integral = np.einsum("ijk,ik->ij", basis_at_quad, f_values)[:, :, np.newaxis]
+
+        for cell_index in range(self.n_cells):
+            self.fe_cell[cell_index].forcing_at_quad = f_integral[cell_index].copy()
+
+        return f_integral
+
     def get_forcing_function_values_vector(self, cell_index, component) -> np.ndarray:
         """
         This function will return the forcing function values at the quadrature points
@@ -621,11 +877,14 @@ class Fespace2D(Fespace):
         :rtype: np.ndarray
         :raises ValueError: If cell_index is greater than the number of cells
         """
-        if cell_index >= len(self.fe_cell) or cell_index < 0:
+        if cell_index >= self.n_cells or cell_index < 0:
             raise ValueError(
                 f"cell_index should be less than {self.n_cells} and greater than or equal to 0"
             )
 
+        if self.fe_assembly is not None:
+            return self.fe_assembly.get_forcing_function_values_vector(component, [cell_index])[0]
+
         # get the coordinates
         x = self.fe_cell[cell_index].quad_actual_coordinates[:, 0]
         y = self.fe_cell[cell_index].quad_actual_coordinates[:, 1]
@@ -640,6 +899,84 @@ class Fespace2D(Fespace):
 
         return self.fe_cell[cell_index].forcing_at_quad.copy()
 
+    def get_tensor_product_test_functions(self) -> FE2DTensorProduct:
+        """
+        Get the sum-factorized (tensor-product) representation of the test function matrices of all the cells.
+
+        :return: The FE2DTensorProduct object, which holds the 1D factor matrices and the per-cell geometric weights.
+        :rtype: FE2DTensorProduct
+
+        :raises ValueError: If the basis functions or the quadrature rule are not of tensor-product form.
+        """
+        return FE2DTensorProduct(
+            self.cells,
+            self.cell_type,
+            self.fe_order,
+            self.fe_type,
+            self.quad_order,
+            self.quad_type,
+            self.fe_transformation_type,
+        )
+
+    def get_affine_test_functions(self) -> FE2DAffine:
+        """
+        Get the compact representation of the test function matrices of all the cells, for meshes with a
+        constant Jacobian within every cell (affine transformation, or a mesh made of parallelograms).
+
+        :return: The FE2DAffine object, which holds the reference matrices and the per-cell coefficients.
+            Its `is_affine` attribute tells whether the representation is available for this mesh.
+        :rtype: FE2DAffine
+        """
+        return FE2DAffine(
+            self.cells,
+            self.cell_type,
+            self.fe_order,
+            self.fe_type,
+            self.quad_order,
+            self.quad_type,
+            self.fe_transformation_type,
+        )
+
+    def get_point_locator(self) -> PointLocator2D:
+        """
+        Get the point location index of the cells of the mesh. The index is built on the first call
+        and reused afterwards.
+
+        :return: The PointLocator2D object of the cells.
+        :rtype: PointLocator2D
+        """
+        if self.point_locator is None:
+            self.point_locator = PointLocator2D(self.cells)
+
+        return self.point_locator
+
+    def locate_points(self, points):
+        """
+        Find the cells which contain the given points, and the reference coordinates of the points
+        within their cells.
+
+        :param points: The coordinates of the points, of shape (n_points, 2).
+        :type points: numpy.ndarray
+        :return: The ids of the cells, which are -1 for the points outside the mesh, and the reference
+            coordinates xi and eta, which are NaN for the points outside the mesh. Each of shape (n_points,).
+        :rtype: tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        """
+        return self.get_point_locator().locate(points)
+
+    def partition_cells(self, n_parts, method="rcb") -> MeshPartition2D:
+        """
+        Split the cells of the mesh into balanced subdomains.
+
+        :param n_parts: The number of subdomains.
+        :type n_parts: int
+        :param method: The partitioning method. Defaults to "rcb" (recursive coordinate bisection).
+        :type method: str, optional
+        :return: The MeshPartition2D object, which holds the cells and the interfaces of the subdomains.
+        :rtype: MeshPartition2D
+        :raises ValueError: If the number of subdomains or the method is not valid.
+        """
+        return MeshPartition2D(self.cells, n_parts, method)
+
     def get_sensor_data(self, exact_solution, num_points):
         """
         Obtain sensor data (actual solution) at random points.
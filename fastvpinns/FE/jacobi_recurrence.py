@@ -0,0 +1,89 @@
+"""
+The file `jacobi_recurrence.py` contains the functions to evaluate the Jacobi polynomials of all the degrees
+0..n_max, and their first and second derivatives, at once using the three-term recurrence relation.
+
+This avoids the construction of a `scipy.special.jacobi` polynomial object per degree, whose coefficients
+are computed from the roots of the polynomial and lose accuracy at high degrees.
+The derivatives are computed from the Jacobi polynomials with shifted parameters,
+
+    d/dx P_n^(a, b)(x) = (n + a + b + 1) / 2 * P_(n-1)^(a+1, b+1)(x)
+
+Dependencies: numpy
+"""
+
+import numpy as np
+
+
+def jacobi_polynomials(n_max: int, a: float, b: float, x) -> np.ndarray:
+    """
+    Evaluate the Jacobi polynomials of all the degrees 0..n_max with parameters a and b at the given points x.
+
+    :param n_max: Maximum degree of the Jacobi polynomials.
+    :type n_max: int
+    :param a: First parameter of the Jacobi polynomials.
+    :type a: float
+    :param b: Second parameter of the Jacobi polynomials.
+    :type b: float
+    :param x: Points at which to evaluate the Jacobi polynomials.
+    :type x: array_like
+    :return: Values of the Jacobi polynomials, of shape (n_max + 1, len(x)).
+        The array is empty, if n_max is negative.
+    :rtype: numpy.ndarray
+    """
+    x = np.asarray(x, dtype=np.float64).reshape(-1)
+    values = np.zeros((max(n_max + 1, 0), x.shape[0]), dtype=np.float64)
+
+    if n_max < 0:
+        return values
+
+    values[0] = 1.0
+    if n_max >= 1:
+        values[1] = (a + 1.0) + (a + b + 2.0) * (x - 1.0) / 2.0
+
+    for n in range(2, n_max + 1):
+        c = 2.0 * n + a + b
+        a1 = 2.0 * n * (n + a + b) * (c - 2.0)
+        a2 = (c - 1.0) * (a * a - b * b)
+        a3 = (c - 2.0) * (c - 1.0) * c
+        a4 = 2.0 * (n + a - 1.0) * (n + b - 1.0) * c
+        values[n] = ((a2 + a3 * x) * values[n - 1] - a4 * values[n - 2]) / a1
+
+    return values
+
+
+def jacobi_polynomials_derivatives(n_max: int, a: float, b: float, x):
+    """
+    Evaluate the Jacobi polynomials of all the degrees 0..n_max with parameters a and b, and their first
+    and second derivatives, at the given points x.
+
+    :param n_max: Maximum degree of the Jacobi polynomials.
+    :type n_max: int
+    :param a: First parameter of the Jacobi polynomials.
+    :type a: float
+    :param b: Second parameter of the Jacobi polynomials.
+    :type b: float
+    :param x: Points at which to evaluate the Jacobi polynomials.
+    :type x: array_like
+    :return: Values, first derivatives and second derivatives of the Jacobi polynomials,
+        each of shape (n_max + 1, len(x)).
+    :rtype: tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray)
+    """
+    values = jacobi_polynomials(n_max, a, b, x)
+    first = np.zeros_like(values)
+    second = np.zeros_like(values)
+
+    degrees = np.arange(n_max + 1, dtype=np.float64)[:, np.newaxis]
+
+    if n_max >= 1:
+        first[1:] = (
+            (degrees[1:] + a + b + 1.0) / 2.0 * jacobi_polynomials(n_max - 1, a + 1, b + 1, x)
+        )
+    if n_max >= 2:
+        second[2:] = (
+            (degrees[2:] + a + b + 1.0)
+            * (degrees[2:] + a + b + 2.0)
+            / 4.0
+            * jacobi_polynomials(n_max - 2, a + 2, b + 2, x)
+        )
+
+    return values, first, second
@@ -113,12 +113,8 @@ class QuadAffin(FETransforamtion2D):
         :return: The derivatives of the original coordinates with respect to the reference coordinates.
         :rtype: tuple
         """
-        gradx_orig = np.zeros(ref_gradx.shape)
-        grady_orig = np.zeros(ref_grady.shape)
-
-        for i in range(ref_gradx.shape[0]):
-            gradx_orig[i] = (self.yc2 * ref_gradx[i] - self.yc1 * ref_grady[i]) * self.rec_detjk
-            grady_orig[i] = (-self.xc2 * ref_gradx[i] + self.xc1 * ref_grady[i]) * self.rec_detjk
+        gradx_orig = (self.yc2 * ref_gradx - self.yc1 * ref_grady) * self.rec_detjk
+        grady_orig = (-self.xc2 * ref_gradx + self.xc1 * ref_grady) * self.rec_detjk
 
         return gradx_orig, grady_orig
 
@@ -140,35 +136,223 @@ class QuadAffin(FETransforamtion2D):
         :return: The second derivatives (xx, xy, yy) of the original coordinates with respect to the reference coordinates.
         :rtype: tuple
         """
-        GeoData = np.zeros((3, 3))
-        Eye = np.identity(3)
+        # solve the linear system
+        solution = QuadAffin.get_second_derivative_matrix_batch(
+            np.array([[self.xc1]]),
+            np.array([[self.xc2]]),
+            np.array([[self.yc1]]),
+            np.array([[self.yc2]]),
+        )[0]
 
-        # Populate GeoData (assuming xc1, xc2, yc1, yc2 are defined)
-        GeoData[0, 0] = self.xc1 * self.xc1
-        GeoData[0, 1] = 2 * self.xc1 * self.yc1
-        GeoData[0, 2] = self.yc1 * self.yc1
-        GeoData[1, 0] = self.xc1 * self.xc2
-        GeoData[1, 1] = self.yc1 * self.xc2 + self.xc1 * self.yc2
-        GeoData[1, 2] = self.yc1 * self.yc2
-        GeoData[2, 0] = self.xc2 * self.xc2
-        GeoData[2, 1] = 2 * self.xc2 * self.yc2
-        GeoData[2, 2] = self.yc2 * self.yc2
+        r20 = grad_xx_ref
+        r11 = grad_xy_ref
+        r02 = grad_yy_ref
 
-        # solve the linear system
-        solution = np.linalg.solve(GeoData, Eye)
+        grad_xx_orig = solution[0, 0] * r20 + solution[0, 1] * r11 + solution[0, 2] * r02
+        grad_xy_orig = solution[1, 0] * r20 + solution[1, 1] * r11 + solution[1, 2] * r02
+        grad_yy_orig = solution[2, 0] * r20 + solution[2, 1] * r11 + solution[2, 2] * r02
+
+        return grad_xx_orig, grad_xy_orig, grad_yy_orig
+
+    @staticmethod
+    def get_cell_coefficients_batch(cell_coordinates):
+        """
+        Returns the transformation coefficients (as in `set_cell`) for a batch of cells.
+
+        :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+        :type cell_coordinates: numpy.ndarray
+
+        :return: The coefficients xc0, xc1, xc2, yc0, yc1, yc2, each of shape (n_cells, 1).
+        :rtype: tuple
+        """
+        x = cell_coordinates[:, :, 0]
+        y = cell_coordinates[:, :, 1]
+
+        xc0 = (x[:, 1:2] + x[:, 3:4]) * 0.5
+        xc1 = (x[:, 1:2] - x[:, 0:1]) * 0.5
+        xc2 = (x[:, 3:4] - x[:, 0:1]) * 0.5
+
+        yc0 = (y[:, 1:2] + y[:, 3:4]) * 0.5
+        yc1 = (y[:, 1:2] - y[:, 0:1]) * 0.5
+        yc2 = (y[:, 3:4] - y[:, 0:1]) * 0.5
+
+        return xc0, xc1, xc2, yc0, yc1, yc2
+
+    @staticmethod
+    def get_original_from_ref_batch(cell_coordinates, xi, eta):
+        """
+        Returns the original coordinates of the reference points (xi, eta) for a batch of cells.
+
+        :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+        :type cell_coordinates: numpy.ndarray
+        :param xi: The xi coordinates, of shape (n_quad,).
+        :type xi: numpy.ndarray
+        :param eta: The eta coordinates, of shape (n_quad,).
+        :type eta: numpy.ndarray
+
+        :return: The original coordinates, of shape (n_cells, n_quad, 2).
+        :rtype: numpy.ndarray
+        """
+        xc0, xc1, xc2, yc0, yc1, yc2 = QuadAffin.get_cell_coefficients_batch(cell_coordinates)
 
-        # generate empty arrays for the original second derivatives
-        grad_xx_orig = np.zeros(grad_xx_ref.shape)
-        grad_xy_orig = np.zeros(grad_xy_ref.shape)
-        grad_yy_orig = np.zeros(grad_yy_ref.shape)
+        x = xc0 + xc1 * xi + xc2 * eta
+        y = yc0 + yc1 * xi + yc2 * eta
 
-        for j in range(grad_xx_ref.shape[0]):
-            r20 = grad_xx_ref[j]
-            r11 = grad_xy_ref[j]
-            r02 = grad_yy_ref[j]
+        return np.stack((x, y), axis=-1)
 
-            grad_xx_orig[j] = solution[0, 0] * r20 + solution[0, 1] * r11 + solution[0, 2] * r02
-            grad_xy_orig[j] = solution[1, 0] * r20 + solution[1, 1] * r11 + solution[1, 2] * r02
-            grad_yy_orig[j] = solution[2, 0] * r20 + solution[2, 1] * r11 + solution[2, 2] * r02
+    @staticmethod
+    def get_jacobian_batch(cell_coordinates, xi, eta):
+        """
+        Returns the (absolute) Jacobian of the transformation for a batch of cells.
+
+        :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+        :type cell_coordinates: numpy.ndarray
+        :param xi: The xi coordinates, of shape (n_quad,).
+        :type xi: numpy.ndarray
+        :param eta: The eta coordinates, of shape (n_quad,).
+        :type eta: numpy.ndarray
+
+        :return: The Jacobian at the given points, of shape (n_cells, n_quad).
+        :rtype: numpy.ndarray
+        """
+        _, xc1, xc2, _, yc1, yc2 = QuadAffin.get_cell_coefficients_batch(cell_coordinates)
+
+        detjk = xc1 * yc2 - xc2 * yc1
+
+        return np.broadcast_to(abs(detjk), (detjk.shape[0], np.size(xi))).copy()
+
+    @staticmethod
+    def get_orig_from_ref_derivative_batch(cell_coordinates, ref_gradx, ref_grady, xi, eta):
+        """
+        Returns the derivatives in the original coordinates for a batch of cells.
+
+        :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+        :type cell_coordinates: numpy.ndarray
+        :param ref_gradx: The reference gradient in the x-direction, of shape (n_test, n_quad).
+        :type ref_gradx: numpy.ndarray
+        :param ref_grady: The reference gradient in the y-direction, of shape (n_test, n_quad).
+        :type ref_grady: numpy.ndarray
+        :param xi: The xi coordinates, of shape (n_quad,).
+        :type xi: numpy.ndarray
+        :param eta: The eta coordinates, of shape (n_quad,).
+        :type eta: numpy.ndarray
+
+        :return: The x and y derivatives, each of shape (n_cells, n_test, n_quad).
+        :rtype: tuple
+        """
+        _, xc1, xc2, _, yc1, yc2 = QuadAffin.get_cell_coefficients_batch(cell_coordinates)
+
+        rec_detjk = (1 / (xc1 * yc2 - xc2 * yc1))[:, :, np.newaxis]
+
+        xc1 = xc1[:, :, np.newaxis]
+        xc2 = xc2[:, :, np.newaxis]
+        yc1 = yc1[:, :, np.newaxis]
+        yc2 = yc2[:, :, np.newaxis]
+
+        gradx_orig = (yc2 * ref_gradx - yc1 * ref_grady) * rec_detjk
+        grady_orig = (-xc2 * ref_gradx + xc1 * ref_grady) * rec_detjk
+
+        return gradx_orig, grady_orig
+
+    @staticmethod
+    def get_second_derivative_matrix_batch(xc1, xc2, yc1, yc2):
+        """
+        Returns the inverse of the matrix which relates the second derivatives in the original
+        coordinates to the second derivatives in the reference coordinates, for a batch of cells.
+
+        :param xc1: The coefficient xc1 of all the cells, of shape (n_cells, 1).
+        :type xc1: numpy.ndarray
+        :param xc2: The coefficient xc2 of all the cells, of shape (n_cells, 1).
+        :type xc2: numpy.ndarray
+        :param yc1: The coefficient yc1 of all the cells, of shape (n_cells, 1).
+        :type yc1: numpy.ndarray
+        :param yc2: The coefficient yc2 of all the cells, of shape (n_cells, 1).
+        :type yc2: numpy.ndarray
+
+        :return: The inverse matrices, of shape (n_cells, 3, 3).
+        :rtype: numpy.ndarray
+        """
+        xc1, xc2, yc1, yc2 = xc1[:, 0], xc2[:, 0], yc1[:, 0], yc2[:, 0]
+
+        GeoData = np.zeros((xc1.shape[0], 3, 3))
+        Eye = np.broadcast_to(np.identity(3), GeoData.shape)
+
+        GeoData[:, 0, 0] = xc1 * xc1
+        GeoData[:, 0, 1] = 2 * xc1 * yc1
+        GeoData[:, 0, 2] = yc1 * yc1
+        GeoData[:, 1, 0] = xc1 * xc2
+        GeoData[:, 1, 1] = yc1 * xc2 + xc1 * yc2
+        GeoData[:, 1, 2] = yc1 * yc2
+        GeoData[:, 2, 0] = xc2 * xc2
+        GeoData[:, 2, 1] = 2 * xc2 * yc2
+        GeoData[:, 2, 2] = yc2 * yc2
+
+        # solve the linear systems of all the cells
+        return np.linalg.solve(GeoData, Eye)
+
+    @staticmethod
+    def get_orig_from_ref_second_derivative_batch(
+        cell_coordinates, grad_xx_ref, grad_xy_ref, grad_yy_ref, xi, eta
+    ):
+        """
+        Returns the second derivatives (xx, xy, yy) in the original coordinates for a batch of cells.
+
+        :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+        :type cell_coordinates: numpy.ndarray
+        :param grad_xx_ref: The reference second derivative in the xx-direction, of shape (n_test, n_quad).
+        :type grad_xx_ref: numpy.ndarray
+        :param grad_xy_ref: The reference second derivative in the xy-direction, of shape (n_test, n_quad).
+        :type grad_xy_ref: numpy.ndarray
+        :param grad_yy_ref: The reference second derivative in the yy-direction, of shape (n_test, n_quad).
+        :type grad_yy_ref: numpy.ndarray
+        :param xi: The xi coordinates, of shape (n_quad,).
+        :type xi: numpy.ndarray
+        :param eta: The eta coordinates, of shape (n_quad,).
+        :type eta: numpy.ndarray
+
+        :return: The xx, xy and yy derivatives, each of shape (n_cells, n_test, n_quad).
+        :rtype: tuple
+        """
+        _, xc1, xc2, _, yc1, yc2 = QuadAffin.get_cell_coefficients_batch(cell_coordinates)
+
+        solution = QuadAffin.get_second_derivative_matrix_batch(xc1, xc2, yc1, yc2)
+        solution = solution[:, :, :, np.newaxis, np.newaxis]
+
+        r20 = grad_xx_ref
+        r11 = grad_xy_ref
+        r02 = grad_yy_ref
+
+        grad_xx_orig = solution[:, 0, 0] * r20 + solution[:, 0, 1] * r11 + solution[:, 0, 2] * r02
+        grad_xy_orig = solution[:, 1, 0] * r20 + solution[:, 1, 1] * r11 + solution[:, 1, 2] * r02
+        grad_yy_orig = solution[:, 2, 0] * r20 + solution[:, 2, 1] * r11 + solution[:, 2, 2] * r02
 
         return grad_xx_orig, grad_xy_orig, grad_yy_orig
+
+    @staticmethod
+    def get_inverse_jacobian_batch(cell_coordinates, xi, eta):
+        """
+        Returns the derivatives of the reference coordinates with respect to the original coordinates
+        for a batch of cells, i.e. the factors with which the reference gradients are combined in
+        `get_orig_from_ref_derivative_batch`.
+
+        :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+        :type cell_coordinates: numpy.ndarray
+        :param xi: The xi coordinates, of shape (n_quad,).
+        :type xi: numpy.ndarray
+        :param eta: The eta coordinates, of shape (n_quad,).
+        :type eta: numpy.ndarray
+
+        :return: dxi/dx, deta/dx, dxi/dy and deta/dy, each of shape (n_cells, n_quad).
+        :rtype: tuple
+        """
+        _, xc1, xc2, _, yc1, yc2 = QuadAffin.get_cell_coefficients_batch(cell_coordinates)
+
+        rec_detjk = 1 / (xc1 * yc2 - xc2 * yc1)
+        shape = (xc1.shape[0], np.size(xi))
+
+        dxi_dx = np.broadcast_to(yc2 * rec_detjk, shape).copy()
+        deta_dx = np.broadcast_to(-yc1 * rec_detjk, shape).copy()
+        dxi_dy = np.broadcast_to(-xc2 * rec_detjk, shape).copy()
+        deta_dy = np.broadcast_to(xc1 * rec_detjk, shape).copy()
+
+        return dxi_dx, deta_dx, dxi_dy, deta_dy
@@ -116,25 +116,20 @@ class QuadBilinear(FETransforamtion2D):
         :returns: The derivatives of the original coordinates [x, y] with respect to the reference coordinates.
         :rtype: numpy.ndarray
         """
-        n_test = ref_gradx.shape[0]
-        gradx_orig = np.zeros(ref_gradx.shape, dtype=np.float64)
-        grady_orig = np.zeros(ref_grady.shape, dtype=np.float64)
-
-        for j in range(n_test):
-            Xi = xi
-            Eta = eta
-            rec_detjk = 1 / (
-                (self.xc1 + self.xc3 * Eta) * (self.yc2 + self.yc3 * Xi)
-                - (self.xc2 + self.xc3 * Xi) * (self.yc1 + self.yc3 * Eta)
-            )
-            gradx_orig[j] = (
-                (self.yc2 + self.yc3 * Xi) * ref_gradx[j]
-                - (self.yc1 + self.yc3 * Eta) * ref_grady[j]
-            ) * rec_detjk
-            grady_orig[j] = (
-                -(self.xc2 + self.xc3 * Xi) * ref_gradx[j]
-                + (self.xc1 + self.xc3 * Eta) * ref_grady[j]
-            ) * rec_detjk
+        Xi = xi
+        Eta = eta
+
+        # computed once for all the test functions
+        rec_detjk = 1 / (
+            (self.xc1 + self.xc3 * Eta) * (self.yc2 + self.yc3 * Xi)
+            - (self.xc2 + self.xc3 * Xi) * (self.yc1 + self.yc3 * Eta)
+        )
+        gradx_orig = (
+            (self.yc2 + self.yc3 * Xi) * ref_gradx - (self.yc1 + self.yc3 * Eta) * ref_grady
+        ) * rec_detjk
+        grady_orig = (
+            -(self.xc2 + self.xc3 * Xi) * ref_gradx + (self.xc1 + self.xc3 * Eta) * ref_grady
+        ) * rec_detjk
 
         return gradx_orig, grady_orig
 
@@ -158,3 +153,178 @@ class QuadBilinear(FETransforamtion2D):
         """
         # print(" Error : Second Derivative not implemented -- Ignore this error, if second derivative is not required ")
         return grad_xx_ref, grad_xy_ref, grad_yy_ref
+
+    @staticmethod
+    def get_cell_coefficients_batch(cell_coordinates):
+        """
+        Returns the transformation coefficients (as in `set_cell`) for a batch of cells.
+
+        :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+        :type cell_coordinates: numpy.ndarray
+
+        :returns: The coefficients xc0, xc1, xc2, xc3, yc0, yc1, yc2, yc3, each of shape (n_cells, 1).
+        :rtype: tuple
+        """
+        x = cell_coordinates[:, :, 0]
+        y = cell_coordinates[:, :, 1]
+
+        x0, x1, x2, x3 = x[:, 0:1], x[:, 1:2], x[:, 2:3], x[:, 3:4]
+        y0, y1, y2, y3 = y[:, 0:1], y[:, 1:2], y[:, 2:3], y[:, 3:4]
+
+        xc0 = (x0 + x1 + x2 + x3) * 0.25
+        xc1 = (-x0 + x1 + x2 - x3) * 0.25
+        xc2 = (-x0 - x1 + x2 + x3) * 0.25
+        xc3 = (x0 - x1 + x2 - x3) * 0.25
+
+        yc0 = (y0 + y1 + y2 + y3) * 0.25
+        yc1 = (-y0 + y1 + y2 - y3) * 0.25
+        yc2 = (-y0 - y1 + y2 + y3) * 0.25
+        yc3 = (y0 - y1 + y2 - y3) * 0.25
+
+        return xc0, xc1, xc2, xc3, yc0, yc1, yc2, yc3
+
+    @staticmethod
+    def get_original_from_ref_batch(cell_coordinates, xi, eta):
+        """
+        Returns the original coordinates of the reference points (xi, eta) for a batch of cells.
+
+        :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+        :type cell_coordinates: numpy.ndarray
+        :param xi: The xi coordinates, of shape (n_quad,).
+        :type xi: numpy.ndarray
+        :param eta: The eta coordinates, of shape (n_quad,).
+        :type eta: numpy.ndarray
+
+        :returns: The original coordinates, of shape (n_cells, n_quad, 2).
+        :rtype: numpy.ndarray
+        """
+        xc0, xc1, xc2, xc3, yc0, yc1, yc2, yc3 = QuadBilinear.get_cell_coefficients_batch(
+            cell_coordinates
+        )
+
+        x = xc0 + xc1 * xi + xc2 * eta + xc3 * xi * eta
+        y = yc0 + yc1 * xi + yc2 * eta + yc3 * xi * eta
+
+        return np.stack((x, y), axis=-1)
+
+    @staticmethod
+    def get_jacobian_batch(cell_coordinates, xi, eta):
+        """
+        Returns the (absolute) Jacobian of the transformation for a batch of cells.
+
+        :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+        :type cell_coordinates: numpy.ndarray
+        :param xi: The xi coordinates, of shape (n_quad,).
+        :type xi: numpy.ndarray
+        :param eta: The eta coordinates, of shape (n_quad,).
+        :type eta: numpy.ndarray
+
+        :returns: The Jacobian at the given points, of shape (n_cells, n_quad).
+        :rtype: numpy.ndarray
+        """
+        _, xc1, xc2, xc3, _, yc1, yc2, yc3 = QuadBilinear.get_cell_coefficients_batch(
+            cell_coordinates
+        )
+
+        return abs((xc1 + xc3 * eta) * (yc2 + yc3 * xi) - (xc2 + xc3 * xi) * (yc1 + yc3 * eta))
+
+    @staticmethod
+    def get_orig_from_ref_derivative_batch(cell_coordinates, ref_gradx, ref_grady, xi, eta):
+        """
+        Returns the derivatives in the original coordinates for a batch of cells.
+
+        :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+        :type cell_coordinates: numpy.ndarray
+        :param ref_gradx: The reference gradient in the x-direction, of shape (n_test, n_quad).
+        :type ref_gradx: numpy.ndarray
+        :param ref_grady: The reference gradient in the y-direction, of shape (n_test, n_quad).
+        :type ref_grady: numpy.ndarray
+        :param xi: The xi coordinates, of shape (n_quad,).
+        :type xi: numpy.ndarray
+        :param eta: The eta coordinates, of shape (n_quad,).
+        :type eta: numpy.ndarray
+
+        :returns: The x and y derivatives, each of shape (n_cells, n_test, n_quad).
+        :rtype: tuple
+        """
+        _, xc1, xc2, xc3, _, yc1, yc2, yc3 = QuadBilinear.get_cell_coefficients_batch(
+            cell_coordinates
+        )
+
+        # all the terms below are of shape (n_cells, 1, n_quad)
+        dx_dxi = (xc1 + xc3 * eta)[:, np.newaxis, :]
+        dx_deta = (xc2 + xc3 * xi)[:, np.newaxis, :]
+        dy_dxi = (yc1 + yc3 * eta)[:, np.newaxis, :]
+        dy_deta = (yc2 + yc3 * xi)[:, np.newaxis, :]
+
+        rec_detjk = 1 / (dx_dxi * dy_deta - dx_deta * dy_dxi)
+
+        gradx_orig = (dy_deta * ref_gradx - dy_dxi * ref_grady) * rec_detjk
+        grady_orig = (-dx_deta * ref_gradx + dx_dxi * ref_grady) * rec_detjk
+
+        return gradx_orig, grady_orig
+
+    @staticmethod
+    def get_orig_from_ref_second_derivative_batch(
+        cell_coordinates, grad_xx_ref, grad_xy_ref, grad_yy_ref, xi, eta
+    ):
+        """
+        Returns the second derivatives (xx, xy, yy) in the original coordinates for a batch of cells.
+
+        .. note::
+            As in `get_orig_from_ref_second_derivative`, the second derivative transformation is not
+            implemented for the bilinear transformation, and the reference values are returned for all the cells.
+
+        :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+        :type cell_coordinates: numpy.ndarray
+        :param grad_xx_ref: The reference second derivative in the xx-direction, of shape (n_test, n_quad).
+        :type grad_xx_ref: numpy.ndarray
+        :param grad_xy_ref: The reference second derivative in the xy-direction, of shape (n_test, n_quad).
+        :type grad_xy_ref: numpy.ndarray
+        :param grad_yy_ref: The reference second derivative in the yy-direction, of shape (n_test, n_quad).
+        :type grad_yy_ref: numpy.ndarray
+        :param xi: The xi coordinates, of shape (n_quad,).
+        :type xi: numpy.ndarray
+        :param eta: The eta coordinates, of shape (n_quad,).
+        :type eta: numpy.ndarray
+
+        :returns: The xx, xy and yy derivatives, each of shape (n_cells, n_test, n_quad).
+        :rtype: tuple
+        """
+        shape = (cell_coordinates.shape[0],) + np.shape(grad_xx_ref)
+
+        return (
+            np.broadcast_to(grad_xx_ref, shape),
+            np.broadcast_to(grad_xy_ref, shape),
+            np.broadcast_to(grad_yy_ref, shape),
+        )
+
+    @staticmethod
+    def get_inverse_jacobian_batch(cell_coordinates, xi, eta):
+        """
+        Returns the derivatives of the reference coordinates with respect to the original coordinates
+        for a batch of cells, i.e. the factors with which the reference gradients are combined in
+        `get_orig_from_ref_derivative_batch`.
+
+        :param cell_coordinates: The coordinates of all the cells, of shape (n_cells, 4, 2).
+        :type cell_coordinates: numpy.ndarray
+        :param xi: The xi coordinates, of shape (n_quad,).
+        :type xi: numpy.ndarray
+        :param eta: The eta coordinates, of shape (n_quad,).
+        :type eta: numpy.ndarray
+
+        :returns: dxi/dx, deta/dx, dxi/dy and deta/dy, each of shape (n_cells, n_quad).
+        :rtype: tuple
+        """
+        _, xc1, xc2, xc3, _, yc1, yc2, yc3 = QuadBilinear.get_cell_coefficients_batch(
+            cell_coordinates
+        )
+
+        dx_dxi = xc1 + xc3 * eta
+        dx_deta = xc2 + xc3 * xi
+        dy_dxi = yc1 + yc3 * eta
+        dy_deta = yc2 + yc3 * xi
+
+        rec_detjk = 1 / (dx_dxi * dy_deta - dx_deta * dy_dxi)
+
+        return dy_deta * rec_detjk, -dy_dxi * rec_detjk, -dx_deta * rec_detjk, dx_dxi * rec_detjk
@@ -14,8 +14,6 @@ import matplotlib.colors as mcolors
 import meshio
 from pyDOE import lhs
 
-import gmsh
-
 from abc import abstractmethod
 
 
@@ -57,7 +55,7 @@ class Geometry:
     @abstractmethod
     def generate_vtk_for_test(self):
         """
-        Generates a VTK from Mesh file (External) or using gmsh (for Internal).
+        Generates a VTK from Mesh file (External) or from the structured grid of the test points (for Internal).
 
         :return: None
         """
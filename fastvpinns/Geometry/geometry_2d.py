@@ -11,13 +11,12 @@ Date: 21/Sep/2023
 from pathlib import Path
 import numpy as np
 import matplotlib.pyplot as plt
-import matplotlib.colors as mcolors
+from matplotlib.collections import PolyCollection
 import meshio
 from pyDOE import lhs
 
-import gmsh
-
 from .geometry import Geometry
+from ..utils.vtk_writer import write_legacy_vtk, SolutionWriter
 
 
 class Geometry_2D(Geometry):
@@ -92,6 +91,14 @@ class Geometry_2D(Geometry):
         self.cell_points = None
         self.test_points = None
 
+        # points and connectivity of the mesh of the test points ( used to write the solution )
+        self.solution_mesh = None
+
+        # figure of the cell residuals, the cells are drawn once and only the colors are updated
+        self.cell_residual_cells = None
+        self.cell_residual_figure = None
+        self.cell_residual_collection = None
+
     def read_mesh(
         self,
         mesh_file: str,
@@ -136,15 +143,8 @@ class Geometry_2D(Geometry):
             :, :, 0:2
         ]  # remove the z coordinate, which is 0 for all points
 
-        # loop over all cells and rearrange the points in anticlockwise direction
-        for i in range(num_cells):
-            cell = cell_points[i]
-            # get the centroid of the cell
-            centroid = np.mean(cell, axis=0)
-            # get the angle of each point with respect to the centroid
-            angles = np.arctan2(cell[:, 1] - centroid[1], cell[:, 0] - centroid[0])
-            # sort the points based on the angles
-            cell_points[i] = cell[np.argsort(angles)]
+        # rearrange the points of all the cells in anticlockwise direction
+        cell_points = self.sort_cell_points_anticlockwise(cell_points)
 
         # Extract number of points within each cell
         print(f"[INFO] : Number of points per cell = {cell_points.shape}")
@@ -163,45 +163,20 @@ class Geometry_2D(Geometry):
         # now Get the physical tag of the boundary edges
         boundary_tags = self.mesh.cell_data["medit:ref"][0]
 
+        # refine the boundary points of all the edges based on the number of boundary points needed
+        # new_points - n_edges x n_points x dim
+        new_points = self.sample_boundary_edges(
+            boundary_coordinates, pow(2, boundary_point_refinement_level) + 1, bd_sampling_method
+        )
+
         # Generate a Dictionary of boundary tags and boundary coordinates
-        # Keys will be the boundary tags and values will be the list of coordinates
+        # Keys will be the boundary tags (in the order of their first appearance) and values will be
+        # the unique coordinates of all the edges with the tag
+        _, first_index = np.unique(boundary_tags, return_index=True)
         boundary_dict = {}
-
-        # refine the boundary points based on the number of boundary points needed
-        for i in range(boundary_coordinates.shape[0]):
-            p1 = boundary_coordinates[i, 0, :]
-            p2 = boundary_coordinates[i, 1, :]
-
-            if bd_sampling_method == "uniform":
-                # take the current point and next point and then perform a uniform sampling
-                new_points = np.linspace(p1, p2, pow(2, boundary_point_refinement_level) + 1)
-            elif bd_sampling_method == "lhs":
-                # take the current point and next point and then perform a uniform sampling
-                new_points = lhs(2, pow(2, boundary_point_refinement_level) + 1)
-                new_points[:, 0] = new_points[:, 0] * (p2[0] - p1[0]) + p1[0]
-                new_points[:, 1] = new_points[:, 1] * (p2[1] - p1[1]) + p1[1]
-            else:
-                print(
-                    f"Invalid sampling method {bd_sampling_method} in {self.__class__.__name__} from {__name__}."
-                )
-                raise ValueError("Sampling method should be either uniform or lhs.")
-
-            # get the boundary tag
-            tag = boundary_tags[i]
-
-            if tag not in boundary_dict:
-                boundary_dict[tag] = new_points
-            else:
-                current_val = new_points
-                prev_val = boundary_dict[tag]
-                final = np.vstack([prev_val, current_val])
-                boundary_dict[tag] = final
-
-        # get unique
-        for tag in boundary_dict.keys():
-            val = boundary_dict[tag]
-            val = np.unique(val, axis=0)
-            boundary_dict[tag] = val
+        for tag in boundary_tags[np.sort(first_index)]:
+            tag_points = new_points[boundary_tags == tag].reshape(-1, new_points.shape[-1])
+            boundary_dict[tag] = np.unique(tag_points, axis=0)
 
         self.bd_dict = boundary_dict
         # print the new boundary points  on each boundary tag (key) in a tabular format
@@ -223,6 +198,66 @@ class Geometry_2D(Geometry):
 
         return cell_points, self.bd_dict
 
+    @staticmethod
+    def sort_cell_points_anticlockwise(cell_points: np.ndarray) -> np.ndarray:
+        """
+        Rearranges the points of all the cells in anticlockwise direction, based on the angle of each point
+        with respect to the centroid of its cell.
+
+        :param cell_points: The coordinates of the points of all the cells, of shape (n_cells, n_points, 2).
+        :type cell_points: numpy.ndarray
+        :return: The rearranged coordinates, of the same shape.
+        :rtype: numpy.ndarray
+        """
+        # get the centroid of all the cells
+        centroid = np.mean(cell_points, axis=1, keepdims=True)
+        # get the angle of each point with respect to the centroid
+        angles = np.arctan2(
+            cell_points[:, :, 1] - centroid[:, :, 1], cell_points[:, :, 0] - centroid[:, :, 0]
+        )
+        # sort the points of every cell based on the angles
+        order = np.argsort(angles, axis=1)
+
+        return np.take_along_axis(cell_points, order[:, :, np.newaxis], axis=1)
+
+    def sample_boundary_edges(
+        self, boundary_coordinates: np.ndarray, num_points: int, bd_sampling_method: str
+    ) -> np.ndarray:
+        """
+        Samples the given number of points on all the boundary edges.
+
+        :param boundary_coordinates: The coordinates of the end points of all the edges, of shape (n_edges, 2, dim).
+        :type boundary_coordinates: numpy.ndarray
+        :param num_points: The number of points to be sampled on every edge.
+        :type num_points: int
+        :param bd_sampling_method: The method used to sample the points, "uniform" or "lhs".
+        :type bd_sampling_method: str
+        :return: The sampled points, of shape (n_edges, num_points, dim) for the uniform sampling,
+            and (n_edges, num_points, 2) for the lhs sampling.
+        :rtype: numpy.ndarray
+        :raises ValueError: If the sampling method is not valid.
+        """
+        p1 = boundary_coordinates[:, 0, :]
+        p2 = boundary_coordinates[:, 1, :]
+
+        if bd_sampling_method == "uniform":
+            # uniform sampling between the end points of every edge
+            new_points = np.linspace(p1, p2, num_points, axis=1)
+        elif bd_sampling_method == "lhs":
+            # latin hypercube sampling on the bounding box of every edge ( in 2D )
+            new_points = np.zeros((p1.shape[0], num_points, 2), dtype=np.float64)
+            for i in range(p1.shape[0]):
+                samples = lhs(2, num_points)
+                new_points[i, :, 0] = samples[:, 0] * (p2[i, 0] - p1[i, 0]) + p1[i, 0]
+                new_points[i, :, 1] = samples[:, 1] * (p2[i, 1] - p1[i, 1]) + p1[i, 1]
+        else:
+            print(
+                f"Invalid sampling method {bd_sampling_method} in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError("Sampling method should be either uniform or lhs.")
+
+        return new_points
+
     def generate_quad_mesh_internal(
         self,
         x_limits: tuple,
@@ -257,37 +292,11 @@ class Geometry_2D(Geometry):
         x = np.linspace(x_limits[0], x_limits[1], n_cells_x + 1)
         y = np.linspace(y_limits[0], y_limits[1], n_cells_y + 1)
 
-        # Generate quad cells from the points
-        # the output should be a list of 4 points for each cell , each being a list of 2 points [x,y]
-        cells = []
-
-        for i in range(n_cells_x):
-            for j in range(n_cells_y):
-                # get the four points of the cell
-                p1 = [x[i], y[j]]
-                p2 = [x[i + 1], y[j]]
-                p3 = [x[i + 1], y[j + 1]]
-                p4 = [x[i], y[j + 1]]
-
-                # append the points to the cells
-                cells.append([p1, p2, p3, p4])
-
-        # convert to numpy array
-        cells = np.array(cells, dtype=np.float64)
-
-        # use arctan2 to sort the points in anticlockwise direction
-        # loop over all cells and rearrange the points in anticlockwise direction
-        for i in range(cells.shape[0]):
-            cell = cells[i]
-            # get the centroid of the cell
-            centroid = np.mean(cell, axis=0)
-            # get the angle of each point with respect to the centroid
-            angles = np.arctan2(cell[:, 1] - centroid[1], cell[:, 0] - centroid[0])
-            # sort the points based on the angles
-            cells[i] = cell[np.argsort(angles)]
-
-        # generate a meshio mesh object using the cells
-        self.mesh = meshio.Mesh(points=cells.reshape(-1, 2), cells=[("quad", cells.reshape(-1, 4))])
+        # Generate quad cells from the points, the nodes of every cell are already in anticlockwise direction
+        cells, points, connectivity = self.generate_structured_grid(x, y)
+
+        # generate a meshio mesh object using the unique points and the connectivity of the cells
+        self.mesh = meshio.Mesh(points=points, cells=[("quad", connectivity)])
 
         # lets generate the boundary points, this function will return a dictionary of boundary points
         # the keys will be the boundary tags and values will be the list of boundary points
@@ -319,22 +328,22 @@ class Geometry_2D(Geometry):
         # bottom boundary
         y_bottom = (np.ones(num_bound_per_side, dtype=np.float64) * y_limits[0]).reshape(-1)
         x_bottom = _temp_bd_func(x_limits[0], x_limits[1], num_bound_per_side)
-        bd_points[1000] = np.vstack([x_bottom, y_bottom]).T
+        bd_points[1000] = np.column_stack([x_bottom, y_bottom])
 
         # right boundary
         x_right = (np.ones(num_bound_per_side, dtype=np.float64) * x_limits[1]).reshape(-1)
         y_right = _temp_bd_func(y_limits[0], y_limits[1], num_bound_per_side)
-        bd_points[1001] = np.vstack([x_right, y_right]).T
+        bd_points[1001] = np.column_stack([x_right, y_right])
 
         # top boundary
         y_top = (np.ones(num_bound_per_side, dtype=np.float64) * y_limits[1]).reshape(-1)
         x_top = _temp_bd_func(x_limits[0], x_limits[1], num_bound_per_side)
-        bd_points[1002] = np.vstack([x_top, y_top]).T
+        bd_points[1002] = np.column_stack([x_top, y_top])
 
         # left boundary
         x_left = (np.ones(num_bound_per_side, dtype=np.float64) * x_limits[0]).reshape(-1)
         y_left = _temp_bd_func(y_limits[0], y_limits[1], num_bound_per_side)
-        bd_points[1003] = np.vstack([x_left, y_left]).T
+        bd_points[1003] = np.column_stack([x_left, y_left])
 
         self.cell_points = cells
         self.bd_dict = bd_points
@@ -345,65 +354,54 @@ class Geometry_2D(Geometry):
 
         return self.cell_points, self.bd_dict
 
+    @staticmethod
+    def generate_structured_grid(x: np.ndarray, y: np.ndarray):
+        """
+        Generates the cells of a structured quadrilateral grid from the coordinates of the grid lines.
+
+        The cell (i, j), between the grid lines x[i], x[i + 1] and y[j], y[j + 1], is stored at the index
+        i * n_cells_y + j, with its nodes in anticlockwise direction starting from the bottom left node.
+
+        :param x: The coordinates of the grid lines in the x-direction, of shape (n_cells_x + 1,).
+        :type x: numpy.ndarray
+        :param y: The coordinates of the grid lines in the y-direction, of shape (n_cells_y + 1,).
+        :type y: numpy.ndarray
+        :return: The cell points, of shape (n_cells, 4, 2), the unique grid points, of shape (n_points, 2),
+            and the connectivity of the cells, of shape (n_cells, 4).
+        :rtype: tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        n_points_y = y.shape[0]
+
+        # unique grid points, the point (i, j) is stored at the index i * n_points_y + j
+        x_grid, y_grid = np.meshgrid(x, y, indexing="ij")
+        points = np.column_stack([x_grid.reshape(-1), y_grid.reshape(-1)])
+
+        # index of the bottom left node of every cell
+        index = np.arange(points.shape[0]).reshape(x.shape[0], n_points_y)[:-1, :-1].reshape(-1)
+        connectivity = np.column_stack(
+            [index, index + n_points_y, index + n_points_y + 1, index + 1]
+        )
+
+        return points[connectivity], points, connectivity
+
     def generate_vtk_for_test(self):
         """
-        Generates a VTK from Mesh file (External) or using gmsh (for Internal).
+        Generates a VTK from Mesh file (External) or from the structured grid of the test points (for Internal).
 
         :return: None
         """
 
         if self.mesh_generation_method == "internal":
-            # initialise the mesh
-            gmsh.initialize()
-
-            # Now, lets generate the mesh with the points.
-            x_range = self.x_limits[1] - self.x_limits[0]
-            y_range = self.y_limits[1] - self.y_limits[0]
-
-            mesh_size_x = x_range / self.n_test_points_x
-            mesh_size_y = y_range / self.n_test_points_y
-
-            # generate a gmsh with the given parameters
-            Xmin = self.x_limits[0]
-            Xmax = self.x_limits[1]
-            Ymin = self.y_limits[0]
-            Ymax = self.y_limits[1]
-
-            point1 = gmsh.model.geo.add_point(Xmin, Ymin, 0, mesh_size_x)
-            point2 = gmsh.model.geo.add_point(Xmax, Ymin, 0, mesh_size_x)
-            point3 = gmsh.model.geo.add_point(Xmax, Ymax, 0, mesh_size_y)
-            point4 = gmsh.model.geo.add_point(Xmin, Ymax, 0, mesh_size_y)
-
-            line1 = gmsh.model.geo.add_line(point1, point2, 1000)  ## Bottom
-            line2 = gmsh.model.geo.add_line(point2, point3, 1001)  ## Right
-            line3 = gmsh.model.geo.add_line(point3, point4, 1002)  ## Top
-            line4 = gmsh.model.geo.add_line(point4, point1, 1003)  ## Left
-
-            face1 = gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-
-            gmsh.model.geo.add_plane_surface([face1])
-
-            # Create the relevant Gmsh data structures
-            # from Gmsh model.
-            gmsh.model.geo.synchronize()
-
-            # Generate mesh:
-            gmsh.model.mesh.generate()
-
-            mesh_file_name = Path(self.output_folder) / "internal.msh"
+            # the test points and the output grid are generated from the structured grid
+            # definition in memory, without meshing the domain again
             vtk_file_name = Path(self.output_folder) / "internal.vtk"
 
-            gmsh.write(str(mesh_file_name))
-            print("[INFO] : Internal mesh file generated at ", str(mesh_file_name))
-
-            # close the gmsh
-            gmsh.finalize()
-
-            # read the mesh using meshio
-            mesh = meshio.gmsh.read(str(mesh_file_name))
-            meshio.vtk.write(str(vtk_file_name), mesh, binary=False, fmt_version="4.2")
+            points, connectivity = self.get_solution_mesh()
+            write_legacy_vtk(vtk_file_name, points, connectivity, {})
 
-            print("[INFO] : VTK file for internal mesh file generated at ", str(mesh_file_name))
+            print("[INFO] : VTK file for internal mesh file generated at ", str(vtk_file_name))
 
         elif self.mesh_generation_method == "external":
 
@@ -446,9 +444,56 @@ class Geometry_2D(Geometry):
         points = mesh.points
         return points[:, 0:2]  # return only first two columns
 
+    def get_solution_mesh(self):
+        """
+        Returns the points and the connectivity of the quadrilateral mesh of the test points
+        (see `get_test_points`), on which the solution is written.
+
+        :return: The points, of shape (n_points, 2), and the connectivity of the cells, of shape (n_cells, 4).
+        :rtype: tuple[numpy.ndarray, numpy.ndarray]
+        """
+        if self.solution_mesh is not None:
+            return self.solution_mesh
+
+        if self.mesh_generation_method == "internal":
+            # structured grid of the test points, with the x-coordinate varying fastest
+            points = self.get_test_points()
+            n_x, n_y = self.n_test_points_x, self.n_test_points_y
+            index = np.arange(n_x * n_y).reshape(n_y, n_x)[:-1, :-1].reshape(-1)
+            connectivity = np.column_stack([index, index + 1, index + n_x + 1, index + n_x])
+        else:
+            points = self.mesh.points[:, 0:2]
+            connectivity = self.mesh.cells_dict["quad"]
+
+        self.solution_mesh = (points, connectivity)
+
+        return self.solution_mesh
+
+    def get_solution_writer(
+        self, output_path: str, file_format: str = "vtu", file_prefix: str = "prediction"
+    ) -> SolutionWriter:
+        """
+        Returns a writer of the solution at the test points for a time series, which keeps the mesh in memory
+        and writes one binary data block per call (see `SolutionWriter`).
+
+        :param output_path: The path to the output folder.
+        :type output_path: str
+        :param file_format: The format of the output files, "vtu" or "xdmf". Defaults to "vtu".
+        :type file_format: str, optional
+        :param file_prefix: The prefix of the names of the output files. Defaults to "prediction".
+        :type file_prefix: str, optional
+        :return: The solution writer.
+        :rtype: SolutionWriter
+        """
+        points, connectivity = self.get_solution_mesh()
+
+        return SolutionWriter(points, connectivity, output_path, file_format, file_prefix)
+
     def write_vtk(self, solution, output_path, filename, data_names):
         """
-        Writes the data to a VTK file.
+        Writes the data at the test points to a binary VTK file.
+        The mesh is kept in memory, so the VTK file of the mesh is not read again for every call.
+        To write a time series, use the writer from `get_solution_writer`.
 
         :param solution: The solution vector.
         :type solution: numpy.ndarray
@@ -460,20 +505,6 @@ class Geometry_2D(Geometry):
         :type data_names: list
         :return: None
         """
-        # read the existing vtk into file
-        if self.mesh_generation_method == "internal":
-            vtk_file_name = Path(self.output_folder) / "internal.vtk"
-        elif self.mesh_generation_method == "external":
-            vtk_file_name = Path(self.output_folder) / "external.vtk"
-
-        data = []
-        with open(vtk_file_name, "r", encoding="utf-8") as File:
-            for line in File:
-                data.append(line)
-
-        # get the output file name
-        output_file_name = Path(output_path) / filename
-
         if solution.shape[1] != len(data_names):
             print("[Error] : File : geometry_2d.py, Function: write_vtk")
             print(
@@ -484,28 +515,26 @@ class Geometry_2D(Geometry):
             )
             raise ValueError("Number of data names and solution columns are not equal")
 
-        # write the data to the output file
-        with open(str(output_file_name), "w", encoding="utf-8") as FN:
-            for line in data:
-                FN.write(line)
-                if "POINT_DATA" in line.strip():
-                    break
+        # get the output file name
+        output_file_name = Path(output_path) / filename
 
-            for i in range(solution.shape[1]):
-                FN.write("SCALARS " + data_names[i] + " float\n")
-                FN.write("LOOKUP_TABLE default\n")
-                np.savetxt(FN, solution[:, i])
-                FN.write("\n")
+        # write the data on the mesh held in memory as a binary VTK file
+        points, connectivity = self.get_solution_mesh()
+        point_data = {name: solution[:, i] for i, name in enumerate(data_names)}
+        write_legacy_vtk(output_file_name, points, connectivity, point_data)
 
         # save the vtk file as image
         # self.save_vtk_as_image(str(output_file_name), data_names)
 
     def plot_adaptive_mesh(
-        self, cells_list, area_averaged_cell_loss_list, epoch, filename="cell_residual"
+        self, cells_list, area_averaged_cell_loss_list, epoch, filename="cell_residual", dpi=300
     ):
         """
         Plots the residuals in each cell of the mesh.
 
+        The cells are drawn as a single PolyCollection, which is cached along with the figure. The later
+        calls with the same cells only update the colors of the cells.
+
         :param cells_list: The list of cells.
         :type cells_list: list
         :param area_averaged_cell_loss_list: The list of area averaged cell residual (or the normal residual).
@@ -514,51 +543,51 @@ class Geometry_2D(Geometry):
         :type epoch: int
         :param filename: The name of the output file, defaults to "cell_residual".
         :type filename: str, optional
+        :param dpi: The resolution of the saved image, defaults to 300.
+        :type dpi: int, optional
         :return: None
         """
+        cells = np.asarray(cells_list, dtype=np.float64)
+        cell_loss = np.asarray(area_averaged_cell_loss_list, dtype=np.float64).reshape(-1)
 
-        plt.figure(figsize=(6.4, 4.8), dpi=300)
+        if (
+            self.cell_residual_figure is None
+            or self.cell_residual_cells.shape != cells.shape
+            or not np.array_equal(self.cell_residual_cells, cells)
+        ):
+            self.create_cell_residual_figure(cells)
 
         # normalise colors
-        norm = mcolors.Normalize(
-            vmin=np.min(area_averaged_cell_loss_list), vmax=np.max(area_averaged_cell_loss_list)
-        )
-
-        # Create a colormap
-        colormap = plt.cm.jet
-
-        for index, cell in enumerate(cells_list):
-            x = cell[:, 0]
-            y = cell[:, 1]
-
-            x = np.append(x, x[0])
-            y = np.append(y, y[0])
-
-            curr_cell_loss = float(area_averaged_cell_loss_list[index])
+        self.cell_residual_collection.set_array(cell_loss)
+        self.cell_residual_collection.set_clim(vmin=np.min(cell_loss), vmax=np.max(cell_loss))
 
-            color = colormap(norm(curr_cell_loss))
-
-            plt.fill(x, y, color=color, alpha=0.9)
+        # output filename
+        output_filename = Path(f"{self.output_folder}/{filename}_{epoch}.png")
+        self.cell_residual_figure.savefig(str(output_filename), dpi=dpi)
 
-            plt.plot(x, y, "k")
+    def create_cell_residual_figure(self, cells):
+        """
+        Creates the figure of the cell residuals, with all the cells drawn as a single PolyCollection.
 
-            # # compute x_min, x_max, y_min, y_max
-            # x_min = np.min(x)
-            # x_max = np.max(x)
-            # y_min = np.min(y)
-            # y_max = np.max(y)
+        :param cells: The coordinates of all the cells, of shape (n_cells, n_vertices, 2).
+        :type cells: numpy.ndarray
+        :return: None
+        """
+        if self.cell_residual_figure is not None:
+            plt.close(self.cell_residual_figure)
 
-            # # compute centroid of the cells
-            # centroid = np.array([np.mean(x), np.mean(y)])
+        figure, axis = plt.subplots(figsize=(6.4, 4.8), dpi=300)
 
-            # plot the loss text within the cell
-            # plt.text(centroid[0], centroid[1], f"{curr_cell_loss:.3e}", fontsize=16, horizontalalignment='center', verticalalignment='center')
+        collection = PolyCollection(
+            cells, cmap=plt.cm.jet, edgecolors="k", linewidths=0.5, alpha=0.9
+        )
+        collection.set_array(np.zeros(cells.shape[0]))
+        axis.add_collection(collection)
+        axis.autoscale_view()
 
-        sm = plt.cm.ScalarMappable(cmap=colormap, norm=norm)
-        sm.set_array([])
-        plt.colorbar(sm)
+        figure.colorbar(collection, ax=axis)
+        axis.set_title("Cell Residual")
 
-        # output filename
-        output_filename = Path(f"{self.output_folder}/{filename}_{epoch}.png")
-        plt.title(f"Cell Residual")
-        plt.savefig(str(output_filename), dpi=300)
+        self.cell_residual_cells = cells.copy()
+        self.cell_residual_figure = figure
+        self.cell_residual_collection = collection
@@ -0,0 +1,122 @@
+"""
+This file `affine_matrix.py` contains the compact representation of the test function matrices of meshes
+with a constant Jacobian within every cell, which can be used in place of the dense (n_cells, n_test, n_quad) tensors.
+
+The `tf.linalg.matvec` API is dispatched for this type, so the loss functions in `fastvpinns.physics`
+can be used without any change. The product is computed as a single matrix product of all the cells with
+the reference matrices, followed by a scaling with the per-cell coefficients.
+"""
+
+import tensorflow as tf
+
+
+class AffineTestMatrix(tf.experimental.ExtensionType):
+    """
+    Represents the test function matrices of all the cells as
+
+        M[c] = sum_k cell_coefficients[k, c] * reference_matrices[k]
+
+    :param reference_matrices: The reference matrices, of shape (n_terms, n_test, n_quad).
+    :type reference_matrices: tf.Tensor
+    :param cell_coefficients: The per-cell coefficients, of shape (n_terms, n_cells).
+    :type cell_coefficients: tf.Tensor
+    """
+
+    reference_matrices: tf.Tensor
+    cell_coefficients: tf.Tensor
+
+    @property
+    def shape(self):
+        """
+        The shape of the equivalent dense tensor, (n_cells, n_test, n_quad).
+        """
+        return tf.TensorShape(
+            [self.cell_coefficients.shape[1]] + self.reference_matrices.shape[1:].as_list()
+        )
+
+    @property
+    def dtype(self):
+        """
+        The dtype of the tensors.
+        """
+        return self.reference_matrices.dtype
+
+    def matvec(self, vector):
+        """
+        Computes the product of the test function matrix of every cell with the given vector of that cell.
+
+        :param vector: The values at the quadrature points of all the cells, of shape (n_cells, n_quad).
+        :type vector: tf.Tensor
+        :return: The product, of shape (n_cells, n_test).
+        :rtype: tf.Tensor
+        """
+        # product of all the cells with the reference matrices - n_terms x n_cells x n_test
+        projected = tf.einsum("kiq,cq->kci", self.reference_matrices, vector)
+
+        return tf.einsum("kc,kci->ci", self.cell_coefficients, projected)
+
+    def to_dense(self):
+        """
+        Returns the equivalent dense tensor of shape (n_cells, n_test, n_quad).
+
+        :return: The dense tensor.
+        :rtype: tf.Tensor
+        """
+        return tf.einsum("kc,kiq->ciq", self.cell_coefficients, self.reference_matrices)
+
+    def gather_cells(self, cell_ids):
+        """
+        Returns the test function matrices of the given cells.
+
+        :param cell_ids: The ids of the cells.
+        :type cell_ids: tf.Tensor
+        :return: The affine test function matrix of the given cells.
+        :rtype: AffineTestMatrix
+        """
+        return AffineTestMatrix(
+            reference_matrices=self.reference_matrices,
+            cell_coefficients=tf.gather(self.cell_coefficients, cell_ids, axis=1),
+        )
+
+
+def get_affine_test_matrix(factors, dtype):
+    """
+    Converts the numpy arrays of the affine representation into an `AffineTestMatrix`.
+
+    :param factors: The reference matrices and the per-cell coefficients.
+    :type factors: tuple
+    :param dtype: The tensorflow dtype to be used for all the tensors.
+    :type dtype: tf.DType
+    :return: The affine test function matrix.
+    :rtype: AffineTestMatrix
+    """
+    reference_matrices, cell_coefficients = factors
+
+    return AffineTestMatrix(
+        reference_matrices=tf.constant(reference_matrices, dtype=dtype),
+        cell_coefficients=tf.constant(cell_coefficients, dtype=dtype),
+    )
+
+
+@tf.experimental.dispatch_for_api(tf.linalg.matvec)
+def affine_matvec(
+    a: AffineTestMatrix,
+    b,
+    transpose_a=False,
+    adjoint_a=False,
+    a_is_sparse=False,
+    b_is_sparse=False,
+    name=None,
+):
+    """
+    Dispatches `tf.linalg.matvec` for the `AffineTestMatrix`, so that the loss functions can
+    use it in place of a dense tensor.
+
+    :raises ValueError: If transpose_a or adjoint_a is True.
+    """
+    if transpose_a or adjoint_a:
+        print(f"Transposed product is not supported for AffineTestMatrix in {__name__}.")
+        raise ValueError("transpose_a and adjoint_a should be False for AffineTestMatrix.")
+
+    with tf.name_scope(name or "affine_matvec"):
+        return a.matvec(b)
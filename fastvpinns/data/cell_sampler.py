@@ -0,0 +1,277 @@
+"""
+This file `cell_sampler.py` contains the samplers of the mini-batches of cells, which are used to train the
+model on a subset of the cells in every step (see `DenseModel.train_step_cells`).
+
+`CellBatchSampler` visits the cells in shuffled epochs: every epoch is a random permutation of all the cells,
+which is split into consecutive batches. The last batch of an epoch, which is smaller than the batch size, is
+dropped, so that every batch is a uniformly random subset of the cells.
+
+`ResidualImportanceSampler` draws the cells in proportion to a running estimate of their residuals, along
+with the importance weights which keep the loss unbiased.
+"""
+
+import numpy as np
+import tensorflow as tf
+
+
+class CellBatchSampler:
+    """
+    This class is used to sample the mini-batches of cells for the training steps.
+
+    :param n_cells: The number of cells of the mesh.
+    :type n_cells: int
+    :param batch_size: The number of cells of every batch. It can be an integer, or a function which
+        returns the batch size for the given training step (to schedule the batch size).
+        The batch size is limited to the number of cells.
+    :type batch_size: int or callable
+    :param shuffle: Whether to shuffle the cells in every epoch. Defaults to True.
+    :type shuffle: bool, optional
+    :param seed: The seed of the random number generator. Defaults to None.
+    :type seed: int, optional
+    :raises ValueError: If the number of cells or the batch size is not positive.
+    """
+
+    def __init__(self, n_cells: int, batch_size, shuffle: bool = True, seed: int = None):
+        if n_cells <= 0:
+            print(
+                f"Invalid number of cells {n_cells} in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError("Number of cells should be greater than 0.")
+
+        self.n_cells = int(n_cells)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+
+        # the training step, the epoch and the position within the order of the cells of the epoch
+        self.step = 0
+        self.epoch = 0
+        self.position = 0
+        self.order = self.get_epoch_order()
+
+        # validate the batch size of the first step
+        self.get_batch_size(0)
+
+    def get_epoch_order(self) -> np.ndarray:
+        """
+        Returns the order in which the cells are visited in an epoch.
+
+        :return: The ids of all the cells, of shape (n_cells,).
+        :rtype: numpy.ndarray
+        """
+        if self.shuffle:
+            return self.rng.permutation(self.n_cells).astype(np.int32)
+
+        return np.arange(self.n_cells, dtype=np.int32)
+
+    def get_batch_size(self, step: int) -> int:
+        """
+        Returns the batch size of the given training step.
+
+        :param step: The training step.
+        :type step: int
+        :return: The batch size.
+        :rtype: int
+        :raises ValueError: If the batch size is not positive.
+        """
+        batch_size = self.batch_size(step) if callable(self.batch_size) else self.batch_size
+
+        if int(batch_size) <= 0:
+            print(
+                f"Invalid batch size {batch_size} at step {step} in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError("Batch size should be greater than 0.")
+
+        return min(int(batch_size), self.n_cells)
+
+    def next_batch(self) -> tf.Tensor:
+        """
+        Returns the ids of the cells of the next batch. A new epoch is started, if the remaining cells
+        of the current epoch are fewer than the batch size.
+
+        :return: The ids of the cells, of shape (batch_size,).
+        :rtype: tf.Tensor
+        """
+        batch_size = self.get_batch_size(self.step)
+
+        if self.position + batch_size > self.n_cells:
+            self.epoch += 1
+            self.position = 0
+            self.order = self.get_epoch_order()
+
+        cell_ids = self.order[self.position : self.position + batch_size]
+        self.position += batch_size
+        self.step += 1
+
+        return tf.constant(cell_ids)
+
+
+class ResidualImportanceSampler:
+    """
+    This class is used to sample the mini-batches of cells in proportion to a running estimate of their
+    residuals, so that the training steps focus on the cells with large residuals (e.g. boundary layers).
+
+    The cells of a batch are drawn with replacement from the probabilities
+
+        p_c = (1 - uniform_fraction) * r_c / sum(r) + uniform_fraction / n_cells,
+
+    where r_c is the residual estimate of the cell c. Every drawn cell comes with the importance weight
+    1 / (batch_size * p_c), so the weighted sum of the residuals of the batch is an unbiased estimate of the
+    sum of the residuals of all the cells. The uniform fraction keeps the probabilities of all the cells
+    positive, which bounds the importance weights.
+
+    The residual estimate is stored in a `tf.Variable`. It is updated with an exponential moving average
+    from the residuals of the cells of every batch, and refreshed with the residuals of all the cells
+    every `refresh_interval` steps.
+
+    :param n_cells: The number of cells of the mesh.
+    :type n_cells: int
+    :param batch_size: The number of cells of every batch.
+    :type batch_size: int
+    :param refresh_interval: The number of steps between the refreshes of the residuals of all the cells.
+        Defaults to 100.
+    :type refresh_interval: int, optional
+    :param uniform_fraction: The fraction of the uniform distribution in the sampling probabilities,
+        between 0 (excluded) and 1. Defaults to 0.1.
+    :type uniform_fraction: float, optional
+    :param momentum: The momentum of the moving average of the residuals of the sampled cells, between 0
+        and 1. Defaults to 0.5.
+    :type momentum: float, optional
+    :param dtype: The tensorflow dtype of the residuals and the weights. Defaults to tf.float32.
+    :type dtype: tf.DType, optional
+    :param seed: The seed of the random number generator. Defaults to None.
+    :type seed: int, optional
+    :raises ValueError: If any of the parameters is not valid.
+    """
+
+    def __init__(
+        self,
+        n_cells: int,
+        batch_size: int,
+        refresh_interval: int = 100,
+        uniform_fraction: float = 0.1,
+        momentum: float = 0.5,
+        dtype: tf.DType = tf.float32,
+        seed: int = None,
+    ):
+        if n_cells <= 0 or batch_size <= 0 or refresh_interval <= 0:
+            print(
+                f"Invalid number of cells {n_cells}, batch size {batch_size} or refresh interval "
+                f"{refresh_interval} in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError(
+                "Number of cells, batch size and refresh interval should be greater than 0."
+            )
+
+        if not 0 < uniform_fraction <= 1 or not 0 <= momentum < 1:
+            print(
+                f"Invalid uniform fraction {uniform_fraction} or momentum {momentum} in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError("Uniform fraction should be in (0, 1] and momentum in [0, 1).")
+
+        self.n_cells = int(n_cells)
+        self.batch_size = int(batch_size)
+        self.refresh_interval = int(refresh_interval)
+        self.uniform_fraction = uniform_fraction
+        self.momentum = momentum
+        self.dtype = dtype
+
+        self.generator = (
+            tf.random.Generator.from_seed(seed)
+            if seed is not None
+            else tf.random.Generator.from_non_deterministic_state()
+        )
+
+        # running estimate of the residuals of all the cells, uniform until the first refresh
+        self.residual_estimate = tf.Variable(tf.ones([self.n_cells], dtype=self.dtype))
+        self.step = 0
+
+    def should_refresh(self) -> bool:
+        """
+        Returns whether the residuals of all the cells have to be refreshed before the current step.
+
+        :return: True, at every `refresh_interval`-th step (including the first step).
+        :rtype: bool
+        """
+        return self.step % self.refresh_interval == 0
+
+    def refresh(self, cells_residual) -> None:
+        """
+        Replaces the residual estimate with the residuals of all the cells.
+
+        :param cells_residual: The residuals of all the cells, of shape (n_cells,).
+        :type cells_residual: tf.Tensor
+        :return: None
+        """
+        self.residual_estimate.assign(tf.cast(tf.reshape(cells_residual, [-1]), self.dtype))
+
+    @tf.function
+    def update(self, cell_ids, cells_residual) -> None:
+        """
+        Updates the residual estimate of the given cells with a moving average of their residuals.
+
+        :param cell_ids: The ids of the cells, of shape (n_batch,).
+        :type cell_ids: tf.Tensor
+        :param cells_residual: The residuals of the cells, of shape (n_batch,).
+        :type cells_residual: tf.Tensor
+        :return: None
+        """
+        cell_ids = tf.reshape(cell_ids, [-1, 1])
+        old_values = tf.gather_nd(self.residual_estimate, cell_ids)
+        new_values = self.momentum * old_values + (1.0 - self.momentum) * tf.cast(
+            tf.reshape(cells_residual, [-1]), self.dtype
+        )
+        self.residual_estimate.scatter_nd_update(cell_ids, new_values)
+
+    def get_probabilities(self) -> tf.Tensor:
+        """
+        Returns the sampling probabilities of all the cells.
+
+        :return: The probabilities, of shape (n_cells,).
+        :rtype: tf.Tensor
+        """
+        residual = tf.maximum(self.residual_estimate, 0.0)
+        total = tf.reduce_sum(residual)
+
+        # uniform probabilities, if all the residuals vanish
+        residual_probabilities = tf.where(
+            total > 0, tf.math.divide_no_nan(residual, total), tf.ones_like(residual) / self.n_cells
+        )
+
+        return (
+            1.0 - self.uniform_fraction
+        ) * residual_probabilities + self.uniform_fraction / self.n_cells
+
+    def next_batch(self):
+        """
+        Draws the cells of the next batch in proportion to their residual estimate.
+
+        :return: The ids of the cells, of shape (batch_size,), and their importance weights,
+            of shape (batch_size,).
+        :rtype: tuple(tf.Tensor, tf.Tensor)
+        """
+        self.step += 1
+
+        return self.draw_cells()
+
+    @tf.function
+    def draw_cells(self):
+        """
+        Draws the cells of a batch in proportion to their residual estimate, on the device.
+
+        :return: The ids of the cells, of shape (batch_size,), and their importance weights,
+            of shape (batch_size,).
+        :rtype: tuple(tf.Tensor, tf.Tensor)
+        """
+        probabilities = self.get_probabilities()
+
+        # inverse transform sampling with the cumulative distribution of the cells
+        cumulative = tf.cumsum(probabilities)
+        samples = self.generator.uniform([self.batch_size], dtype=self.dtype) * cumulative[-1]
+        cell_ids = tf.minimum(
+            tf.searchsorted(cumulative, samples, side="right", out_type=tf.int32), self.n_cells - 1
+        )
+
+        cell_weights = 1.0 / (self.batch_size * tf.gather(probabilities, cell_ids))
+
+        return cell_ids, cell_weights
@@ -14,6 +14,8 @@ from ..Geometry.geometry_2d import *
 import tensorflow as tf
 
 from .datahandler import DataHandler
+from .tensor_product_matrix import get_tensor_product_test_matrix
+from .affine_matrix import get_affine_test_matrix
 
 
 class DataHandler2D(DataHandler):
@@ -40,9 +42,16 @@ class DataHandler2D(DataHandler):
     :type forcing_function_list: list
     :param dtype: The tensorflow dtype to be used for all the tensors.
     :type dtype: tf.DType
+    :param test_matrix_format: The format of the test function matrices. "dense" stores the
+        (n_cells, n_test, n_quad) tensors, "tensor_product" stores only the 1D factor matrices and the
+        per-cell geometric weights (see `TensorProductTestMatrix`), "affine" stores the reference matrices
+        and the per-cell coefficients for meshes with a constant Jacobian within every cell
+        (see `AffineTestMatrix`), and "auto" uses "affine" if the mesh allows it and "dense" otherwise.
+        Defaults to "dense".
+    :type test_matrix_format: str, optional
     """
 
-    def __init__(self, fespace, domain, dtype):
+    def __init__(self, fespace, domain, dtype, test_matrix_format: str = "dense"):
         """
         Constructor for the DataHandler2D class
 
@@ -62,6 +71,12 @@ class DataHandler2D(DataHandler):
         :type forcing_function_list: list
         :param dtype: The tensorflow dtype to be used for all the tensors.
         :type dtype: tf.DType
+        :param test_matrix_format: The format of the test function matrices, "dense", "tensor_product",
+            "affine" or "auto". The compact formats are built from the reference element and the Jacobians,
+            with the "vectorized" assembly mode of the FESpace2D the dense basis function values of all the
+            cells are then never assembled (the "cell" and "parallel" assembly modes and the FE tensor cache
+            assemble them during the setup of the FESpace2D).
+        :type test_matrix_format: str, optional
         """
         # call the parent class constructor
         super().__init__(fespace=fespace, domain=domain, dtype=dtype)
@@ -76,41 +91,192 @@ class DataHandler2D(DataHandler):
         if not isinstance(self.dtype, tf.DType):
             raise TypeError("The given dtype is not a valid tensorflow dtype")
 
-        for cell_index in range(self.fespace.n_cells):
-            shape_val_mat = tf.constant(
-                self.fespace.get_shape_function_val(cell_index), dtype=self.dtype
+        if test_matrix_format not in ["dense", "tensor_product", "affine", "auto"]:
+            print(
+                f"Invalid test matrix format {test_matrix_format} in {self.__class__.__name__} from {__name__}."
             )
-            grad_x_mat = tf.constant(
-                self.fespace.get_shape_function_grad_x(cell_index), dtype=self.dtype
+            raise ValueError(
+                'Test matrix format should be one of : "dense", "tensor_product", "affine", "auto"'
             )
-            grad_y_mat = tf.constant(
-                self.fespace.get_shape_function_grad_y(cell_index), dtype=self.dtype
-            )
-            x_pde = tf.constant(
-                self.fespace.get_quadrature_actual_coordinates(cell_index), dtype=self.dtype
-            )
-            forcing_function = tf.constant(
-                self.fespace.get_forcing_function_values(cell_index), dtype=self.dtype
-            )
-            self.shape_val_mat_list.append(shape_val_mat)
-            self.grad_x_mat_list.append(grad_x_mat)
-            self.grad_y_mat_list.append(grad_y_mat)
-            self.x_pde_list.append(x_pde)
-            self.forcing_function_list.append(forcing_function)
-
-        # now convert all the shapes into 3D tensors for easy multiplication
-        # input tensor - x_pde_list
-        self.x_pde_list = tf.reshape(self.x_pde_list, [-1, 2])
-
-        self.forcing_function_list = tf.concat(self.forcing_function_list, axis=1)
 
-        self.shape_val_mat_list = tf.stack(self.shape_val_mat_list, axis=0)
-        self.grad_x_mat_list = tf.stack(self.grad_x_mat_list, axis=0)
-        self.grad_y_mat_list = tf.stack(self.grad_y_mat_list, axis=0)
+        # the affine representation is used, only if the Jacobian is constant within every cell
+        affine_test_functions = None
+        if test_matrix_format in ["affine", "auto"]:
+            affine_test_functions = self.fespace.get_affine_test_functions()
+            if test_matrix_format == "auto":
+                test_matrix_format = "affine" if affine_test_functions.is_affine else "dense"
+            else:
+                affine_test_functions.check_affine_structure()
+        self.test_matrix_format = test_matrix_format
+
+        # the dense matrices are assembled only for the dense format
+        assemble_dense = self.test_matrix_format == "dense"
+
+        # the FE values of all the cells are converted from the stacked arrays, with a single
+        # conversion per quantity
+        dense_values = {}
+        if assemble_dense:
+            dense_values = {
+                name: self.fespace.get_stacked_fe_values(name)
+                for name in ["basis_at_quad", "basis_gradx_at_quad", "basis_grady_at_quad"]
+            }
+        self.init_from_stacked_arrays(
+            self.fespace.get_stacked_fe_values("quad_actual_coordinates"), **dense_values
+        )
+
+        if self.test_matrix_format == "tensor_product":
+            self.init_tensor_product_test_matrices()
+        elif self.test_matrix_format == "affine":
+            self.init_affine_test_matrices(affine_test_functions)
+
+        # forcing function of all the cells at once - (n_cells, n_test, 1) -> (n_test, n_cells)
+        forcing_function = self.fespace.get_forcing_function_values_all_cells()
+        self.forcing_function_list = self.convert_to_tensor(forcing_function[:, :, 0].T)
 
         # test points
         self.test_points = None
 
+    def convert_to_tensor(self, array):
+        """
+        Converts a numpy array into a tensor of the dtype of the data handler, with a single transfer.
+
+        The array is cast on the host only if its dtype differs from the dtype of the data handler, so the
+        arrays of the matching dtype (including the memory-mapped arrays of the FE tensor cache) are read
+        directly into the tensor, without an intermediate copy.
+
+        :param array: The array to be converted.
+        :type array: numpy.ndarray
+        :return: The tensor.
+        :rtype: tf.Tensor
+        """
+        array = np.ascontiguousarray(array, dtype=self.dtype.as_numpy_dtype)
+
+        return tf.convert_to_tensor(array)
+
+    def init_from_stacked_arrays(
+        self,
+        quad_actual_coordinates,
+        basis_at_quad=None,
+        basis_gradx_at_quad=None,
+        basis_grady_at_quad=None,
+    ):
+        """
+        Converts the stacked FE values of all the cells into tensors, without looping over the cells.
+
+        :param quad_actual_coordinates: The actual coordinates of the quadrature points, of shape (n_cells, n_quad, 2).
+        :type quad_actual_coordinates: numpy.ndarray
+        :param basis_at_quad: The values of the basis functions, of shape (n_cells, n_test, n_quad).
+            The dense test function matrices are not assigned, if it is not given.
+        :type basis_at_quad: numpy.ndarray, optional
+        :param basis_gradx_at_quad: The x-derivatives of the basis functions, of shape (n_cells, n_test, n_quad).
+        :type basis_gradx_at_quad: numpy.ndarray, optional
+        :param basis_grady_at_quad: The y-derivatives of the basis functions, of shape (n_cells, n_test, n_quad).
+        :type basis_grady_at_quad: numpy.ndarray, optional
+        """
+        if basis_at_quad is not None:
+            self.shape_val_mat_list = self.convert_to_tensor(basis_at_quad)
+            self.grad_x_mat_list = self.convert_to_tensor(basis_gradx_at_quad)
+            self.grad_y_mat_list = self.convert_to_tensor(basis_grady_at_quad)
+
+        self.x_pde_list = self.convert_to_tensor(np.reshape(quad_actual_coordinates, (-1, 2)))
+
+    def init_affine_test_matrices(self, affine_test_functions):
+        """
+        Assigns the test function matrices in the affine format. Only the reference matrices and the
+        per-cell coefficients are stored, and the products with the test function matrices of all the
+        cells are computed as a single matrix product with the reference matrices.
+
+        :param affine_test_functions: The FE2DAffine object of the FESpace2D.
+        :type affine_test_functions: FE2DAffine
+        :raises ValueError: If the Jacobian is not constant within every cell.
+        """
+        self.shape_val_mat_list = get_affine_test_matrix(
+            affine_test_functions.get_shape_function_val_factors(), self.dtype
+        )
+        self.grad_x_mat_list = get_affine_test_matrix(
+            affine_test_functions.get_shape_function_grad_x_factors(), self.dtype
+        )
+        self.grad_y_mat_list = get_affine_test_matrix(
+            affine_test_functions.get_shape_function_grad_y_factors(), self.dtype
+        )
+
+    def init_tensor_product_test_matrices(self):
+        """
+        Assigns the test function matrices in the sum-factorized (tensor-product) format.
+        Only the 1D factor matrices and the per-cell geometric weights are stored, and the products
+        with the test function matrices are computed as two small contractions.
+        """
+        tensor_product = self.fespace.get_tensor_product_test_functions()
+
+        self.shape_val_mat_list = get_tensor_product_test_matrix(
+            tensor_product.get_shape_function_val_factors(), self.dtype
+        )
+        self.grad_x_mat_list = get_tensor_product_test_matrix(
+            tensor_product.get_shape_function_grad_x_factors(), self.dtype
+        )
+        self.grad_y_mat_list = get_tensor_product_test_matrix(
+            tensor_product.get_shape_function_grad_y_factors(), self.dtype
+        )
+
+    def gather_test_matrix(self, matrix, cell_ids):
+        """
+        Returns the test function matrices of the given cells, for all the test matrix formats.
+
+        :param matrix: The test function matrices of all the cells.
+        :type matrix: tf.Tensor or TensorProductTestMatrix or AffineTestMatrix
+        :param cell_ids: The ids of the cells.
+        :type cell_ids: tf.Tensor
+        :return: The test function matrices of the given cells, in the same format.
+        :rtype: tf.Tensor or TensorProductTestMatrix or AffineTestMatrix
+        """
+        if self.test_matrix_format == "dense":
+            return tf.gather(matrix, cell_ids, axis=0)
+
+        return matrix.gather_cells(cell_ids)
+
+    def get_cell_data(self, cell_ids):
+        """
+        Returns the tensors of the given cells, with the same layout as the tensors of all the cells.
+
+        :param cell_ids: The ids of the cells.
+        :type cell_ids: array_like
+        :return: A dictionary with the keys "cell_ids", "x_pde_list", "shape_val_mat_list", "grad_x_mat_list",
+            "grad_y_mat_list" and "forcing_function_list".
+        :rtype: dict
+        """
+        cell_ids = tf.constant(np.asarray(cell_ids, dtype=np.int64))
+
+        # quadrature points are stored cell by cell - (n_cells * n_quad, 2)
+        x_pde = tf.reshape(self.x_pde_list, [self.fespace.n_cells, -1, 2])
+        x_pde = tf.reshape(tf.gather(x_pde, cell_ids, axis=0), [-1, 2])
+
+        return {
+            "cell_ids": cell_ids,
+            "x_pde_list": x_pde,
+            "shape_val_mat_list": self.gather_test_matrix(self.shape_val_mat_list, cell_ids),
+            "grad_x_mat_list": self.gather_test_matrix(self.grad_x_mat_list, cell_ids),
+            "grad_y_mat_list": self.gather_test_matrix(self.grad_y_mat_list, cell_ids),
+            "forcing_function_list": tf.gather(self.forcing_function_list, cell_ids, axis=1),
+        }
+
+    def get_subdomain_data(self, partition):
+        """
+        Splits the tensors of all the cells into the tensors of the subdomains of the given partition.
+
+        :param partition: The partition of the cells into subdomains.
+        :type partition: MeshPartition2D
+        :return: The tensors of every subdomain (see `get_cell_data`), along with the interface of the
+            subdomain with the other subdomains under the key "interface" (see `MeshPartition2D.get_interface`).
+        :rtype: list(dict)
+        """
+        subdomain_data = []
+        for part in range(partition.n_parts):
+            data = self.get_cell_data(partition.part_cells[part])
+            data["interface"] = partition.get_interface(part)
+            subdomain_data.append(data)
+
+        return subdomain_data
+
     def get_dirichlet_input(self):
         """
         This function will return the input for the Dirichlet boundary data
@@ -119,6 +285,7 @@ class DataHandler2D(DataHandler):
             - input_dirichlet (tf.Tensor): The input for the Dirichlet boundary data
             - actual_dirichlet (tf.Tensor): The actual Dirichlet boundary data
         """
+        # contiguous arrays of shape (N, 2) and (N, 1)
         input_dirichlet, actual_dirichlet = self.fespace.generate_dirichlet_boundary_data()
 
         # convert to tensors
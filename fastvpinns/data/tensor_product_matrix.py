@@ -0,0 +1,135 @@
+"""
+This file `tensor_product_matrix.py` contains the sum-factorized (tensor-product) representation of the
+test function matrices, which can be used in place of the dense (n_cells, n_test, n_quad) tensors.
+
+The `tf.linalg.matvec` API is dispatched for this type, so the loss functions in `fastvpinns.physics`
+can be used without any change. The product is computed as two small contractions with the 1D factor
+matrices, instead of a dense matrix-vector product.
+"""
+
+import tensorflow as tf
+
+
+class TensorProductTestMatrix(tf.experimental.ExtensionType):
+    """
+    Represents the test function matrices of all the cells as a sum of terms of the form
+
+        M[c, (i, j), (a, b)] = factors_x[k, i, b] * factors_y[k, j, a] * cell_weights[k, c, a, b]
+
+    :param factors_x: The 1D factors in xi, of shape (n_terms, n_test_1d, n_quad_1d).
+    :type factors_x: tf.Tensor
+    :param factors_y: The 1D factors in eta, of shape (n_terms, n_test_1d, n_quad_1d).
+    :type factors_y: tf.Tensor
+    :param cell_weights: The per-cell weights, of shape (n_terms, n_cells, n_quad_1d, n_quad_1d).
+    :type cell_weights: tf.Tensor
+    """
+
+    factors_x: tf.Tensor
+    factors_y: tf.Tensor
+    cell_weights: tf.Tensor
+
+    @property
+    def shape(self):
+        """
+        The shape of the equivalent dense tensor, (n_cells, n_test, n_quad).
+        """
+        n_test_1d = self.factors_x.shape[1]
+        n_quad_1d = self.factors_x.shape[2]
+        return tf.TensorShape([self.cell_weights.shape[1], n_test_1d**2, n_quad_1d**2])
+
+    @property
+    def dtype(self):
+        """
+        The dtype of the tensors.
+        """
+        return self.cell_weights.dtype
+
+    def matvec(self, vector):
+        """
+        Computes the product of the test function matrix of every cell with the given vector of that cell.
+
+        :param vector: The values at the quadrature points of all the cells, of shape (n_cells, n_quad).
+        :type vector: tf.Tensor
+        :return: The product, of shape (n_cells, n_test).
+        :rtype: tf.Tensor
+        """
+        n_quad_1d = tf.shape(self.cell_weights)[-1]
+        n_test_1d = tf.shape(self.factors_x)[1]
+
+        vector = tf.reshape(vector, [-1, n_quad_1d, n_quad_1d])
+        weighted_vector = self.cell_weights * vector[tf.newaxis]
+
+        # contraction along xi, followed by the contraction along eta
+        partial = tf.einsum("kib,kcab->kcai", self.factors_x, weighted_vector)
+        result = tf.einsum("kja,kcai->cij", self.factors_y, partial)
+
+        return tf.reshape(result, [-1, n_test_1d * n_test_1d])
+
+    def to_dense(self):
+        """
+        Returns the equivalent dense tensor of shape (n_cells, n_test, n_quad).
+
+        :return: The dense tensor.
+        :rtype: tf.Tensor
+        """
+        dense = tf.einsum("kib,kja,kcab->cijab", self.factors_x, self.factors_y, self.cell_weights)
+        return tf.reshape(dense, self.shape)
+
+    def gather_cells(self, cell_ids):
+        """
+        Returns the test function matrices of the given cells.
+
+        :param cell_ids: The ids of the cells.
+        :type cell_ids: tf.Tensor
+        :return: The tensor-product test function matrix of the given cells.
+        :rtype: TensorProductTestMatrix
+        """
+        return TensorProductTestMatrix(
+            factors_x=self.factors_x,
+            factors_y=self.factors_y,
+            cell_weights=tf.gather(self.cell_weights, cell_ids, axis=1),
+        )
+
+
+def get_tensor_product_test_matrix(factors, dtype):
+    """
+    Converts the numpy arrays of the tensor-product representation into a `TensorProductTestMatrix`.
+
+    :param factors: The factors in xi, the factors in eta and the per-cell weights.
+    :type factors: tuple
+    :param dtype: The tensorflow dtype to be used for all the tensors.
+    :type dtype: tf.DType
+    :return: The tensor-product test function matrix.
+    :rtype: TensorProductTestMatrix
+    """
+    factors_x, factors_y, cell_weights = factors
+
+    return TensorProductTestMatrix(
+        factors_x=tf.constant(factors_x, dtype=dtype),
+        factors_y=tf.constant(factors_y, dtype=dtype),
+        cell_weights=tf.constant(cell_weights, dtype=dtype),
+    )
+
+
+@tf.experimental.dispatch_for_api(tf.linalg.matvec)
+def tensor_product_matvec(
+    a: TensorProductTestMatrix,
+    b,
+    transpose_a=False,
+    adjoint_a=False,
+    a_is_sparse=False,
+    b_is_sparse=False,
+    name=None,
+):
+    """
+    Dispatches `tf.linalg.matvec` for the `TensorProductTestMatrix`, so that the loss functions can
+    use it in place of a dense tensor.
+
+    :raises ValueError: If transpose_a or adjoint_a is True.
+    """
+    if transpose_a or adjoint_a:
+        print(f"Transposed product is not supported for TensorProductTestMatrix in {__name__}.")
+        raise ValueError("transpose_a and adjoint_a should be False for TensorProductTestMatrix.")
+
+    with tf.name_scope(name or "tensor_product_matvec"):
+        return a.matvec(b)
@@ -0,0 +1,110 @@
+"""
+The file `fused_training.py` hosts the training loop, which runs several training steps of a model within a
+single `tf.function`, so that the Python dispatch and the host synchronisation happen once per chunk of steps
+instead of once per step.
+
+The steps are run with `tf.while_loop`, and the losses of every step are written into `tf.TensorArray`
+buffers of the size of the chunk on the device, which are returned at the end of the chunk.
+
+`FusedTrainingMixin` adds the fused training loop `train_n_steps` to the models, and `compile_train_step`
+compiles the training step of a model with XLA, if requested.
+"""
+
+import tensorflow as tf
+
+from fastvpinns.model.input_derivatives import get_python_function
+
+
+def compile_train_step(model, jit_compile=False) -> None:
+    """
+    Compiles the given model with its optimizer. If jit_compile is set, the training step of the model
+    is compiled with XLA, and the loss function is traced into the compiled step, since a nested
+    `tf.function` is compiled again by XLA at every step.
+
+    :param model: The model, with the attributes `optimizer`, `loss_function` and a `tf.function`
+        training step `train_step`.
+    :type model: tf.keras.Model
+    :param jit_compile: Flag to compile the training step with XLA, defaults to False.
+    :type jit_compile: bool, optional
+    :return: None
+    """
+    model.compile(optimizer=model.optimizer, jit_compile=jit_compile)
+    if model.jit_compile:
+        model.loss_function = get_python_function(model.loss_function)
+        model.train_step = tf.function(model.train_step.python_function, jit_compile=True)
+
+
+def run_train_steps(train_step, n_steps):
+    """
+    Runs the given training step n_steps times with `tf.while_loop`, and records its outputs at every step.
+    It has to be called within a `tf.function`.
+
+    The training step is traced once into a concrete function, whose output signature gives the structure,
+    the dtypes and the shapes of the buffers, and which is called in every iteration of the loop.
+
+    :param train_step: The training step, a function without arguments which returns a (nested) dictionary
+        of tensors, e.g. the losses.
+    :type train_step: callable
+    :param n_steps: The number of training steps, at least 1. A tensor avoids the retracing of the calling
+        `tf.function` for every new number of steps.
+    :type n_steps: int or tf.Tensor
+    :return: The outputs of every step, with the same structure as the output of the training step.
+        The outputs with a single element are recorded as scalars, so that they are of shape (n_steps,).
+    :rtype: dict
+    """
+
+    def to_record(value):
+        value = tf.convert_to_tensor(value)
+        return tf.reshape(value, []) if value.shape.num_elements() == 1 else value
+
+    step_function = tf.function(
+        lambda: tf.nest.map_structure(to_record, train_step())
+    ).get_concrete_function()
+    output_spec = tf.nest.map_structure(
+        lambda value: tf.TensorSpec(value.shape, value.dtype), step_function.structured_outputs
+    )
+    buffers = tf.nest.map_structure(
+        lambda spec: tf.TensorArray(spec.dtype, size=n_steps, element_shape=spec.shape), output_spec
+    )
+
+    def body(step, buffers):
+        output = step_function()
+        buffers = tf.nest.map_structure(
+            lambda buffer, value: buffer.write(step, value), buffers, output
+        )
+        return step + 1, buffers
+
+    _, buffers = tf.while_loop(
+        lambda step, buffers: step < n_steps, body, (tf.constant(0), buffers), parallel_iterations=1
+    )
+
+    return tf.nest.map_structure(lambda buffer: buffer.stack(), buffers)
+
+
+class FusedTrainingMixin:
+    """
+    This class adds the fused training loop to a model, whose training step `train_step` takes the
+    arguments beta and bilinear_params_dict.
+    """
+
+    @tf.function
+    def train_n_steps(self, n_steps, beta=10, bilinear_params_dict=None):  # pragma: no cover
+        """
+        Runs n_steps training steps within a single `tf.function`, with `tf.while_loop`. The losses of
+        every step are recorded on the device, and returned at the end of the steps, so that the host
+        is synchronised once for all the steps.
+
+        :param n_steps: The number of training steps, at least 1. Pass a tensor, so that the function is
+            not traced again for every new number of steps.
+        :type n_steps: int or tf.Tensor
+        :param beta: The beta parameter for the training step, defaults to 10.
+        :type beta: int, optional
+        :param bilinear_params_dict: The dictionary containing the bilinear parameters, defaults to None.
+        :type bilinear_params_dict: dict, optional
+        :return: The output of every training step, with the same keys as the output of `train_step`,
+            and the values of shape (n_steps,).
+        :rtype: dict
+        """
+        return run_train_steps(
+            lambda: self.train_step(beta=beta, bilinear_params_dict=bilinear_params_dict), n_steps
+        )
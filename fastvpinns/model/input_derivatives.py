@@ -0,0 +1,305 @@
+"""
+The file `input_derivatives.py` hosts the computation of the derivatives of the outputs of the models with
+respect to their inputs (x, y), which are needed by the variational loss at the quadrature points.
+
+For a stack of dense layers with a known activation, the derivatives are back-propagated analytically from
+the values of the forward pass: the derivative with respect to the input of a dense layer is the incoming
+derivative, scaled by the derivative of the activation, multiplied with the transposed kernel. This replaces
+the nested gradient tape within the training step, so that only a single (non persistent) tape is needed for
+the gradients with respect to the weights. Any other function (e.g. the attention layer or the hard
+constraint functions) is differentiated in forward mode with `tf.autodiff.ForwardAccumulator`, one input
+direction at a time.
+
+The outputs at the points without derivatives (the Dirichlet and the sensor points) are evaluated in the same
+forward pass as the quadrature points, over the concatenated points, so that the network is applied once per
+training step.
+"""
+
+import tensorflow as tf
+
+# derivatives of the activations as functions of the pre-activation and the activation values,
+# None for the linear activation
+ACTIVATION_DERIVATIVES = {
+    "linear": None,
+    "tanh": lambda z, a: 1.0 - tf.square(a),
+    "sigmoid": lambda z, a: a * (1.0 - a),
+    "softplus": lambda z, a: tf.sigmoid(z),
+    "swish": lambda z, a: tf.sigmoid(z) * (1.0 + z * (1.0 - tf.sigmoid(z))),
+    "relu": lambda z, a: tf.cast(z > 0, z.dtype),
+    "elu": lambda z, a: tf.where(z > 0, tf.ones_like(z), a + 1.0),
+}
+
+
+def get_activation_name(layer):
+    """
+    Returns the name of the activation of the given dense layer.
+
+    :param layer: The dense layer.
+    :type layer: tf.keras.layers.Dense
+    :return: The name of the activation, or None, if it is not a built-in activation.
+    :rtype: str
+    """
+    name = tf.keras.activations.serialize(layer.activation)
+
+    return name if isinstance(name, str) else None
+
+
+def supports_dense_input_gradients(layer_list) -> bool:
+    """
+    Returns whether the derivatives of the given layers can be propagated analytically, i.e. whether all
+    the layers are dense layers with an activation of `ACTIVATION_DERIVATIVES`.
+
+    :param layer_list: The layers of the network, applied in order.
+    :type layer_list: list
+    :return: True, if the derivatives can be propagated analytically.
+    :rtype: bool
+    """
+    return len(layer_list) > 0 and all(
+        isinstance(layer, tf.keras.layers.Dense)
+        and get_activation_name(layer) in ACTIVATION_DERIVATIVES
+        for layer in layer_list
+    )
+
+
+def dense_values_and_input_gradients(layer_list, inputs, n_gradient_points=None):
+    """
+    Computes the outputs of a stack of dense layers and their derivatives with respect to the inputs. The
+    values are computed in a forward pass, and the derivatives of every output are back-propagated
+    analytically through the kernels and the derivatives of the activations.
+
+    :param layer_list: The dense layers of the network, applied in order.
+    :type layer_list: list
+    :param inputs: The input points, of shape (n_points, n_dims).
+    :type inputs: tf.Tensor
+    :param n_gradient_points: The number of leading points, for which the derivatives are returned,
+        defaults to None (all the points). The derivatives are back-propagated for all the points and
+        sliced at the end, since slicing the values of every layer costs more than the additional rows.
+    :type n_gradient_points: int or tf.Tensor, optional
+    :return: The outputs, of shape (n_points, n_outputs), and the list of their derivatives with respect to
+        every input dimension, each of shape (n_gradient_points, n_outputs).
+    :rtype: tuple(tf.Tensor, list)
+    """
+    values = inputs
+    # pre-activation and activation values of every layer, for the derivatives of the activations
+    layer_values = []
+
+    for layer in layer_list:
+        pre_activation = tf.matmul(values, layer.kernel)
+        if layer.use_bias:
+            pre_activation = tf.nn.bias_add(pre_activation, layer.bias)
+
+        values = layer.activation(pre_activation)
+        layer_values.append((pre_activation, values))
+
+    derivatives = [ACTIVATION_DERIVATIVES[get_activation_name(layer)] for layer in layer_list]
+    n_outputs = values.shape[-1]
+
+    # derivatives of every output with respect to the inputs - (n_points, n_dims) each
+    output_gradients = []
+    for output in range(n_outputs):
+        delta = tf.broadcast_to(
+            tf.one_hot(output, n_outputs, dtype=values.dtype), tf.shape(layer_values[-1][1])
+        )
+        for layer, derivative, (pre_activation, activation) in zip(
+            reversed(layer_list), reversed(derivatives), reversed(layer_values)
+        ):
+            if derivative is not None:
+                delta = delta * derivative(pre_activation, activation)
+            delta = tf.matmul(delta, layer.kernel, transpose_b=True)
+
+        output_gradients.append(delta if n_gradient_points is None else delta[:n_gradient_points])
+
+    return values, [
+        tf.stack([gradient[:, dim] for gradient in output_gradients], axis=1)
+        for dim in range(inputs.shape[-1])
+    ]
+
+
+def fused_values_and_input_gradients(layer_list, fused_inputs, point_counts):
+    """
+    Computes the outputs of a stack of dense layers at several sets of points (e.g. the quadrature, the
+    Dirichlet and the sensor points) in a single forward pass over the concatenated points, and the
+    derivatives with respect to the inputs for the first set of points only.
+
+    :param layer_list: The dense layers of the network, applied in order.
+    :type layer_list: list
+    :param fused_inputs: The concatenated points of all the sets, of shape (n_points, n_dims).
+    :type fused_inputs: tf.Tensor
+    :param point_counts: The number of points of every set, in the order of the concatenation.
+    :type point_counts: list
+    :return: The list of the outputs of every set of points, and the list of the derivatives of the
+        outputs of the first set with respect to every input dimension.
+    :rtype: tuple(list, list)
+    """
+    values, gradients = dense_values_and_input_gradients(
+        layer_list, fused_inputs, n_gradient_points=point_counts[0]
+    )
+
+    return tf.split(values, point_counts, axis=0), gradients
+
+
+def get_model_input_gradients(model, inputs, hard_constraint_function=None):
+    """
+    Computes the outputs of the given model and their derivatives with respect to the inputs (x, y),
+    without a nested gradient tape. The derivatives are propagated analytically through the dense layers
+    of the model, if `model.dense_input_gradients` is set, and computed in forward mode otherwise (e.g.
+    for the attention layer).
+
+    :param model: The model, with the attributes `layer_list` and `dense_input_gradients`.
+    :type model: tf.keras.Model
+    :param inputs: The input points, of shape (n_points, 2).
+    :type inputs: tf.Tensor
+    :param hard_constraint_function: The function of the inputs and the outputs of the dense layers, which
+        is applied to obtain the outputs of the model, defaults to None.
+    :type hard_constraint_function: callable, optional
+    :return: The outputs, of shape (n_points, n_outputs), and the list of their derivatives with
+        respect to x and y, each of shape (n_points, n_outputs).
+    :rtype: tuple(tf.Tensor, list)
+    """
+    if not model.dense_input_gradients:
+        return forward_mode_input_gradients(model, inputs)
+
+    values, gradients = dense_values_and_input_gradients(model.layer_list, inputs)
+
+    if hard_constraint_function is None:
+        return values, gradients
+
+    return chain_input_gradients(hard_constraint_function, inputs, values, gradients)
+
+
+def get_fused_model_input_gradients(model, inputs, value_inputs_list, fused_inputs=None):
+    """
+    Computes the outputs of the given model and their derivatives with respect to the inputs (x, y), along
+    with the outputs at further sets of points (e.g. the dirichlet and the sensor points), at which no
+    derivatives are needed. For dense networks, all the points are evaluated in a single forward pass over
+    the concatenated points, and the derivatives are computed only for the given inputs.
+
+    :param model: The model, with the attributes `layer_list` and `dense_input_gradients`.
+    :type model: tf.keras.Model
+    :param inputs: The input points, of shape (n_points, 2).
+    :type inputs: tf.Tensor
+    :param value_inputs_list: The further sets of points, at which only the outputs are needed.
+    :type value_inputs_list: list
+    :param fused_inputs: The inputs concatenated with the further sets of points, defaults to None
+        (concatenated here).
+    :type fused_inputs: tf.Tensor, optional
+    :return: The outputs at the inputs, the list of their derivatives with respect to x and y, and
+        the list of the outputs at every further set of points.
+    :rtype: tuple(tf.Tensor, list, list)
+    """
+    if not model.dense_input_gradients:
+        # the attention layer relates the points to each other, so the sets of points are
+        # evaluated separately
+        predicted_values, gradients = get_model_input_gradients(model, inputs)
+        return predicted_values, gradients, [model(points) for points in value_inputs_list]
+
+    if fused_inputs is None:
+        fused_inputs = tf.concat(
+            [inputs, *[tf.cast(points, inputs.dtype) for points in value_inputs_list]], axis=0
+        )
+
+    values_list, gradients = fused_values_and_input_gradients(
+        model.layer_list,
+        fused_inputs,
+        [
+            points.shape[0] if points.shape[0] is not None else tf.shape(points)[0]
+            for points in [inputs, *value_inputs_list]
+        ],
+    )
+
+    return values_list[0], gradients, values_list[1:]
+
+
+def get_python_function(function):
+    """
+    Returns the python function of the given function, if it is a `tf.function`.
+
+    Forward mode through a nested `tf.function` gives wrong gradients with respect to the variables of an
+    enclosing gradient tape (the outputs are correct), so the functions, which are differentiated in
+    forward mode, are traced as python functions into the enclosing function instead.
+
+    :param function: The function, which may be a `tf.function`.
+    :type function: callable
+    :return: The python function of the `tf.function`, or the given function otherwise.
+    :rtype: callable
+    """
+    return getattr(function, "python_function", function)
+
+
+def get_unit_tangent(inputs, dim):
+    """
+    Returns the tangent of the inputs along the given input dimension.
+
+    :param inputs: The input points, of shape (n_points, n_dims).
+    :type inputs: tf.Tensor
+    :param dim: The input dimension.
+    :type dim: int
+    :return: The unit vector of the dimension at every point, of shape (n_points, n_dims).
+    :rtype: tf.Tensor
+    """
+    return tf.broadcast_to(tf.one_hot(dim, inputs.shape[-1], dtype=inputs.dtype), tf.shape(inputs))
+
+
+def forward_mode_input_gradients(function, inputs):
+    """
+    Computes the outputs of the given function and their derivatives with respect to the inputs in
+    forward mode, with one forward pass per input dimension.
+
+    :param function: The function, which maps the inputs of shape (n_points, n_dims) to the outputs of
+        shape (n_points, n_outputs).
+    :type function: callable
+    :param inputs: The input points, of shape (n_points, n_dims).
+    :type inputs: tf.Tensor
+    :return: The outputs and the list of their derivatives with respect to every input dimension.
+    :rtype: tuple(tf.Tensor, list)
+    """
+    function = get_python_function(function)
+    outputs = None
+    output_gradients = []
+
+    for dim in range(inputs.shape[-1]):
+        with tf.autodiff.ForwardAccumulator(
+            primals=inputs, tangents=get_unit_tangent(inputs, dim)
+        ) as accumulator:
+            outputs = function(inputs)
+
+        output_gradients.append(
+            accumulator.jvp(outputs, unconnected_gradients=tf.UnconnectedGradients.ZERO)
+        )
+
+    return outputs, output_gradients
+
+
+def chain_input_gradients(function, inputs, values, gradients):
+    """
+    Computes the outputs of function(inputs, values) and their derivatives with respect to the inputs in
+    forward mode, where the values depend on the inputs with the given derivatives (chain rule).
+    It is used for the hard constraint functions, which are applied to the inputs and the outputs of the
+    network.
+
+    :param function: The function of the inputs and the values.
+    :type function: callable
+    :param inputs: The input points, of shape (n_points, n_dims).
+    :type inputs: tf.Tensor
+    :param values: The values, which depend on the inputs.
+    :type values: tf.Tensor
+    :param gradients: The derivatives of the values with respect to every input dimension.
+    :type gradients: list
+    :return: The outputs and the list of their derivatives with respect to every input dimension.
+    :rtype: tuple(tf.Tensor, list)
+    """
+    function = get_python_function(function)
+    outputs = None
+    output_gradients = []
+
+    for dim in range(inputs.shape[-1]):
+        with tf.autodiff.ForwardAccumulator(
+            primals=[inputs, values], tangents=[get_unit_tangent(inputs, dim), gradients[dim]]
+        ) as accumulator:
+            outputs = function(inputs, values)
+
+        output_gradients.append(
+            accumulator.jvp(outputs, unconnected_gradients=tf.UnconnectedGradients.ZERO)
+        )
+
+    return outputs, output_gradients
@@ -15,10 +15,18 @@ import tensorflow as tf
 from tensorflow.keras import layers
 from tensorflow.keras import initializers
 import copy
+import warnings
+
+from fastvpinns.model.fused_training import FusedTrainingMixin, compile_train_step
+from fastvpinns.model.input_derivatives import (
+    supports_dense_input_gradients,
+    get_model_input_gradients,
+    get_fused_model_input_gradients,
+)
 
 
 # Custom Model
-class DenseModel(tf.keras.Model):
+class DenseModel(FusedTrainingMixin, tf.keras.Model):
     """
     Defines the Dense Model for the Neural Network for solving Variational PINNs.
 
@@ -42,8 +50,11 @@ class DenseModel(tf.keras.Model):
     :type use_attention: bool, optional
     :param activation: The activation function to be used for the dense layers, defaults to "tanh".
     :type activation: str, optional
-    :param hessian: Flag to use hessian loss, defaults to False.
+    :param hessian: Deprecated and not used, the second derivatives of the basis functions are computed
+        with `Fespace2D(compute_hessian=True)`. Defaults to False.
     :type hessian: bool, optional
+    :param jit_compile: Flag to compile the training step with XLA, defaults to False.
+    :type jit_compile: bool, optional
     """
 
     def __init__(
@@ -59,6 +70,7 @@ class DenseModel(tf.keras.Model):
         use_attention=False,
         activation="tanh",
         hessian=False,
+        jit_compile=False,
     ):
         super(DenseModel, self).__init__()
         self.layer_dims = layer_dims
@@ -67,6 +79,13 @@ class DenseModel(tf.keras.Model):
         self.layer_list = []
         self.loss_function = loss_function
         self.hessian = hessian
+        if hessian:
+            warnings.warn(
+                f"The hessian flag of {self.__class__.__name__} is deprecated and not used, "
+                "pass compute_hessian=True to Fespace2D instead.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
 
         self.tensor_dtype = tensor_dtype
 
@@ -94,6 +113,12 @@ class DenseModel(tf.keras.Model):
 
         self.force_matrix = self.force_function_list
 
+        # the quadrature and the dirichlet points are concatenated once, so that the network is applied
+        # to all of them in a single forward pass in the training step
+        self.fused_input_tensor = tf.concat(
+            [self.input_tensor, tf.cast(self.dirichlet_input, self.input_tensor.dtype)], axis=0
+        )
+
         print(f"{'-'*74}")
         print(f"| {'PARAMETER':<25} | {'SHAPE':<25} |")
         print(f"{'-'*74}")
@@ -174,8 +199,14 @@ class DenseModel(tf.keras.Model):
         if self.use_attention:
             self.attention_layer = layers.Attention()
 
-        # Compile the model
-        self.compile(optimizer=self.optimizer)
+        # the derivatives of the outputs with respect to the inputs are propagated analytically
+        # through the dense layers, unless the network has other layers
+        self.dense_input_gradients = not self.use_attention and supports_dense_input_gradients(
+            self.layer_list
+        )
+
+        # Compile the model, the training step is compiled with XLA if jit_compile is set
+        compile_train_step(self, jit_compile)
         self.build(input_shape=(None, self.layer_dims[0]))
 
         # print the summary of the model
@@ -227,6 +258,7 @@ class DenseModel(tf.keras.Model):
                 "use_attention": self.use_attention,
                 "activation": self.activation,
                 "hessian": self.hessian,
+                "jit_compile": self.jit_compile,
                 "layer_dims": self.layer_dims,
                 "tensor_dtype": self.tensor_dtype,
             }
@@ -234,6 +266,105 @@ class DenseModel(tf.keras.Model):
 
         return base_config
 
+    def compute_cells_residual(
+        self,
+        input_tensor,
+        pre_multiplier_val,
+        pre_multiplier_grad_x,
+        pre_multiplier_grad_y,
+        force_matrix,
+        bilinear_params_dict,
+    ):
+        """
+        Computes the residual of every cell for the given cells. It has to be called within the
+        gradient tape of the training step.
+
+        :param input_tensor: The quadrature points of the cells, of shape (n_cells * n_quad, 2).
+        :type input_tensor: tf.Tensor
+        :param pre_multiplier_val: The test function matrices of the cells.
+        :type pre_multiplier_val: tf.Tensor
+        :param pre_multiplier_grad_x: The x-derivative test function matrices of the cells.
+        :type pre_multiplier_grad_x: tf.Tensor
+        :param pre_multiplier_grad_y: The y-derivative test function matrices of the cells.
+        :type pre_multiplier_grad_y: tf.Tensor
+        :param force_matrix: The forcing terms of the cells, of shape (n_test, n_cells).
+        :type force_matrix: tf.Tensor
+        :param bilinear_params_dict: The dictionary containing the bilinear parameters.
+        :type bilinear_params_dict: dict
+        :return: The residual of every cell, of shape (n_cells,).
+        :rtype: tf.Tensor
+        """
+        # Compute the predicted values and their gradients wrt the input which is (x, y)
+        predicted_values, (gradients_x, gradients_y) = get_model_input_gradients(self, input_tensor)
+
+        return self.compute_predictions_residual(
+            predicted_values,
+            gradients_x,
+            gradients_y,
+            pre_multiplier_val,
+            pre_multiplier_grad_x,
+            pre_multiplier_grad_y,
+            force_matrix,
+            bilinear_params_dict,
+        )
+
+    def compute_predictions_residual(
+        self,
+        predicted_values,
+        gradients_x,
+        gradients_y,
+        pre_multiplier_val,
+        pre_multiplier_grad_x,
+        pre_multiplier_grad_y,
+        force_matrix,
+        bilinear_params_dict,
+    ):
+        """
+        Computes the residual of every cell from the predicted values and their derivatives at the
+        quadrature points of the cells.
+
+        :param predicted_values: The predicted values, of shape (n_cells * n_quad, 1).
+        :type predicted_values: tf.Tensor
+        :param gradients_x: The x-derivatives of the predicted values, of shape (n_cells * n_quad, 1).
+        :type gradients_x: tf.Tensor
+        :param gradients_y: The y-derivatives of the predicted values, of shape (n_cells * n_quad, 1).
+        :type gradients_y: tf.Tensor
+        :param pre_multiplier_val: The test function matrices of the cells.
+        :type pre_multiplier_val: tf.Tensor
+        :param pre_multiplier_grad_x: The x-derivative test function matrices of the cells.
+        :type pre_multiplier_grad_x: tf.Tensor
+        :param pre_multiplier_grad_y: The y-derivative test function matrices of the cells.
+        :type pre_multiplier_grad_y: tf.Tensor
+        :param force_matrix: The forcing terms of the cells, of shape (n_test, n_cells).
+        :type force_matrix: tf.Tensor
+        :param bilinear_params_dict: The dictionary containing the bilinear parameters.
+        :type bilinear_params_dict: dict
+        :return: The residual of every cell, of shape (n_cells,).
+        :rtype: tf.Tensor
+        """
+        # reshape the gradients for the tensorial operations purposes (refer Notebook)
+        pred_grad_x = tf.reshape(
+            gradients_x, [-1, pre_multiplier_grad_x.shape[-1]]
+        )  # shape : (N_cells , N_quadrature_points)
+        pred_grad_y = tf.reshape(
+            gradients_y, [-1, pre_multiplier_grad_y.shape[-1]]
+        )  # shape : (N_cells , N_quadrature_points)
+
+        pred_val = tf.reshape(
+            predicted_values, [-1, pre_multiplier_val.shape[-1]]
+        )  # shape : (N_cells , N_quadrature_points)
+
+        return self.loss_function(
+            test_shape_val_mat=pre_multiplier_val,
+            test_grad_x_mat=pre_multiplier_grad_x,
+            test_grad_y_mat=pre_multiplier_grad_y,
+            pred_nn=pred_val,
+            pred_grad_x_nn=pred_grad_x,
+            pred_grad_y_nn=pred_grad_y,
+            forcing_function=force_matrix,
+            bilinear_params=bilinear_params_dict,
+        )
+
     @tf.function
     def train_step(self, beta=10, bilinear_params_dict=None):  # pragma: no cover
         """
@@ -247,44 +378,27 @@ class DenseModel(tf.keras.Model):
         :rtype: varies based on implementation
         """
 
-        with tf.GradientTape(persistent=True) as tape:
-            # Predict the values for dirichlet boundary conditions
-            predicted_values_dirichlet = self(self.dirichlet_input)
+        with tf.GradientTape() as tape:
+            # Predict the values and their gradients wrt the input at the quadrature points, and the
+            # values for dirichlet boundary conditions, in a single forward pass
+            predicted_values, (gradients_x, gradients_y), (predicted_values_dirichlet,) = (
+                get_fused_model_input_gradients(
+                    self, self.input_tensor, [self.dirichlet_input], self.fused_input_tensor
+                )
+            )
 
             # initialize total loss as a tensor with shape (1,) and value 0.0
             total_pde_loss = 0.0
 
-            with tf.GradientTape(persistent=True) as tape1:
-                # tape gradient
-                tape1.watch(self.input_tensor)
-                # Compute the predicted values from the model
-                predicted_values = self(self.input_tensor)
-
-            # compute the gradients of the predicted values wrt the input which is (x, y)
-            gradients = tape1.gradient(predicted_values, self.input_tensor)
-
-            # Split the gradients into x and y components and reshape them to (-1, 1)
-            # the reshaping is done for the tensorial operations purposes (refer Notebook)
-            pred_grad_x = tf.reshape(
-                gradients[:, 0], [self.n_cells, self.pre_multiplier_grad_x.shape[-1]]
-            )  # shape : (N_cells , N_quadrature_points)
-            pred_grad_y = tf.reshape(
-                gradients[:, 1], [self.n_cells, self.pre_multiplier_grad_y.shape[-1]]
-            )  # shape : (N_cells , N_quadrature_points)
-
-            pred_val = tf.reshape(
-                predicted_values, [self.n_cells, self.pre_multiplier_val.shape[-1]]
-            )  # shape : (N_cells , N_quadrature_points)
-
-            cells_residual = self.loss_function(
-                test_shape_val_mat=self.pre_multiplier_val,
-                test_grad_x_mat=self.pre_multiplier_grad_x,
-                test_grad_y_mat=self.pre_multiplier_grad_y,
-                pred_nn=pred_val,
-                pred_grad_x_nn=pred_grad_x,
-                pred_grad_y_nn=pred_grad_y,
-                forcing_function=self.force_matrix,
-                bilinear_params=bilinear_params_dict,
+            cells_residual = self.compute_predictions_residual(
+                predicted_values,
+                gradients_x,
+                gradients_y,
+                self.pre_multiplier_val,
+                self.pre_multiplier_grad_x,
+                self.pre_multiplier_grad_y,
+                self.force_matrix,
+                bilinear_params_dict,
             )
 
             residual = tf.reduce_sum(cells_residual)
@@ -305,3 +419,162 @@ class DenseModel(tf.keras.Model):
         self.optimizer.apply_gradients(zip(self.gradients, trainable_vars))
 
         return {"loss_pde": total_pde_loss, "loss_dirichlet": boundary_loss, "loss": total_loss}
+
+    def gather_cells(self, cell_ids):
+        """
+        Gathers the quadrature points, the test function matrices and the forcing terms of the given cells.
+
+        :param cell_ids: The ids of the cells.
+        :type cell_ids: tf.Tensor
+        :return: The input tensor, the test function matrices of the values, the x-derivatives and the
+            y-derivatives, and the forcing terms of the given cells.
+        :rtype: tuple
+        """
+        n_quad = self.pre_multiplier_val.shape[-1]
+        input_tensor = tf.reshape(self.input_tensor, [self.n_cells, n_quad, -1])
+        input_tensor = tf.reshape(
+            tf.gather(input_tensor, cell_ids, axis=0), [-1, self.input_tensor.shape[-1]]
+        )
+
+        # the compact test matrix formats gather their per-cell factors
+        pre_multipliers = [
+            (
+                tf.gather(matrix, cell_ids, axis=0)
+                if isinstance(matrix, tf.Tensor)
+                else matrix.gather_cells(cell_ids)
+            )
+            for matrix in [
+                self.pre_multiplier_val,
+                self.pre_multiplier_grad_x,
+                self.pre_multiplier_grad_y,
+            ]
+        ]
+
+        force_matrix = tf.gather(self.force_matrix, cell_ids, axis=1)
+
+        return input_tensor, *pre_multipliers, force_matrix
+
+    @tf.function(reduce_retracing=True)
+    def train_step_cells(
+        self, cell_ids, beta=10, bilinear_params_dict=None, cell_weights=None
+    ):  # pragma: no cover
+        """
+        The train step method for the model, in which the PDE loss is computed only on the given subset
+        of the cells (see `CellBatchSampler` and `ResidualImportanceSampler`).
+
+        Without weights, the sum of the residuals of the subset is rescaled by n_cells / n_batch, which
+        is an unbiased estimate of the PDE loss of all the cells, if the subset is drawn uniformly at random.
+        With weights, the PDE loss is the weighted sum of the residuals of the subset.
+
+        :param cell_ids: The ids of the cells of the batch, of shape (n_batch,).
+        :type cell_ids: tf.Tensor
+        :param beta: The beta parameter for the training step, defaults to 10.
+        :type beta: int, optional
+        :param bilinear_params_dict: The dictionary containing the bilinear parameters, defaults to None.
+        :type bilinear_params_dict: dict, optional
+        :param cell_weights: The importance weights of the cells of the batch, of shape (n_batch,),
+            defaults to None.
+        :type cell_weights: tf.Tensor, optional
+        :return: The output of the training step, along with the residuals of the cells of the batch.
+        :rtype: dict
+        """
+        cell_ids = tf.convert_to_tensor(cell_ids)
+        if cell_weights is None:
+            cell_weights = tf.fill(
+                tf.shape(cell_ids),
+                tf.cast(self.n_cells, self.tensor_dtype)
+                / tf.cast(tf.shape(cell_ids)[0], self.tensor_dtype),
+            )
+        cell_weights = tf.cast(cell_weights, self.tensor_dtype)
+
+        # the values of the batch are gathered outside the gradient tape
+        input_tensor, pre_val, pre_grad_x, pre_grad_y, force_matrix = self.gather_cells(cell_ids)
+
+        with tf.GradientTape() as tape:
+            # Predict the values and their gradients wrt the input at the quadrature points of the
+            # batch, and the values for dirichlet boundary conditions, in a single forward pass
+            predicted_values, (gradients_x, gradients_y), (predicted_values_dirichlet,) = (
+                get_fused_model_input_gradients(self, input_tensor, [self.dirichlet_input])
+            )
+
+            cells_residual = self.compute_predictions_residual(
+                predicted_values,
+                gradients_x,
+                gradients_y,
+                pre_val,
+                pre_grad_x,
+                pre_grad_y,
+                force_matrix,
+                bilinear_params_dict,
+            )
+
+            # Compute the unbiased estimate of the loss for the PDE
+            total_pde_loss = tf.reduce_sum(cell_weights * cells_residual)
+
+            boundary_loss = tf.reduce_mean(
+                tf.square(predicted_values_dirichlet - self.dirichlet_actual), axis=0
+            )
+
+            # Compute Total Loss
+            total_loss = total_pde_loss + beta * boundary_loss
+
+        trainable_vars = self.trainable_variables
+        self.gradients = tape.gradient(total_loss, trainable_vars)
+        self.optimizer.apply_gradients(zip(self.gradients, trainable_vars))
+
+        return {
+            "loss_pde": total_pde_loss,
+            "loss_dirichlet": boundary_loss,
+            "loss": total_loss,
+            "cells_residual": cells_residual,
+        }
+
+    @tf.function
+    def get_cells_residual(self, bilinear_params_dict=None):  # pragma: no cover
+        """
+        Computes the residuals of all the cells, without a training step. Only the gradients with respect
+        to the inputs are computed, so it is cheaper than a training step.
+
+        :param bilinear_params_dict: The dictionary containing the bilinear parameters, defaults to None.
+        :type bilinear_params_dict: dict, optional
+        :return: The residual of every cell, of shape (n_cells,).
+        :rtype: tf.Tensor
+        """
+        return self.compute_cells_residual(
+            self.input_tensor,
+            self.pre_multiplier_val,
+            self.pre_multiplier_grad_x,
+            self.pre_multiplier_grad_y,
+            self.force_matrix,
+            bilinear_params_dict,
+        )
+
+    def train_step_importance(self, sampler, beta=10, bilinear_params_dict=None):
+        """
+        The train step method for the model with the residual-driven importance sampling of the cells.
+        The residuals of all the cells are refreshed when the sampler requests it, the cells of the batch
+        are drawn in proportion to their residuals, and the residual estimate of the sampled cells is
+        updated after the step.
+
+        :param sampler: The sampler of the cells.
+        :type sampler: ResidualImportanceSampler
+        :param beta: The beta parameter for the training step, defaults to 10.
+        :type beta: int, optional
+        :param bilinear_params_dict: The dictionary containing the bilinear parameters, defaults to None.
+        :type bilinear_params_dict: dict, optional
+        :return: The output of the training step.
+        :rtype: dict
+        """
+        if sampler.should_refresh():
+            sampler.refresh(self.get_cells_residual(bilinear_params_dict))
+
+        cell_ids, cell_weights = sampler.next_batch()
+        loss = self.train_step_cells(
+            cell_ids,
+            beta=beta,
+            bilinear_params_dict=bilinear_params_dict,
+            cell_weights=cell_weights,
+        )
+        sampler.update(cell_ids, loss["cells_residual"])
+
+        return loss
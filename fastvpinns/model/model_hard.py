@@ -13,14 +13,23 @@ Known issues: None
 """
 
 import copy
+import warnings
+
 import numpy as np
 import tensorflow as tf
 from tensorflow.keras import layers
 from tensorflow.keras import initializers
 
+from fastvpinns.model.fused_training import FusedTrainingMixin, compile_train_step
+from fastvpinns.model.input_derivatives import (
+    supports_dense_input_gradients,
+    get_model_input_gradients,
+    get_python_function,
+)
+
 
 # Custom Model
-class DenseModel_Hard(tf.keras.Model):
+class DenseModel_Hard(FusedTrainingMixin, tf.keras.Model):
     """The DenseModel_Hard class is a custom model class that hosts the neural network model.
 
     The class inherits from the tf.keras.Model class and is used
@@ -46,8 +55,11 @@ class DenseModel_Hard(tf.keras.Model):
     :type use_attention: bool
     :param activation: Activation function for the model
     :type activation: str
-    :param hessian: Flag to compute hessian
+    :param hessian: Deprecated and not used, the second derivatives of the basis functions are computed
+        with `Fespace2D(compute_hessian=True)`. Defaults to False.
     :type hessian: bool
+    :param jit_compile: Flag to compile the training step with XLA
+    :type jit_compile: bool
 
     Methods
     -------
@@ -74,6 +86,7 @@ class DenseModel_Hard(tf.keras.Model):
         activation="tanh",
         hessian=False,
         hard_constraint_function=None,
+        jit_compile=False,
     ):
         super(DenseModel_Hard, self).__init__()
         self.layer_dims = layer_dims
@@ -82,10 +95,18 @@ class DenseModel_Hard(tf.keras.Model):
         self.layer_list = []
         self.loss_function = loss_function
         self.hessian = hessian
+        if hessian:
+            warnings.warn(
+                f"The hessian flag of {self.__class__.__name__} is deprecated and not used, "
+                "pass compute_hessian=True to Fespace2D instead.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
         if hard_constraint_function is None:
             self.hard_constraint_function = lambda x, y: y
         else:
-            self.hard_constraint_function = hard_constraint_function
+            # the hard constraint function is differentiated in forward mode in the training step
+            self.hard_constraint_function = get_python_function(hard_constraint_function)
 
         self.tensor_dtype = tensor_dtype
 
@@ -195,8 +216,14 @@ class DenseModel_Hard(tf.keras.Model):
         if self.use_attention:
             self.attention_layer = layers.Attention()
 
-        # Compile the model
-        self.compile(optimizer=self.optimizer)
+        # the derivatives of the outputs with respect to the inputs are propagated analytically
+        # through the dense layers, unless the network has other layers
+        self.dense_input_gradients = not self.use_attention and supports_dense_input_gradients(
+            self.layer_list
+        )
+
+        # Compile the model, the training step is compiled with XLA if jit_compile is set
+        compile_train_step(self, jit_compile)
         self.build(input_shape=(None, self.layer_dims[0]))
 
         # print the summary of the model
@@ -248,6 +275,7 @@ class DenseModel_Hard(tf.keras.Model):
                 "use_attention": self.use_attention,
                 "activation": self.activation,
                 "hessian": self.hessian,
+                "jit_compile": self.jit_compile,
                 "layer_dims": self.layer_dims,
                 "tensor_dtype": self.tensor_dtype,
             }
@@ -265,28 +293,23 @@ class DenseModel_Hard(tf.keras.Model):
         :rtype: dict
         """
 
-        with tf.GradientTape(persistent=True) as tape:
+        with tf.GradientTape() as tape:
             # Predict the values for dirichlet boundary conditions
 
             # initialize total loss as a tensor with shape (1,) and value 0.0
             total_pde_loss = 0.0
 
-            with tf.GradientTape(persistent=True) as tape1:
-                # tape gradient
-                tape1.watch(self.input_tensor)
-                # Compute the predicted values from the model
-                predicted_values = self(self.input_tensor)
-
-            # compute the gradients of the predicted values wrt the input which is (x, y)
-            gradients = tape1.gradient(predicted_values, self.input_tensor)
+            # Compute the predicted values and their gradients wrt the input which is (x, y)
+            predicted_values, (gradients_x, gradients_y) = get_model_input_gradients(
+                self, self.input_tensor, self.hard_constraint_function
+            )
 
-            # Split the gradients into x and y components and reshape them to (-1, 1)
-            # the reshaping is done for the tensorial operations purposes (refer Notebook)
+            # reshape the gradients for the tensorial operations purposes (refer Notebook)
             pred_grad_x = tf.reshape(
-                gradients[:, 0], [self.n_cells, self.pre_multiplier_grad_x.shape[-1]]
+                gradients_x, [self.n_cells, self.pre_multiplier_grad_x.shape[-1]]
             )  # shape : (N_cells , N_quadrature_points)
             pred_grad_y = tf.reshape(
-                gradients[:, 1], [self.n_cells, self.pre_multiplier_grad_y.shape[-1]]
+                gradients_y, [self.n_cells, self.pre_multiplier_grad_y.shape[-1]]
             )  # shape : (N_cells , N_quadrature_points)
 
             pred_val = tf.reshape(
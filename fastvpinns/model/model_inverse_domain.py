@@ -15,10 +15,18 @@ import tensorflow as tf
 from tensorflow.keras import layers
 from tensorflow.keras import initializers
 import copy
+import warnings
+
+from fastvpinns.model.fused_training import FusedTrainingMixin, compile_train_step
+from fastvpinns.model.input_derivatives import (
+    supports_dense_input_gradients,
+    get_model_input_gradients,
+    get_fused_model_input_gradients,
+)
 
 
 # Custom Model
-class DenseModel_Inverse_Domain(tf.keras.Model):
+class DenseModel_Inverse_Domain(FusedTrainingMixin, tf.keras.Model):
     """
     A subclass of tf.keras.Model that defines a dense model for an inverse problem.
 
@@ -34,7 +42,9 @@ class DenseModel_Inverse_Domain(tf.keras.Model):
     :param tf.DType tensor_dtype: The data type of the tensors.
     :param bool use_attention: Whether to use attention mechanism in the model. Defaults to False.
     :param str activation: The activation function to be used in the model. Defaults to 'tanh'.
-    :param bool hessian: Whether to use Hessian in the model. Defaults to False.
+    :param bool hessian: Deprecated and not used, the second derivatives of the basis functions are
+        computed with `Fespace2D(compute_hessian=True)`. Defaults to False.
+    :param bool jit_compile: Whether to compile the training step with XLA. Defaults to False.
     """
 
     def __init__(
@@ -51,6 +61,7 @@ class DenseModel_Inverse_Domain(tf.keras.Model):
         use_attention=False,
         activation="tanh",
         hessian=False,
+        jit_compile=False,
     ):
         super(DenseModel_Inverse_Domain, self).__init__()
         self.layer_dims = layer_dims
@@ -59,6 +70,13 @@ class DenseModel_Inverse_Domain(tf.keras.Model):
         self.layer_list = []
         self.loss_function = loss_function
         self.hessian = hessian
+        if hessian:
+            warnings.warn(
+                f"The hessian flag of {self.__class__.__name__} is deprecated and not used, "
+                "pass compute_hessian=True to Fespace2D instead.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
 
         self.tensor_dtype = tensor_dtype
 
@@ -91,6 +109,17 @@ class DenseModel_Inverse_Domain(tf.keras.Model):
 
         self.force_matrix = self.force_function_list
 
+        # the quadrature, the dirichlet and the sensor points are concatenated once, so that the
+        # network is applied to all of them in a single forward pass in the training step
+        self.fused_input_tensor = tf.concat(
+            [
+                self.input_tensor,
+                tf.cast(self.dirichlet_input, self.input_tensor.dtype),
+                tf.cast(self.sensor_points, self.input_tensor.dtype),
+            ],
+            axis=0,
+        )
+
         print(f"{'-'*74}")
         print(f"| {'PARAMETER':<25} | {'SHAPE':<25} |")
         print(f"{'-'*74}")
@@ -180,8 +209,14 @@ class DenseModel_Inverse_Domain(tf.keras.Model):
         if self.use_attention:
             self.attention_layer = layers.Attention()
 
-        # Compile the model
-        self.compile(optimizer=self.optimizer)
+        # the derivatives of the outputs with respect to the inputs are propagated analytically
+        # through the dense layers, unless the network has other layers
+        self.dense_input_gradients = not self.use_attention and supports_dense_input_gradients(
+            self.layer_list
+        )
+
+        # Compile the model, the training step is compiled with XLA if jit_compile is set
+        compile_train_step(self, jit_compile)
         self.build(input_shape=(None, self.layer_dims[0]))
 
         # print the summary of the model
@@ -230,6 +265,7 @@ class DenseModel_Inverse_Domain(tf.keras.Model):
                 "use_attention": self.use_attention,
                 "activation": self.activation,
                 "hessian": self.hessian,
+                "jit_compile": self.jit_compile,
                 "layer_dims": self.layer_dims,
                 "tensor_dtype": self.tensor_dtype,
                 "sensor_list": self.sensor_list,
@@ -251,43 +287,38 @@ class DenseModel_Inverse_Domain(tf.keras.Model):
         :rtype: varies based on implementation
         """
 
-        with tf.GradientTape(persistent=True) as tape:
-            # Predict the values for dirichlet boundary conditions
-            predicted_values_dirichlet = self(self.dirichlet_input)
+        with tf.GradientTape() as tape:
+            # Compute the predicted values and their gradients wrt the input which is (x, y), the
+            # values for dirichlet boundary conditions and the sensor values, in a single forward pass
+            (
+                predicted_values_actual,
+                (gradients_x, gradients_y),
+                (predicted_values_dirichlet, predicted_sensor_values),
+            ) = get_fused_model_input_gradients(
+                self,
+                self.input_tensor,
+                [self.dirichlet_input, self.sensor_points],
+                self.fused_input_tensor,
+            )
+
             # reshape the predicted values to (, 1)
             predicted_values_dirichlet = tf.reshape(predicted_values_dirichlet[:, 0], [-1, 1])
-
-            # predict the sensor values
-            predicted_sensor_values = self(self.sensor_points)
             # reshape the predicted values to (, 1)
             predicted_sensor_values = tf.reshape(predicted_sensor_values[:, 0], [-1, 1])
 
             # initialize total loss as a tensor with shape (1,) and value 0.0
             total_pde_loss = 0.0
 
-            with tf.GradientTape(persistent=True) as tape1:
-                # tape gradient
-                tape1.watch(self.input_tensor)
-                # Compute the predicted values from the model
-                predicted_values_actual = self(self.input_tensor)
-
-                predicted_values = predicted_values_actual[:, 0]
-                inverse_param_values = predicted_values_actual[:, 1]
-
-            # compute the gradients of the predicted values wrt the input which is (x, y)
-            # First column of the predicted values is the predicted value of the PDE
-            gradients = tape1.gradient(predicted_values, self.input_tensor)
-
-            # obtain inverse param gradients
-            inverse_param_gradients = tape1.gradient(inverse_param_values, self.input_tensor)
+            predicted_values = predicted_values_actual[:, 0]
+            inverse_param_values = predicted_values_actual[:, 1]
 
-            # Split the gradients into x and y components and reshape them to (-1, 1)
-            # the reshaping is done for the tensorial operations purposes (refer Notebook)
+            # First column of the gradients is the gradient of the predicted value of the PDE,
+            # reshaped for the tensorial operations purposes (refer Notebook)
             pred_grad_x = tf.reshape(
-                gradients[:, 0], [self.n_cells, self.pre_multiplier_grad_x.shape[-1]]
+                gradients_x[:, 0], [self.n_cells, self.pre_multiplier_grad_x.shape[-1]]
             )  # shape : (N_cells , N_quadrature_points)
             pred_grad_y = tf.reshape(
-                gradients[:, 1], [self.n_cells, self.pre_multiplier_grad_y.shape[-1]]
+                gradients_y[:, 0], [self.n_cells, self.pre_multiplier_grad_y.shape[-1]]
             )  # shape : (N_cells , N_quadrature_points)
 
             # First column of the predicted values is the predicted value of the PDE and reshape it to (N_cells, N_quadrature_points)
@@ -7,6 +7,7 @@ Author: Thivin Anandh D
 Date: 02/Nov/2023
 
 Changelog: 02/Nov/2023 - file created; and added functions to compute L1, L2, L_inf errors
+           18/Oct/2026 - added function to evaluate a user defined function on arrays of points
 
 Known issues: None
 """
@@ -222,3 +223,46 @@ def compute_errors_combined(u_exact, u_approx):
         l1_error,
         l1_error_relative,
     )
+
+
+def evaluate_function_at_points(function, x, y):
+    """
+    This function will evaluate a user defined function f(x, y) at all the given points at once.
+
+    The function is first called with the arrays x and y. If the function is not array-safe
+    (i.e. it raises a TypeError or ValueError, or it does not return one value per point),
+    it is evaluated pointwise instead. A scalar returned by an array-safe function
+    (e.g. a constant forcing term) is broadcasted to all the points.
+
+    :param function: The function to be evaluated, which takes the coordinates (x, y) as input
+    :type function: function
+    :param x: numpy array containing the x-coordinates of the points
+    :type x: numpy.ndarray
+    :param y: numpy array containing the y-coordinates of the points
+    :type y: numpy.ndarray
+
+    :return: The values of the function at the given points, of the same shape as x
+    :rtype: numpy.ndarray
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    try:
+        values = np.asarray(function(x, y), dtype=np.float64)
+    except (TypeError, ValueError):
+        values = None
+
+    if values is not None:
+        if values.shape == x.shape:
+            return values
+        if values.size == 1:
+            return np.full(x.shape, values.item(), dtype=np.float64)
+        if values.size == x.size:
+            return values.reshape(x.shape)
+
+    # fallback - evaluate the function at one point at a time
+    values = np.zeros(x.shape, dtype=np.float64)
+    for index in np.ndindex(x.shape):
+        values[index] = function(x[index], y[index])
+
+    return values
@@ -0,0 +1,344 @@
+"""
+This file `vtk_writer.py` contains the functions and the class to write the solution on a quadrilateral mesh
+in binary VTK formats (legacy VTK, VTU and XDMF), without reading the mesh from a file for every write.
+
+Known issues: The heavy data of the XDMF series is stored as raw binary (not HDF5),
+              so that no additional dependency is needed.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+# VTK cell type of the quadrilateral cells
+VTK_QUAD = 9
+
+
+def write_legacy_vtk(file_name, points, connectivity, point_data) -> None:
+    """
+    This function will write the point data on a quadrilateral mesh to a binary legacy VTK file.
+
+    :param file_name: The name of the output file
+    :type file_name: str
+    :param points: numpy array containing the coordinates of the points, of shape (n_points, 2)
+    :type points: numpy.ndarray
+    :param connectivity: numpy array containing the point indices of the cells, of shape (n_cells, 4)
+    :type connectivity: numpy.ndarray
+    :param point_data: dictionary of the data names and the values at the points, of shape (n_points,)
+    :type point_data: dict
+
+    :return: None
+    """
+    points = np.asarray(points, dtype=np.float64)
+    connectivity = np.asarray(connectivity).reshape(-1, 4)
+    n_points = points.shape[0]
+    n_cells = connectivity.shape[0]
+
+    # legacy VTK binary files are big endian
+    points_3d = np.zeros((n_points, 3), dtype=">f8")
+    points_3d[:, 0:2] = points[:, 0:2]
+    cells = np.empty((n_cells, 5), dtype=">i4")
+    cells[:, 0] = 4
+    cells[:, 1:] = connectivity
+
+    with open(str(file_name), "wb") as file:
+        file.write(b"# vtk DataFile Version 4.2\nfastvpinns\nBINARY\nDATASET UNSTRUCTURED_GRID\n")
+        file.write(f"POINTS {n_points} double\n".encode())
+        file.write(points_3d.tobytes())
+        file.write(f"\nCELLS {n_cells} {5 * n_cells}\n".encode())
+        file.write(cells.tobytes())
+        file.write(f"\nCELL_TYPES {n_cells}\n".encode())
+        file.write(np.full(n_cells, VTK_QUAD, dtype=">i4").tobytes())
+        file.write(b"\n")
+        if point_data:
+            file.write(f"POINT_DATA {n_points}\n".encode())
+        for name, values in point_data.items():
+            file.write(f"SCALARS {name} double\nLOOKUP_TABLE default\n".encode())
+            file.write(np.asarray(values, dtype=">f8").reshape(-1).tobytes())
+            file.write(b"\n")
+
+
+def write_vtu(file_name, points, connectivity, point_data) -> None:
+    """
+    This function will write the point data on a quadrilateral mesh to a VTU file,
+    with all the arrays stored as raw appended binary data.
+
+    :param file_name: The name of the output file
+    :type file_name: str
+    :param points: numpy array containing the coordinates of the points, of shape (n_points, 2)
+    :type points: numpy.ndarray
+    :param connectivity: numpy array containing the point indices of the cells, of shape (n_cells, 4)
+    :type connectivity: numpy.ndarray
+    :param point_data: dictionary of the data names and the values at the points, of shape (n_points,)
+    :type point_data: dict
+
+    :return: None
+    """
+    points = np.asarray(points, dtype=np.float64)
+    connectivity = np.asarray(connectivity).reshape(-1, 4)
+    n_points = points.shape[0]
+    n_cells = connectivity.shape[0]
+
+    points_3d = np.zeros((n_points, 3), dtype="<f8")
+    points_3d[:, 0:2] = points[:, 0:2]
+
+    # name, type, number of components and values of all the arrays, in the order of the appended data
+    arrays = [("Points", "Float64", 3, points_3d)]
+    arrays += [
+        ("connectivity", "Int64", 1, connectivity.astype("<i8")),
+        ("offsets", "Int64", 1, np.arange(4, 4 * n_cells + 1, 4, dtype="<i8")),
+        ("types", "UInt8", 1, np.full(n_cells, VTK_QUAD, dtype="u1")),
+    ]
+    arrays += [
+        (name, "Float64", 1, np.asarray(values, dtype="<f8").reshape(-1))
+        for name, values in point_data.items()
+    ]
+
+    # every array is preceded by its size in bytes (UInt64)
+    headers = []
+    offset = 0
+    for name, data_type, n_components, values in arrays:
+        headers.append(
+            f'<DataArray type="{data_type}" Name="{name}" NumberOfComponents="{n_components}" '
+            f'format="appended" offset="{offset}"/>'
+        )
+        offset += 8 + values.nbytes
+
+    xml = [
+        '<?xml version="1.0"?>',
+        '<VTKFile type="UnstructuredGrid" version="1.0" byte_order="LittleEndian" header_type="UInt64">',
+        "<UnstructuredGrid>",
+        f'<Piece NumberOfPoints="{n_points}" NumberOfCells="{n_cells}">',
+        f"<Points>{headers[0]}</Points>",
+        f"<Cells>{''.join(headers[1:4])}</Cells>",
+        f"<PointData>{''.join(headers[4:])}</PointData>",
+        "</Piece>",
+        "</UnstructuredGrid>",
+        '<AppendedData encoding="raw">',
+    ]
+
+    with open(str(file_name), "wb") as file:
+        file.write(("\n".join(xml) + "\n_").encode())
+        for _, _, _, values in arrays:
+            file.write(np.uint64(values.nbytes).astype("<u8").tobytes())
+            file.write(np.ascontiguousarray(values).tobytes())
+        file.write(b"\n</AppendedData>\n</VTKFile>\n")
+
+
+class SolutionWriter:
+    """
+    This class is used to write the solution on a fixed quadrilateral mesh at different time steps (epochs).
+    The geometry is kept in memory, and only the point data is written at every step.
+
+    With the "vtu" format, every step is written to a VTU file `<file_prefix>_<step>.vtu`, and the steps
+    are collected in the `<file_prefix>.pvd` file. With the "xdmf" format, the geometry is written only once
+    to the raw binary file `<file_prefix>.bin`, the point data of every step is appended to the same file,
+    and the steps are described in the `<file_prefix>.xdmf` file.
+
+    The object can be used as a callable sink, `writer(solution, data_names, time)`.
+
+    :param points: numpy array containing the coordinates of the points, of shape (n_points, 2)
+    :type points: numpy.ndarray
+    :param connectivity: numpy array containing the point indices of the cells, of shape (n_cells, 4)
+    :type connectivity: numpy.ndarray
+    :param output_path: The path to the output folder
+    :type output_path: str
+    :param file_format: The format of the output files, "vtu" or "xdmf". Defaults to "vtu".
+    :type file_format: str, optional
+    :param file_prefix: The prefix of the names of the output files. Defaults to "solution".
+    :type file_prefix: str, optional
+    :raises ValueError: If the file format is not valid.
+    """
+
+    def __init__(
+        self,
+        points,
+        connectivity,
+        output_path: str,
+        file_format: str = "vtu",
+        file_prefix: str = "solution",
+    ):
+        if file_format not in ["vtu", "xdmf"]:
+            print(
+                f"Invalid file format {file_format} in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError('File format should be either "vtu" or "xdmf".')
+
+        self.points = np.ascontiguousarray(np.asarray(points, dtype=np.float64)[:, 0:2])
+        self.connectivity = np.ascontiguousarray(np.asarray(connectivity, dtype=np.int64))
+        self.output_path = Path(output_path)
+        self.output_path.mkdir(parents=True, exist_ok=True)
+        self.file_format = file_format
+        self.file_prefix = file_prefix
+
+        self.n_points = self.points.shape[0]
+
+        # time and files (vtu) or data offsets (xdmf) of all the written steps
+        self.steps = []
+
+        # size of the raw binary file and offsets of the points and the connectivity (xdmf)
+        self.binary_offset = 0
+        self.geometry_offsets = None
+
+    def __call__(self, solution, data_names, time=None) -> None:
+        """
+        Writes the solution of the next step. See `write_step`.
+        """
+        self.write_step(solution, data_names, time)
+
+    def get_point_data(self, solution, data_names) -> dict:
+        """
+        Returns the dictionary of the data names and the columns of the solution.
+
+        :param solution: numpy array containing the solution, of shape (n_points, n_data)
+        :type solution: numpy.ndarray
+        :param data_names: The list of data names, one for each column of the solution
+        :type data_names: list
+        :return: The dictionary of the data names and the values.
+        :rtype: dict
+        :raises ValueError: If the shape of the solution does not match the data names or the points.
+        """
+        solution = np.asarray(solution, dtype=np.float64)
+        solution = solution.reshape(-1, 1) if solution.ndim == 1 else solution
+        if solution.shape[1] != len(data_names):
+            print(
+                f"Num columns in solution {solution.shape[1]} and num of data names {len(data_names)} do not match in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError("Number of data names and solution columns are not equal")
+        if solution.shape[0] != self.n_points:
+            print(
+                f"Num rows in solution {solution.shape[0]} and num of points {self.n_points} do not match in {self.__class__.__name__} from {__name__}."
+            )
+            raise ValueError("Number of solution rows and points are not equal")
+
+        return {name: solution[:, i] for i, name in enumerate(data_names)}
+
+    def write_step(self, solution, data_names, time=None) -> None:
+        """
+        Writes the solution of the next step.
+
+        :param solution: numpy array containing the solution, of shape (n_points, n_data)
+        :type solution: numpy.ndarray
+        :param data_names: The list of data names, one for each column of the solution
+        :type data_names: list
+        :param time: The time (epoch) of the step. Defaults to the index of the step.
+        :type time: float, optional
+        :return: None
+        """
+        point_data = self.get_point_data(solution, data_names)
+        time = len(self.steps) if time is None else time
+
+        if self.file_format == "vtu":
+            file_name = f"{self.file_prefix}_{len(self.steps)}.vtu"
+            write_vtu(self.output_path / file_name, self.points, self.connectivity, point_data)
+            self.steps.append((time, file_name))
+            self.write_pvd()
+        else:
+            self.steps.append((time, self.append_binary_data(point_data)))
+            self.write_xdmf()
+
+    def write_pvd(self) -> None:
+        """
+        Writes the PVD collection file of all the written VTU files.
+
+        :return: None
+        """
+        datasets = [
+            f'<DataSet timestep="{time}" part="0" file="{file_name}"/>'
+            for time, file_name in self.steps
+        ]
+        xml = [
+            '<?xml version="1.0"?>',
+            '<VTKFile type="Collection" version="0.1" byte_order="LittleEndian">',
+            "<Collection>",
+            *datasets,
+            "</Collection>",
+            "</VTKFile>",
+        ]
+        (self.output_path / f"{self.file_prefix}.pvd").write_text("\n".join(xml) + "\n")
+
+    def append_binary_data(self, point_data) -> dict:
+        """
+        Appends the point data (and the geometry, for the first step) to the raw binary file of the xdmf format.
+
+        :param point_data: dictionary of the data names and the values at the points
+        :type point_data: dict
+        :return: The dictionary of the data names and their offsets in the binary file.
+        :rtype: dict
+        """
+        binary_file = self.output_path / f"{self.file_prefix}.bin"
+        arrays = {
+            name: np.ascontiguousarray(values, dtype="<f8") for name, values in point_data.items()
+        }
+
+        mode = "ab"
+        if not self.steps:
+            mode = "wb"
+            self.binary_offset = 0
+            arrays = {
+                "__points__": self.points.astype("<f8"),
+                "__connectivity__": self.connectivity.astype("<i8"),
+                **arrays,
+            }
+
+        offsets = {}
+        with open(binary_file, mode) as file:
+            for name, values in arrays.items():
+                file.write(values.tobytes())
+                offsets[name] = self.binary_offset
+                self.binary_offset += values.nbytes
+
+        if not self.steps:
+            self.geometry_offsets = (offsets.pop("__points__"), offsets.pop("__connectivity__"))
+
+        return offsets
+
+    def write_xdmf(self) -> None:
+        """
+        Writes the XDMF file of all the written steps, which refers to the raw binary file.
+
+        :return: None
+        """
+        binary_file = f"{self.file_prefix}.bin"
+        n_cells = self.connectivity.shape[0]
+        points_offset, connectivity_offset = self.geometry_offsets
+
+        def data_item(dimensions, number_type, offset):
+            return (
+                f'<DataItem Dimensions="{dimensions}" NumberType="{number_type}" Precision="8" '
+                f'Format="Binary" Endian="Little" Seek="{offset}">{binary_file}</DataItem>'
+            )
+
+        # every step refers to the same geometry block of the binary file
+        topology = (
+            f'<Topology TopologyType="Quadrilateral" NumberOfElements="{n_cells}">'
+            f"{data_item(f'{n_cells} 4', 'Int', connectivity_offset)}</Topology>"
+        )
+        geometry = (
+            f'<Geometry GeometryType="XY">'
+            f"{data_item(f'{self.n_points} 2', 'Float', points_offset)}</Geometry>"
+        )
+
+        grids = []
+        for time, offsets in self.steps:
+            attributes = "".join(
+                f'<Attribute Name="{name}" AttributeType="Scalar" Center="Node">'
+                f"{data_item(self.n_points, 'Float', offset)}</Attribute>"
+                for name, offset in offsets.items()
+            )
+            grids.append(
+                f'<Grid Name="mesh" GridType="Uniform"><Time Value="{time}"/>'
+                f"{topology}{geometry}{attributes}</Grid>"
+            )
+
+        xml = [
+            '<?xml version="1.0"?>',
+            '<Xdmf Version="3.0">',
+            "<Domain>",
+            '<Grid Name="TimeSeries" GridType="Collection" CollectionType="Temporal">',
+            *grids,
+            "</Grid>",
+            "</Domain>",
+            "</Xdmf>",
+        ]
+        (self.output_path / f"{self.file_prefix}.xdmf").write_text("\n".join(xml) + "\n")
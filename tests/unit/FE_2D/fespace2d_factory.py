@@ -0,0 +1,59 @@
+# Shared mesh and Fespace2D factory for the test cases of the FE assembly, the test matrix formats,
+# the tensor cache and the parallel assembly.
+
+import numpy as np
+
+from fastvpinns.FE.fespace2d import Fespace2D
+
+# cells, which are added to the rectangular cells of the mesh, with the nodes ordered anticlockwise
+EXTRA_CELLS = {
+    "distorted": [[0.0, 0.0], [1.2, 0.1], [1.0, 0.9], [-0.1, 1.1]],
+    "distorted_2": [[2.0, 1.0], [3.0, 1.3], [3.4, 2.5], [1.8, 2.0]],
+    "parallelogram": [[2.0, 1.0], [3.0, 1.3], [3.5, 2.3], [2.5, 2.0]],
+}
+
+
+def get_cells(n_cells_x=3, n_cells_y=2, extra_cells=("distorted", "distorted_2"), shift=0.0):
+    """
+    Returns a small mesh of n_cells_x x n_cells_y rectangular cells on [0, 1] x [0, 2] (shifted in x),
+    followed by the given cells of EXTRA_CELLS, with the nodes of every cell ordered anticlockwise.
+    """
+    x = np.linspace(0, 1, n_cells_x + 1) + shift
+    y = np.linspace(0, 2, n_cells_y + 1)
+    cells = []
+    for i in range(n_cells_x):
+        for j in range(n_cells_y):
+            cells.append([[x[i], y[j]], [x[i + 1], y[j]], [x[i + 1], y[j + 1]], [x[i], y[j + 1]]])
+
+    cells.extend(EXTRA_CELLS[name] for name in extra_cells)
+
+    return np.array(cells, dtype=np.float64)
+
+
+def get_fespace(cells=None, **kwargs):
+    """
+    Returns the Fespace2D object for the given cells (`get_cells()` by default), with a dirichlet
+    boundary on the first nodes of the cells. The keyword arguments override the default arguments
+    of Fespace2D.
+    """
+    cells = get_cells() if cells is None else cells
+
+    fespace_kwargs = {
+        "mesh": None,
+        "cells": cells,
+        "boundary_points": {1000: cells[:, 0, :]},
+        "cell_type": "quadrilateral",
+        "fe_order": 4,
+        "fe_type": "legendre",
+        "quad_order": 5,
+        "quad_type": "gauss-jacobi",
+        "fe_transformation_type": "bilinear",
+        "bound_function_dict": {1000: lambda x, y: np.sin(x) + y},
+        "bound_condition_dict": {1000: "dirichlet"},
+        "forcing_function": lambda x, y: np.sin(np.pi * x) * np.cos(np.pi * y),
+        "output_path": "tests/dump",
+        "generate_mesh_plot": False,
+    }
+    fespace_kwargs.update(kwargs)
+
+    return Fespace2D(**fespace_kwargs)
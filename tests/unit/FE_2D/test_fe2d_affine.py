@@ -0,0 +1,141 @@
+# Added test cases for validating the affine representation of the test function matrices,
+# for meshes with a constant Jacobian within every cell.
+
+import pytest
+import numpy as np
+import tensorflow as tf
+
+from fastvpinns.data.affine_matrix import AffineTestMatrix, get_affine_test_matrix
+from fastvpinns.physics.cd2d import pde_loss_cd2d
+
+from fespace2d_factory import get_cells, get_fespace
+
+
+# rectangular and parallelogram cells, which have a constant Jacobian within every cell
+AFFINE_CELLS = ("parallelogram",)
+
+
+def get_matrices(fespace, dtype=tf.float64):
+    """
+    Returns the dense and the affine test function matrices of all the cells.
+    """
+    getters = ["get_shape_function_val", "get_shape_function_grad_x", "get_shape_function_grad_y"]
+    dense_matrices = [
+        np.stack([getattr(fespace, getter)(i) for i in range(fespace.n_cells)], axis=0)
+        for getter in getters
+    ]
+
+    affine = fespace.get_affine_test_functions()
+    affine_matrices = [
+        get_affine_test_matrix(affine.get_shape_function_val_factors(), dtype),
+        get_affine_test_matrix(affine.get_shape_function_grad_x_factors(), dtype),
+        get_affine_test_matrix(affine.get_shape_function_grad_y_factors(), dtype),
+    ]
+
+    return dense_matrices, affine_matrices
+
+
+@pytest.mark.parametrize("fe_type", ["legendre", "legendre_special", "chebyshev_2", "jacobi_plain"])
+@pytest.mark.parametrize("transformation", ["affine", "bilinear"])
+@pytest.mark.parametrize("assembly_mode", ["cell", "vectorized"])
+def test_affine_matches_dense(fe_type, transformation, assembly_mode):
+    """
+    Test case to validate that the affine matrices are the same as the dense matrices,
+    both as dense tensors and through `tf.linalg.matvec`.
+    """
+    fespace = get_fespace(
+        get_cells(extra_cells=AFFINE_CELLS),
+        assembly_mode=assembly_mode,
+        fe_type=fe_type,
+        fe_transformation_type=transformation,
+    )
+    dense_matrices, affine_matrices = get_matrices(fespace)
+
+    assert fespace.get_affine_test_functions().is_affine
+
+    vector = tf.constant(
+        np.random.default_rng(0).standard_normal((fespace.n_cells, 25)), dtype=tf.float64
+    )
+
+    for dense, affine in zip(dense_matrices, affine_matrices):
+        assert isinstance(affine, AffineTestMatrix)
+        assert tuple(affine.shape) == dense.shape
+        assert affine.dtype == tf.float64
+        assert np.allclose(affine.to_dense().numpy(), dense, rtol=1e-12, atol=1e-14)
+
+        expected = tf.linalg.matvec(tf.constant(dense), vector).numpy()
+        actual = tf.linalg.matvec(affine, vector).numpy()
+        assert np.allclose(actual, expected, rtol=1e-12, atol=1e-13)
+
+
+def test_affine_loss():
+    """
+    Test case to validate that the loss function of the convection-diffusion problem is the same
+    for the dense and the affine matrices.
+    """
+    fespace = get_fespace(get_cells(extra_cells=AFFINE_CELLS), assembly_mode="vectorized")
+    dense_matrices, affine_matrices = get_matrices(fespace)
+
+    forcing = tf.constant(fespace.get_forcing_function_values_all_cells()[:, :, 0].T)
+    rng = np.random.default_rng(1)
+    pred, pred_x, pred_y = [
+        tf.constant(rng.standard_normal((fespace.n_cells, 25))) for _ in range(3)
+    ]
+    bilinear_params = {"eps": 0.5, "b_x": 1.0, "b_y": -0.5, "c": 0.1}
+
+    loss_dense = pde_loss_cd2d(
+        *[tf.constant(m) for m in dense_matrices], pred, pred_x, pred_y, forcing, bilinear_params
+    )
+    loss_affine = pde_loss_cd2d(*affine_matrices, pred, pred_x, pred_y, forcing, bilinear_params)
+
+    assert np.allclose(loss_dense.numpy(), loss_affine.numpy(), rtol=1e-12)
+
+
+def test_non_affine_mesh():
+    """
+    Test case to validate that a mesh with a non-parallelogram cell is not affine for the bilinear
+    transformation. It should raise a ValueError, when the affine matrices are requested.
+    """
+    fespace = get_fespace(
+        get_cells(extra_cells=AFFINE_CELLS + ("distorted",)), assembly_mode="vectorized"
+    )
+    affine = fespace.get_affine_test_functions()
+
+    assert not affine.is_affine
+    with pytest.raises(ValueError):
+        affine.get_shape_function_grad_x_factors()
+
+    # the affine transformation uses a constant Jacobian for all the cells
+    fespace = get_fespace(
+        get_cells(extra_cells=AFFINE_CELLS + ("distorted",)),
+        assembly_mode="vectorized",
+        fe_transformation_type="affine",
+    )
+    assert fespace.get_affine_test_functions().is_affine
+
+
+def test_affine_perturbed_rectangle():
+    """
+    Test case to validate that a rectangle, whose coordinates are perturbed at the level of rounding
+    errors (e.g. read from a mesh file), is affine, although the off-diagonal entries of its inverse
+    Jacobian are not exactly zero.
+    """
+    cells = np.array([[[0.0, 0.0], [0.1, 0.0], [0.1 * (1 + 1e-15), 0.1], [0.0, 0.1]]])
+    fespace = get_fespace(cells, assembly_mode="vectorized")
+
+    assert fespace.get_affine_test_functions().is_affine
+
+
+def test_affine_transpose_not_supported():
+    """
+    Test case to validate the behavior when a transposed product is requested.
+    It should raise a ValueError.
+    """
+    fespace = get_fespace(
+        get_cells(extra_cells=AFFINE_CELLS),
+        assembly_mode="vectorized",
+        fe_transformation_type="affine",
+    )
+    shape_val_mat = get_matrices(fespace)[1][0]
+    with pytest.raises(ValueError):
+        tf.linalg.matvec(shape_val_mat, tf.ones((fespace.n_cells, 25), dtype=tf.float64), True)
@@ -0,0 +1,241 @@
+# Added test cases for validating the vectorized assembly of the FE values.
+# The values are compared against the per-cell (FE2D_Cell) assembly for different FE types and transformations.
+
+import pytest
+import numpy as np
+import tensorflow as tf
+
+from fastvpinns.FE.fe2d_assembly import FE2DAssembly
+from fastvpinns.data.datahandler2d import DataHandler2D
+
+from fespace2d_factory import get_cells, get_fespace
+
+
+@pytest.mark.parametrize("fe_type", ["legendre", "legendre_special", "chebyshev_2", "jacobi_plain"])
+@pytest.mark.parametrize("transformation", ["affine", "bilinear"])
+def test_vectorized_assembly_matches_cell_assembly(fe_type, transformation):
+    """
+    Test case to validate that the vectorized assembly returns the same values as the per-cell assembly.
+    """
+    fespace_cell = get_fespace(
+        assembly_mode="cell", fe_type=fe_type, fe_transformation_type=transformation
+    )
+    fespace_vec = get_fespace(
+        assembly_mode="vectorized", fe_type=fe_type, fe_transformation_type=transformation
+    )
+
+    assert fespace_vec.fe_cell == []
+    assert isinstance(fespace_vec.fe_assembly, FE2DAssembly)
+    assert fespace_vec.total_dofs == fespace_cell.total_dofs
+
+    getters = [
+        "get_shape_function_val",
+        "get_shape_function_grad_x",
+        "get_shape_function_grad_y",
+        "get_shape_function_grad_x_ref",
+        "get_shape_function_grad_y_ref",
+        "get_quadrature_actual_coordinates",
+        "get_quadrature_weights",
+        "get_forcing_function_values",
+    ]
+
+    for cell_index in range(fespace_cell.n_cells):
+        for getter in getters:
+            value_cell = getattr(fespace_cell, getter)(cell_index)
+            value_vec = getattr(fespace_vec, getter)(cell_index)
+            assert value_cell.shape == value_vec.shape
+            assert np.allclose(value_cell, value_vec, rtol=1e-12, atol=1e-14)
+
+        assert np.allclose(
+            fespace_cell.fe_cell[cell_index].jacobian.flatten(),
+            fespace_vec.fe_assembly.jacobian[cell_index].flatten(),
+        )
+
+        for attribute in ["basis_gradxx_at_quad", "basis_gradxy_at_quad", "basis_gradyy_at_quad"]:
+            value_cell = getattr(fespace_cell.fe_cell[cell_index], attribute)
+            value_vec = getattr(fespace_vec.fe_assembly, attribute)[cell_index]
+            assert np.allclose(value_cell, value_vec, rtol=1e-12, atol=1e-14)
+
+    # forcing function of all the cells at once
+    forcing = fespace_vec.fe_assembly.get_forcing_function_values()
+    assert forcing.shape == (fespace_cell.n_cells, 16, 1)
+    for cell_index in range(fespace_cell.n_cells):
+        assert np.allclose(
+            forcing[cell_index], fespace_cell.get_forcing_function_values(cell_index), atol=1e-14
+        )
+
+
+@pytest.mark.parametrize("test_matrix_format", ["tensor_product", "affine"])
+def test_compact_formats_without_dense_values(test_matrix_format):
+    """
+    Test case to validate that the dense basis function values of all the cells are not assembled
+    for the compact test matrix formats, and that the forcing terms are the same as with the dense values.
+    """
+    fespace = get_fespace(get_cells(extra_cells=()), assembly_mode="vectorized")
+    fespace_dense = get_fespace(get_cells(extra_cells=()), assembly_mode="vectorized")
+
+    datahandler = DataHandler2D(
+        fespace, None, dtype=tf.float64, test_matrix_format=test_matrix_format
+    )
+    datahandler_dense = DataHandler2D(fespace_dense, None, dtype=tf.float64)
+
+    attributes = ["basis_at_quad", "basis_gradx_at_quad", "basis_grady_at_quad"]
+    for attribute in attributes:
+        assert getattr(fespace.fe_assembly, "_" + attribute) is None
+
+    assert np.array_equal(
+        datahandler.forcing_function_list.numpy(), datahandler_dense.forcing_function_list.numpy()
+    )
+
+    # the forcing term of a single cell is computed from the reference values
+    assert np.allclose(
+        fespace.get_forcing_function_values(1), fespace_dense.get_forcing_function_values(1)
+    )
+    assert fespace.fe_assembly._basis_at_quad is None
+
+    # the dense values are computed on their first access
+    for attribute in attributes:
+        assert np.array_equal(
+            getattr(fespace.fe_assembly, attribute), getattr(fespace_dense.fe_assembly, attribute)
+        )
+
+
+@pytest.mark.parametrize("assembly_mode", ["cell", "vectorized"])
+def test_lazy_second_derivatives(assembly_mode):
+    """
+    Test case to validate that the second derivatives are computed only on request, and that the
+    lazily computed values are the same as the ones computed during the setup.
+    """
+    fespace_lazy = get_fespace(assembly_mode=assembly_mode)
+    fespace_eager = get_fespace(assembly_mode=assembly_mode, compute_hessian=True)
+
+    if assembly_mode == "cell":
+        fe_lazy, fe_eager = fespace_lazy.fe_cell[-1], fespace_eager.fe_cell[-1]
+    else:
+        fe_lazy, fe_eager = fespace_lazy.fe_assembly, fespace_eager.fe_assembly
+
+    attributes = ["basis_gradxx_at_quad", "basis_gradxy_at_quad", "basis_gradyy_at_quad"]
+    for attribute in attributes:
+        assert getattr(fe_lazy, "_" + attribute) is None
+        assert getattr(fe_eager, "_" + attribute) is not None
+
+    for attribute in attributes:
+        assert np.array_equal(getattr(fe_lazy, attribute), getattr(fe_eager, attribute))
+
+    fe_lazy.free_basis_second_derivatives()
+    assert fe_lazy._basis_gradxx_at_quad is None
+    assert np.array_equal(fe_lazy.basis_gradyy_at_quad, fe_eager.basis_gradyy_at_quad)
+
+
+def test_vectorized_assembly_forcing_vector():
+    """
+    Test case to validate the forcing term of a vector valued problem in the vectorized assembly.
+    """
+    fespace = get_fespace(assembly_mode="vectorized")
+    fespace.forcing_function = lambda x, y: (x + y, x * y)
+
+    forcing = fespace.fe_assembly.get_forcing_function_values_vector(1)
+    for cell_index in range(fespace.n_cells):
+        x = fespace.get_quadrature_actual_coordinates(cell_index)
+        expected = np.sum(
+            fespace.get_shape_function_val(cell_index) * x[:, 0] * x[:, 1], axis=1
+        ).reshape(-1, 1)
+        assert np.allclose(forcing[cell_index], expected)
+        assert np.allclose(fespace.get_forcing_function_values_vector(cell_index, 1), expected)
+
+
+def test_invalid_assembly_mode():
+    """
+    Test case to validate the behavior when an invalid assembly mode is provided.
+    It should raise a ValueError.
+    """
+    with pytest.raises(ValueError):
+        get_fespace(assembly_mode="invalid_mode")
+
+
+@pytest.mark.parametrize("cell_index", [-1, 8])
+def test_invalid_cell_index_vectorized(cell_index):
+    """
+    Test case to validate the behavior when an invalid cell index is provided in the vectorized assembly mode.
+    It should raise a ValueError.
+    """
+    fespace = get_fespace(assembly_mode="vectorized")
+    with pytest.raises(ValueError):
+        fespace.get_shape_function_val(cell_index)
+
+
+def test_invalid_cell_coordinates_shape():
+    """
+    Test case to validate the behavior when the cell coordinates are not of shape (n_cells, 4, 2).
+    It should raise a ValueError.
+    """
+    with pytest.raises(ValueError):
+        FE2DAssembly(
+            np.zeros((3, 3, 2)),
+            "quadrilateral",
+            3,
+            "legendre",
+            4,
+            "gauss-jacobi",
+            "bilinear",
+            lambda x, y: x,
+        )
+
+
+@pytest.mark.parametrize("assembly_mode", ["cell", "vectorized"])
+def test_forcing_function_values_all_cells(assembly_mode):
+    """
+    Test case to validate the forcing term of all the cells at once, for an array-safe forcing function
+    and for a forcing function which can only be evaluated pointwise.
+    """
+    fespace = get_fespace(
+        assembly_mode=assembly_mode,
+        forcing_function=lambda x, y: np.sin(np.pi * x) * np.cos(np.pi * y) + x * y,
+    )
+
+    forcing = fespace.get_forcing_function_values_all_cells()
+    assert forcing.shape == (fespace.n_cells, 16, 1)
+
+    for cell_index in range(fespace.n_cells):
+        x = fespace.get_quadrature_actual_coordinates(cell_index)
+        f_values = np.sin(np.pi * x[:, 0]) * np.cos(np.pi * x[:, 1]) + x[:, 0] * x[:, 1]
+        expected = np.sum(fespace.get_shape_function_val(cell_index) * f_values, axis=1)
+        assert np.allclose(forcing[cell_index, :, 0], expected)
+        assert np.allclose(fespace.get_forcing_function_values(cell_index)[:, 0], expected)
+
+    # forcing function which is not array-safe
+    fespace.forcing_function = lambda x, y: float(x) * float(y) if x > 0.5 else 1.0
+    forcing = fespace.get_forcing_function_values_all_cells()
+    for cell_index in range(fespace.n_cells):
+        x = fespace.get_quadrature_actual_coordinates(cell_index)
+        f_values = np.array([fespace.forcing_function(a, b) for a, b in x])
+        expected = np.sum(fespace.get_shape_function_val(cell_index) * f_values, axis=1)
+        assert np.allclose(forcing[cell_index, :, 0], expected)
+        assert np.allclose(fespace.get_forcing_function_values(cell_index)[:, 0], expected)
+
+
+@pytest.mark.parametrize("dtype", [tf.float32, tf.float64])
+def test_stacked_fe_values_to_tensors(dtype):
+    """
+    Test case to validate that the stacked FE values of both assembly modes are converted into the
+    same tensors, and that the arrays of the vectorized assembly are returned without a copy.
+    """
+    fespace_cell = get_fespace(assembly_mode="cell")
+    fespace_vec = get_fespace(assembly_mode="vectorized")
+
+    for name in ["basis_at_quad", "basis_gradx_at_quad", "basis_grady_at_quad"]:
+        assert fespace_vec.get_stacked_fe_values(name) is getattr(fespace_vec.fe_assembly, name)
+        assert np.array_equal(
+            fespace_cell.get_stacked_fe_values(name), fespace_vec.get_stacked_fe_values(name)
+        )
+
+    datahandler_cell = DataHandler2D(fespace_cell, None, dtype=dtype)
+    datahandler_vec = DataHandler2D(fespace_vec, None, dtype=dtype)
+    for name in ["shape_val_mat_list", "grad_x_mat_list", "x_pde_list", "forcing_function_list"]:
+        assert getattr(datahandler_cell, name).dtype == dtype
+        assert np.array_equal(
+            getattr(datahandler_cell, name).numpy(), getattr(datahandler_vec, name).numpy()
+        )
+
+    with pytest.raises(ValueError):
+        fespace_cell.get_stacked_fe_values("jacobian")
@@ -0,0 +1,85 @@
+# Added test cases for validating the parallel assembly of the FE values on a pool of processes.
+# The values are compared against the vectorized assembly in a single process.
+
+import gc
+
+import pytest
+import numpy as np
+
+from fastvpinns.FE.fe2d_tensor_cache import CACHED_ARRAYS
+from fastvpinns.FE.fe2d_parallel_assembly import assemble_parallel, SharedMemoryArray
+
+from fespace2d_factory import get_cells, get_fespace
+
+
+@pytest.mark.parametrize("n_workers", [1, 3])
+def test_parallel_assembly_matches_vectorized(n_workers):
+    """
+    Test case to validate that the parallel assembly returns the same values as the vectorized assembly.
+    """
+    fespace_vec = get_fespace(get_cells(4, 3), assembly_mode="vectorized")
+    fespace_par = get_fespace(get_cells(4, 3), assembly_mode="parallel", n_workers=n_workers)
+
+    for name in CACHED_ARRAYS + ["mult"]:
+        assert np.array_equal(
+            getattr(fespace_par.fe_assembly, name), getattr(fespace_vec.fe_assembly, name)
+        )
+
+    assert np.array_equal(
+        fespace_par.get_forcing_function_values_all_cells(),
+        fespace_vec.get_forcing_function_values_all_cells(),
+    )
+    assert fespace_par.total_dofs == fespace_vec.total_dofs
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 100])
+def test_assemble_parallel_chunks(chunk_size):
+    """
+    Test case to validate the parallel assembly for different chunk sizes.
+    """
+    config = ["quadrilateral", 3, "jacobi_plain", 4, "gauss-legendre", "affine"]
+    serial = assemble_parallel(get_cells(4, 3), *config, n_workers=1)
+    parallel = assemble_parallel(get_cells(4, 3), *config, n_workers=2, chunk_size=chunk_size)
+
+    for name in CACHED_ARRAYS:
+        assert parallel[name].shape == serial[name].shape
+        assert np.array_equal(parallel[name], serial[name])
+
+
+def test_parallel_values_in_shared_memory():
+    """
+    Test case to validate that the values of the parallel assembly are not copied out of the shared
+    memory, and remain valid as long as any view of the arrays exists.
+    """
+    config = ["quadrilateral", 3, "legendre", 4, "gauss-jacobi", "bilinear"]
+    serial = assemble_parallel(get_cells(4, 3), *config, n_workers=1)
+    parallel = assemble_parallel(get_cells(4, 3), *config, n_workers=2)
+
+    for name in CACHED_ARRAYS:
+        assert isinstance(parallel[name].base, SharedMemoryArray)
+
+    basis_view = parallel["basis_at_quad"][2:]
+    del parallel
+    gc.collect()
+
+    assert np.array_equal(basis_view, serial["basis_at_quad"][2:])
+
+
+@pytest.mark.parametrize("n_workers, chunk_size", [(0, None), (2, 0)])
+def test_invalid_parallel_options(n_workers, chunk_size):
+    """
+    Test case to validate the behavior when an invalid number of workers or chunk size is provided.
+    It should raise a ValueError.
+    """
+    with pytest.raises(ValueError):
+        assemble_parallel(
+            get_cells(4, 3),
+            "quadrilateral",
+            3,
+            "legendre",
+            4,
+            "gauss-jacobi",
+            "bilinear",
+            n_workers=n_workers,
+            chunk_size=chunk_size,
+        )
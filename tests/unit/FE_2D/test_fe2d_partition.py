@@ -0,0 +1,114 @@
+# Added test cases for validating the partition of the cells into subdomains with recursive
+# coordinate bisection, and the interfaces between the subdomains.
+
+import pytest
+import numpy as np
+
+from fastvpinns.FE.fe2d_partition import MeshPartition2D, partition_cells_rcb
+
+
+def get_cells(n_x=6, n_y=4):
+    """
+    Returns a structured mesh of the rectangle [0, 3] x [0, 1].
+    """
+    x = np.linspace(0, 3, n_x + 1)
+    y = np.linspace(0, 1, n_y + 1)
+    cells = []
+    for i in range(n_x):
+        for j in range(n_y):
+            cells.append([[x[i], y[j]], [x[i + 1], y[j]], [x[i + 1], y[j + 1]], [x[i], y[j + 1]]])
+
+    return np.array(cells, dtype=np.float64)
+
+
+@pytest.mark.parametrize("n_parts", [1, 2, 3, 5, 8, 24])
+def test_rcb_partition_is_balanced(n_parts):
+    """
+    Test case to validate that every cell belongs to one subdomain, and the sizes of the subdomains
+    differ by at most one cell.
+    """
+    cells = get_cells()
+    partition = MeshPartition2D(cells, n_parts)
+
+    sizes = partition.get_part_sizes()
+    assert sizes.shape == (n_parts,)
+    assert np.sum(sizes) == cells.shape[0]
+    assert np.max(sizes) - np.min(sizes) <= 1
+
+    all_cells = np.sort(np.concatenate(partition.part_cells))
+    assert np.array_equal(all_cells, np.arange(cells.shape[0]))
+    for part, part_cells in enumerate(partition.part_cells):
+        assert np.all(partition.cell_parts[part_cells] == part)
+        assert np.array_equal(
+            partition.cell_local_index[part_cells], np.arange(part_cells.shape[0])
+        )
+
+
+def test_rcb_bisects_longest_extent():
+    """
+    Test case to validate that the first bisection is along the longest extent of the mesh.
+    """
+    cells = get_cells()
+    cell_parts = partition_cells_rcb(np.mean(cells, axis=1), 2)
+
+    centers_x = np.mean(cells, axis=1)[:, 0]
+    assert np.all(centers_x[cell_parts == 0] < 1.5)
+    assert np.all(centers_x[cell_parts == 1] > 1.5)
+
+
+def test_partition_interfaces():
+    """
+    Test case to validate the shared edges of the mesh and the interfaces between the subdomains.
+    """
+    cells = get_cells()
+    partition = MeshPartition2D(cells, 2)
+
+    # structured mesh of 6 x 4 cells
+    assert partition.shared_edges.shape == (5 * 4 + 6 * 3, 4)
+    assert partition.interface_edges.shape == (4, 4)
+
+    for part, neighbour in [(0, 1), (1, 0)]:
+        interface = partition.get_interface(part)
+        assert np.array_equal(partition.get_neighbour_parts(part), [neighbour])
+        assert np.all(partition.cell_parts[interface["global_cells"]] == part)
+        assert np.array_equal(
+            partition.part_cells[part][interface["cells"]], interface["global_cells"]
+        )
+
+        # the interface is the line x = 1.5
+        assert interface["edge_coordinates"].shape == (4, 2, 2)
+        assert np.allclose(interface["edge_coordinates"][:, :, 0], 1.5)
+
+        # the edge seen from the neighbouring cell has the same end points
+        neighbour_coordinates = np.stack(
+            [
+                cells[interface["neighbour_cells"], interface["neighbour_edges"]],
+                cells[interface["neighbour_cells"], (interface["neighbour_edges"] + 1) % 4],
+            ],
+            axis=1,
+        )
+        assert np.allclose(neighbour_coordinates[:, ::-1], interface["edge_coordinates"])
+
+    # a single subdomain has no interface
+    assert MeshPartition2D(cells, 1).interface_edges.shape == (0, 4)
+
+
+@pytest.mark.parametrize(
+    "cells, n_parts, method",
+    [
+        (get_cells(), 0, "rcb"),
+        (get_cells(), 25, "rcb"),
+        (get_cells(), 2, "metis"),
+        (np.zeros((4, 3, 2)), 2, "rcb"),
+    ],
+)
+def test_invalid_partition_options(cells, n_parts, method):
+    """
+    Test case to validate the behavior when invalid cells, number of subdomains or method are provided.
+    It should raise a ValueError.
+    """
+    with pytest.raises(ValueError):
+        MeshPartition2D(cells, n_parts, method)
+
+    with pytest.raises(ValueError):
+        MeshPartition2D(get_cells(), 2).get_interface(2)
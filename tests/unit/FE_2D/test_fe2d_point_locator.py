@@ -0,0 +1,108 @@
+# Added test cases for validating the point location index of the quadrilateral cells.
+# The located cells and reference coordinates are compared against the forward bilinear map.
+
+import pytest
+import numpy as np
+
+from fastvpinns.FE.fe2d_point_locator import PointLocator2D
+from fastvpinns.FE.quad_bilinear import QuadBilinear
+
+
+def get_distorted_cells(n=12, seed=0):
+    """
+    Returns a structured mesh of the unit square, whose interior nodes are randomly perturbed.
+    """
+    x, y = np.meshgrid(np.linspace(0, 1, n + 1), np.linspace(0, 1, n + 1), indexing="ij")
+    rng = np.random.default_rng(seed)
+    x[1:-1, 1:-1] += rng.uniform(-0.25, 0.25, (n - 1, n - 1)) / n
+    y[1:-1, 1:-1] += rng.uniform(-0.25, 0.25, (n - 1, n - 1)) / n
+    nodes = np.stack([x, y], axis=-1)
+
+    cells = np.stack([nodes[:-1, :-1], nodes[1:, :-1], nodes[1:, 1:], nodes[:-1, 1:]], axis=2)
+    return cells.reshape(-1, 4, 2)
+
+
+def map_to_cells(cells, cell_ids, xi, eta):
+    """
+    Returns the actual coordinates of the given reference coordinates within the given cells.
+    """
+    c = [
+        coefficient[:, 0][cell_ids]
+        for coefficient in QuadBilinear.get_cell_coefficients_batch(cells)
+    ]
+    x = c[0] + c[1] * xi + c[2] * eta + c[3] * xi * eta
+    y = c[4] + c[5] * xi + c[6] * eta + c[7] * xi * eta
+    return np.column_stack([x, y])
+
+
+@pytest.mark.parametrize("chunk_size", [37, 16384])
+@pytest.mark.parametrize("n_buckets", [None, 1, 7, 1000])
+def test_locate_points_in_distorted_mesh(n_buckets, chunk_size):
+    """
+    Test case to validate the cells and the reference coordinates of points with known cells.
+    """
+    cells = get_distorted_cells()
+    rng = np.random.default_rng(1)
+    cell_ids = rng.integers(0, cells.shape[0], 500)
+    xi = rng.uniform(-0.99, 0.99, 500)
+    eta = rng.uniform(-0.99, 0.99, 500)
+    points = map_to_cells(cells, cell_ids, xi, eta)
+
+    located, xi_located, eta_located = PointLocator2D(
+        cells, n_buckets=n_buckets, chunk_size=chunk_size
+    ).locate(points)
+
+    assert np.array_equal(located, cell_ids)
+    assert np.allclose(xi_located, xi, atol=1e-10)
+    assert np.allclose(eta_located, eta, atol=1e-10)
+
+
+def test_locate_points_on_boundaries():
+    """
+    Test case to validate that the nodes and the edges of the cells are located, with reference
+    coordinates which map back to the points.
+    """
+    cells = get_distorted_cells(n=5)
+    points = np.concatenate([cells.reshape(-1, 2), cells.mean(axis=1)])
+
+    located, xi, eta = PointLocator2D(cells).locate(points)
+
+    assert np.all(located >= 0)
+    assert np.all(np.abs(xi) <= 1 + 1e-8) and np.all(np.abs(eta) <= 1 + 1e-8)
+    assert np.allclose(map_to_cells(cells, located, xi, eta), points, atol=1e-12)
+
+
+def test_locate_points_outside_mesh():
+    """
+    Test case to validate that the points outside the mesh are not located.
+    """
+    # L-shaped mesh with a missing cell in the upper right corner
+    cells = np.array(
+        [
+            [[0, 0], [1, 0], [1, 1], [0, 1]],
+            [[1, 0], [2, 0], [2, 1], [1, 1]],
+            [[0, 1], [1, 1], [1, 2], [0, 2]],
+        ],
+        dtype=np.float64,
+    )
+    points = np.array([[1.5, 1.5], [-0.1, 0.5], [3.0, 3.0], [0.5, 1.5], [1.5, 0.5]])
+
+    locator = PointLocator2D(cells)
+    located, xi, eta = locator.locate(points)
+
+    assert np.array_equal(located, [-1, -1, -1, 2, 1])
+    assert np.all(np.isnan(xi[:3])) and np.all(np.isnan(eta[:3]))
+    assert np.allclose(xi[3:], 0.0) and np.allclose(eta[3:], 0.0)
+
+    # empty queries
+    located, xi, eta = locator.locate(np.zeros((0, 2)))
+    assert located.shape == xi.shape == eta.shape == (0,)
+
+
+def test_invalid_cell_coordinates():
+    """
+    Test case to validate the behavior when the cell coordinates are not of shape (n_cells, 4, 2).
+    It should raise a ValueError.
+    """
+    with pytest.raises(ValueError):
+        PointLocator2D(np.zeros((3, 3, 2)))
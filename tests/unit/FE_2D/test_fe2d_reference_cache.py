@@ -0,0 +1,120 @@
+# Added test cases for validating the process-wide cache of the reference element data.
+
+import pytest
+import numpy as np
+
+from fastvpinns.FE.FE2D_Cell import FE2D_Cell
+from fastvpinns.FE.fe2d_reference_cache import (
+    get_reference_element_data,
+    set_reference_cache_size,
+    get_reference_cache_size,
+    clear_reference_cache,
+)
+from fastvpinns.FE.fe2d_setup_main import FE2DSetupMain
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    """Clears the cache and restores its default size after every test."""
+    clear_reference_cache()
+    yield
+    set_reference_cache_size(32)
+    clear_reference_cache()
+
+
+@pytest.mark.parametrize("fe_type", ["legendre", "legendre_special", "chebyshev_2", "jacobi_plain"])
+@pytest.mark.parametrize("quad_type", ["gauss-legendre", "gauss-jacobi"])
+def test_reference_data_values(fe_type, quad_type):
+    """
+    Test case to validate that the cached reference values are the same as the ones computed
+    directly from the basis function and the quadrature rule.
+    """
+    data = get_reference_element_data("quadrilateral", 4, fe_type, 5, quad_type)
+
+    fe_setup = FE2DSetupMain("quadrilateral", 4, fe_type, 5, quad_type)
+    basis_function = fe_setup.assign_basis_function()
+    weights, xi, eta = fe_setup.assign_quadrature_rules()
+
+    assert np.array_equal(data.quad_weight, weights)
+    assert np.array_equal(data.quad_xi, xi)
+    assert np.array_equal(data.quad_eta, eta)
+    assert np.array_equal(data.basis_at_quad, basis_function.value(xi, eta))
+    assert np.array_equal(data.basis_gradx_at_quad, basis_function.gradx(xi, eta))
+    assert np.array_equal(data.basis_grady_at_quad, basis_function.grady(xi, eta))
+    assert np.array_equal(data.basis_gradxx_at_quad, basis_function.gradxx(xi, eta))
+    assert np.array_equal(data.basis_gradxy_at_quad, basis_function.gradxy(xi, eta))
+    assert np.array_equal(data.basis_gradyy_at_quad, basis_function.gradyy(xi, eta))
+
+
+def test_reference_data_is_shared_and_read_only():
+    """
+    Test case to validate that the same reference data is returned for the same configuration,
+    and that the shared arrays cannot be modified in place.
+    """
+    data_1 = get_reference_element_data("quadrilateral", 3, "legendre", 4, "gauss-jacobi")
+    data_2 = get_reference_element_data("quadrilateral", 3, "legendre", 4, "gauss-jacobi")
+    data_3 = get_reference_element_data("quadrilateral", 3, "legendre", 5, "gauss-jacobi")
+
+    assert data_1 is data_2
+    assert data_1 is not data_3
+    assert get_reference_cache_size() == 2
+
+    with pytest.raises(ValueError):
+        data_1.basis_at_quad[0, 0] = 1.0
+
+
+def test_reference_cache_eviction():
+    """
+    Test case to validate that the least recently used entry is evicted once the cache is full.
+    """
+    set_reference_cache_size(2)
+
+    data_3 = get_reference_element_data("quadrilateral", 3, "legendre", 3, "gauss-jacobi")
+    data_4 = get_reference_element_data("quadrilateral", 3, "legendre", 4, "gauss-jacobi")
+
+    # access order 4, 3 -> 3 is the most recently used entry
+    get_reference_element_data("quadrilateral", 3, "legendre", 3, "gauss-jacobi")
+    get_reference_element_data("quadrilateral", 3, "legendre", 5, "gauss-jacobi")
+
+    assert get_reference_cache_size() == 2
+    assert get_reference_element_data("quadrilateral", 3, "legendre", 3, "gauss-jacobi") is data_3
+    assert (
+        get_reference_element_data("quadrilateral", 3, "legendre", 4, "gauss-jacobi") is not data_4
+    )
+
+
+@pytest.mark.parametrize("max_size", [0, -1])
+def test_invalid_reference_cache_size(max_size):
+    """
+    Test case to validate the behavior when an invalid cache size is provided.
+    It should raise a ValueError.
+    """
+    with pytest.raises(ValueError):
+        set_reference_cache_size(max_size)
+
+
+def test_invalid_configuration_is_not_cached():
+    """
+    Test case to validate that an invalid configuration raises a ValueError and is not cached.
+    """
+    with pytest.raises(ValueError):
+        get_reference_element_data("quadrilateral", 3, "invalid_fe_type", 4, "gauss-jacobi")
+
+    assert get_reference_cache_size() == 0
+
+
+def test_fe2d_cells_share_reference_data():
+    """
+    Test case to validate that all the cells with the same configuration share the reference data.
+    """
+    cell_1 = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float64)
+    cell_2 = np.array([[1, 0], [2, 0], [2, 1.5], [1, 1]], dtype=np.float64)
+
+    fe_cells = [
+        FE2D_Cell(cell, "quadrilateral", 3, "legendre", 4, "gauss-jacobi", "bilinear", None)
+        for cell in [cell_1, cell_2]
+    ]
+
+    assert fe_cells[0].reference_data is fe_cells[1].reference_data
+    assert fe_cells[0].basis_function is fe_cells[1].basis_function
+    assert get_reference_cache_size() == 1
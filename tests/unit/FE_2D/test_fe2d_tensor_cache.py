@@ -0,0 +1,134 @@
+# Added test cases for validating the persistent on-disk cache of the assembled FE values.
+
+import pytest
+import numpy as np
+
+from fastvpinns.FE.fe2d_tensor_cache import FETensorCache, CACHED_ARRAYS
+
+from fespace2d_factory import get_cells, get_fespace
+
+
+def test_cache_hit_returns_same_values(tmp_path):
+    """
+    Test case to validate that the values loaded from the cache are the same as the assembled values.
+    """
+    fespace_miss = get_fespace(assembly_mode="vectorized", cache_dir=str(tmp_path))
+    assert len(fespace_miss.fe_cache.get_entries()) == 1
+
+    fespace_hit = get_fespace(assembly_mode="vectorized", cache_dir=str(tmp_path))
+    for name in CACHED_ARRAYS:
+        value = getattr(fespace_hit.fe_assembly, name)
+        assert isinstance(value, np.memmap)
+        assert np.array_equal(value, getattr(fespace_miss.fe_assembly, name))
+
+    assert np.array_equal(fespace_hit.fe_assembly.mult, fespace_miss.fe_assembly.mult)
+    assert np.allclose(
+        fespace_hit.get_forcing_function_values_all_cells(),
+        fespace_miss.get_forcing_function_values_all_cells(),
+    )
+    for cell_index in range(fespace_hit.n_cells):
+        assert np.array_equal(
+            fespace_hit.get_shape_function_grad_x(cell_index),
+            fespace_miss.get_shape_function_grad_x(cell_index),
+        )
+
+
+def test_cache_key_invalidation():
+    """
+    Test case to validate that the key changes with the mesh and the FE configuration.
+    """
+    cells = get_cells()
+    boundary_points = {1000: cells[:, 0, :]}
+    config = ["quadrilateral", 4, "legendre", 5, "gauss-jacobi", "bilinear"]
+    key = FETensorCache.get_cache_key(cells, boundary_points, *config)
+
+    assert key == FETensorCache.get_cache_key(cells.copy(), boundary_points, *config)
+    assert key != FETensorCache.get_cache_key(get_cells(shift=1e-9), boundary_points, *config)
+    assert key != FETensorCache.get_cache_key(cells, {1000: cells[:, 1, :]}, *config)
+    assert key != FETensorCache.get_cache_key(
+        cells, boundary_points, "quadrilateral", 3, "legendre", 5, "gauss-jacobi", "bilinear"
+    )
+    assert key != FETensorCache.get_cache_key(
+        cells, boundary_points, "quadrilateral", 4, "legendre", 5, "gauss-jacobi", "affine"
+    )
+
+
+def test_invalid_entry_is_recomputed(tmp_path):
+    """
+    Test case to validate that a corrupted cache entry is removed and recomputed.
+    """
+    fespace = get_fespace(assembly_mode="vectorized", cache_dir=str(tmp_path))
+    entry = fespace.fe_cache.get_entries()[0]
+    (entry / "basis_at_quad.npy").write_bytes(b"corrupted")
+
+    fespace_recomputed = get_fespace(assembly_mode="vectorized", cache_dir=str(tmp_path))
+    assert not isinstance(fespace_recomputed.fe_assembly.basis_at_quad, np.memmap)
+    assert np.array_equal(
+        fespace_recomputed.fe_assembly.basis_at_quad, fespace.fe_assembly.basis_at_quad
+    )
+    assert isinstance(
+        get_fespace(assembly_mode="vectorized", cache_dir=str(tmp_path)).fe_assembly.basis_at_quad,
+        np.memmap,
+    )
+
+
+def test_cache_eviction(tmp_path):
+    """
+    Test case to validate that the least recently used entries are evicted once the cache is full.
+    """
+    fespace = get_fespace(assembly_mode="vectorized", cache_dir=str(tmp_path), fe_order=3)
+    entry_size = fespace.fe_cache.get_cache_size()
+    max_size_mb = 2.5 * entry_size / (1024 * 1024)
+
+    get_fespace(
+        get_cells(shift=1.0),
+        assembly_mode="vectorized",
+        cache_dir=str(tmp_path),
+        fe_order=3,
+        cache_max_size_mb=max_size_mb,
+    )
+    # access the first entry, so that the second entry is the least recently used
+    get_fespace(
+        assembly_mode="vectorized",
+        cache_dir=str(tmp_path),
+        fe_order=3,
+        cache_max_size_mb=max_size_mb,
+    )
+    fespace = get_fespace(
+        get_cells(shift=2.0),
+        assembly_mode="vectorized",
+        cache_dir=str(tmp_path),
+        fe_order=3,
+        cache_max_size_mb=max_size_mb,
+    )
+
+    entries = fespace.fe_cache.get_entries()
+    assert len(entries) == 2
+    assert fespace.fe_cache.get_cache_size() <= fespace.fe_cache.max_size_bytes
+
+    key_first = FETensorCache.get_cache_key(
+        get_cells(),
+        {1000: get_cells()[:, 0, :]},
+        "quadrilateral",
+        3,
+        "legendre",
+        5,
+        "gauss-jacobi",
+        "bilinear",
+    )
+    assert fespace.fe_cache.load(key_first) is not None
+
+    fespace.fe_cache.clear()
+    assert fespace.fe_cache.get_entries() == []
+
+
+def test_invalid_cache_options(tmp_path):
+    """
+    Test case to validate the behavior when the cache is used with the cell assembly mode
+    or with an invalid size. It should raise a ValueError.
+    """
+    with pytest.raises(ValueError):
+        get_fespace(assembly_mode="cell", cache_dir=str(tmp_path))
+
+    with pytest.raises(ValueError):
+        FETensorCache(str(tmp_path), max_size_mb=0)
@@ -0,0 +1,127 @@
+# Added test cases for validating the sum-factorized (tensor-product) representation of the test function matrices.
+# The values are compared against the dense matrices for different FE types and transformations.
+
+import pytest
+import numpy as np
+import tensorflow as tf
+
+from fastvpinns.FE.fe2d_tensor_product import FE2DTensorProduct
+from fastvpinns.data.tensor_product_matrix import (
+    TensorProductTestMatrix,
+    get_tensor_product_test_matrix,
+)
+from fastvpinns.physics.poisson2d import pde_loss_poisson
+
+from fespace2d_factory import get_cells, get_fespace
+
+
+def get_dense_matrices(fespace):
+    """
+    Returns the dense test function matrices of all the cells.
+    """
+    getters = ["get_shape_function_val", "get_shape_function_grad_x", "get_shape_function_grad_y"]
+    return [
+        np.stack([getattr(fespace, getter)(i) for i in range(fespace.n_cells)], axis=0)
+        for getter in getters
+    ]
+
+
+def get_tensor_product_matrices(fespace, dtype=tf.float64):
+    """
+    Returns the tensor-product test function matrices of all the cells.
+    """
+    tensor_product = fespace.get_tensor_product_test_functions()
+    return [
+        get_tensor_product_test_matrix(tensor_product.get_shape_function_val_factors(), dtype),
+        get_tensor_product_test_matrix(tensor_product.get_shape_function_grad_x_factors(), dtype),
+        get_tensor_product_test_matrix(tensor_product.get_shape_function_grad_y_factors(), dtype),
+    ]
+
+
+@pytest.mark.parametrize("fe_type", ["legendre", "legendre_special", "chebyshev_2", "jacobi_plain"])
+@pytest.mark.parametrize("transformation", ["affine", "bilinear"])
+@pytest.mark.parametrize("assembly_mode", ["cell", "vectorized"])
+def test_tensor_product_matches_dense(fe_type, transformation, assembly_mode):
+    """
+    Test case to validate that the tensor-product matrices are the same as the dense matrices,
+    both as dense tensors and through `tf.linalg.matvec`.
+    """
+    fespace = get_fespace(
+        assembly_mode=assembly_mode, fe_type=fe_type, fe_transformation_type=transformation
+    )
+    dense_matrices = get_dense_matrices(fespace)
+    tensor_product_matrices = get_tensor_product_matrices(fespace)
+
+    vector = tf.constant(
+        np.random.default_rng(0).standard_normal((fespace.n_cells, 25)), dtype=tf.float64
+    )
+
+    for dense, tensor_product in zip(dense_matrices, tensor_product_matrices):
+        assert isinstance(tensor_product, TensorProductTestMatrix)
+        assert tuple(tensor_product.shape) == dense.shape
+        assert tensor_product.dtype == tf.float64
+        assert np.allclose(tensor_product.to_dense().numpy(), dense, rtol=1e-12, atol=1e-14)
+
+        expected = tf.linalg.matvec(tf.constant(dense), vector).numpy()
+        actual = tf.linalg.matvec(tensor_product, vector).numpy()
+        assert np.allclose(actual, expected, rtol=1e-12, atol=1e-13)
+
+
+def test_tensor_product_loss_and_gradient():
+    """
+    Test case to validate that the loss function of the Poisson problem and its gradient are the same
+    for the dense and the tensor-product matrices.
+    """
+    fespace = get_fespace(assembly_mode="vectorized")
+    dense_matrices = [tf.constant(m) for m in get_dense_matrices(fespace)]
+    tensor_product_matrices = get_tensor_product_matrices(fespace)
+
+    forcing = tf.constant(fespace.get_forcing_function_values_all_cells()[:, :, 0].T)
+    rng = np.random.default_rng(1)
+    pred = tf.Variable(rng.standard_normal((fespace.n_cells, 25)))
+    pred_x = tf.constant(rng.standard_normal((fespace.n_cells, 25)))
+    pred_y = tf.constant(rng.standard_normal((fespace.n_cells, 25)))
+    bilinear_params = {"eps": tf.constant(0.5, dtype=tf.float64)}
+
+    def loss_and_gradient(matrices):
+        with tf.GradientTape() as tape:
+            loss = tf.reduce_sum(
+                pde_loss_poisson(
+                    *matrices, pred, pred_x * pred, pred_y * pred, forcing, bilinear_params
+                )
+            )
+        return loss.numpy(), tape.gradient(loss, pred).numpy()
+
+    loss_dense, grad_dense = loss_and_gradient(dense_matrices)
+    loss_tensor_product, grad_tensor_product = loss_and_gradient(tensor_product_matrices)
+
+    assert np.isclose(loss_dense, loss_tensor_product, rtol=1e-12)
+    assert np.allclose(grad_dense, grad_tensor_product, rtol=1e-10, atol=1e-13)
+
+
+def test_tensor_product_transpose_not_supported():
+    """
+    Test case to validate the behavior when a transposed product is requested.
+    It should raise a ValueError.
+    """
+    fespace = get_fespace(assembly_mode="vectorized", fe_transformation_type="affine")
+    shape_val_mat = get_tensor_product_matrices(fespace)[0]
+    with pytest.raises(ValueError):
+        tf.linalg.matvec(shape_val_mat, tf.ones((fespace.n_cells, 25), dtype=tf.float64), True)
+
+
+def test_tensor_product_not_tensor_grid():
+    """
+    Test case to validate the behavior when the quadrature points do not form a tensor grid.
+    It should raise a ValueError.
+    """
+    fespace = get_fespace(assembly_mode="vectorized")
+    tensor_product = fespace.get_tensor_product_test_functions()
+    tensor_product.quad_xi_1d = tensor_product.quad_xi_1d[::-1]
+    with pytest.raises(ValueError):
+        tensor_product.check_tensor_product_structure()
+
+    with pytest.raises(ValueError):
+        FE2DTensorProduct(
+            get_cells(), "quadrilateral", 4, "invalid_fe_type", 5, "gauss-jacobi", "bilinear"
+        )
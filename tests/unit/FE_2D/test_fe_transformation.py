@@ -0,0 +1,108 @@
+# Added test cases for validating the batched FE transformation kernels.
+# The batched kernels are compared against the per-cell transformations for affine and bilinear cells.
+
+import pytest
+import numpy as np
+
+from fastvpinns.FE.quad_affine import QuadAffin
+from fastvpinns.FE.quad_bilinear import QuadBilinear
+
+
+@pytest.fixture
+def cells_and_reference_values():
+    """Returns a set of cells, quadrature points and random reference derivatives."""
+    cells = np.array(
+        [
+            [[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]],
+            [[0.0, 0.0], [2.0, 0.5], [2.5, 2.0], [0.5, 1.5]],
+            [[0.0, 0.0], [1.2, 0.1], [1.0, 0.9], [-0.1, 1.1]],
+        ],
+        dtype=np.float64,
+    )
+    nodes = np.polynomial.legendre.leggauss(4)[0]
+    xi, eta = np.meshgrid(nodes, nodes)
+    xi, eta = xi.flatten(), eta.flatten()
+
+    rng = np.random.default_rng(0)
+    reference_values = [rng.standard_normal((9, xi.shape[0])) for _ in range(5)]
+
+    return cells, xi, eta, reference_values
+
+
+@pytest.mark.parametrize("transformation", [QuadAffin, QuadBilinear])
+def test_batched_transformation(transformation, cells_and_reference_values):
+    """
+    Test case to validate that the batched transformation kernels return the same values as the
+    per-cell transformations.
+    """
+    cells, xi, eta, (gx, gy, gxx, gxy, gyy) = cells_and_reference_values
+
+    coordinates = transformation.get_original_from_ref_batch(cells, xi, eta)
+    jacobian = transformation.get_jacobian_batch(cells, xi, eta)
+    grad_x, grad_y = transformation.get_orig_from_ref_derivative_batch(cells, gx, gy, xi, eta)
+    grad_xx, grad_xy, grad_yy = transformation.get_orig_from_ref_second_derivative_batch(
+        cells, gxx, gxy, gyy, xi, eta
+    )
+
+    for cell_index, cell in enumerate(cells):
+        fe_transformation = transformation(cell)
+
+        expected = np.array(
+            [fe_transformation.get_original_from_ref(a, b) for a, b in zip(xi, eta)]
+        )
+        assert np.allclose(coordinates[cell_index], expected)
+
+        expected = np.broadcast_to(fe_transformation.get_jacobian(xi, eta), xi.shape)
+        assert np.allclose(jacobian[cell_index], expected)
+
+        expected = fe_transformation.get_orig_from_ref_derivative(gx, gy, xi, eta)
+        assert np.allclose(grad_x[cell_index], expected[0])
+        assert np.allclose(grad_y[cell_index], expected[1])
+
+        expected = fe_transformation.get_orig_from_ref_second_derivative(gxx, gxy, gyy, xi, eta)
+        assert np.allclose(grad_xx[cell_index], expected[0])
+        assert np.allclose(grad_xy[cell_index], expected[1])
+        assert np.allclose(grad_yy[cell_index], expected[2])
+
+
+def test_affine_derivatives_of_linear_function(cells_and_reference_values):
+    """
+    Test case to validate the affine derivative transformations with a function whose derivatives
+    in the original coordinates are known.
+    """
+    cells, xi, eta, _ = cells_and_reference_values
+
+    # parallelogram cell: u(x, y) = x^2 + 3xy, written in the reference coordinates
+    cell = cells[1]
+    fe_transformation = QuadAffin(cell)
+    xc1, xc2, yc1, yc2 = (
+        fe_transformation.xc1,
+        fe_transformation.xc2,
+        fe_transformation.yc1,
+        fe_transformation.yc2,
+    )
+
+    x, y = fe_transformation.get_original_from_ref(xi, eta)
+
+    # derivatives in the reference coordinates ( chain rule )
+    u_x, u_y = 2 * x + 3 * y, 3 * x
+    u_xi = u_x * xc1 + u_y * yc1
+    u_eta = u_x * xc2 + u_y * yc2
+    u_xx, u_xy, u_yy = 2.0, 3.0, 0.0
+    u_xixi = u_xx * xc1 * xc1 + 2 * u_xy * xc1 * yc1 + u_yy * yc1 * yc1
+    u_xieta = u_xx * xc1 * xc2 + u_xy * (yc1 * xc2 + xc1 * yc2) + u_yy * yc1 * yc2
+    u_etaeta = u_xx * xc2 * xc2 + 2 * u_xy * xc2 * yc2 + u_yy * yc2 * yc2
+
+    grad_x, grad_y = fe_transformation.get_orig_from_ref_derivative(
+        u_xi.reshape(1, -1), u_eta.reshape(1, -1), xi, eta
+    )
+    assert np.allclose(grad_x, u_x)
+    assert np.allclose(grad_y, u_y)
+
+    ones = np.ones((1, xi.shape[0]))
+    grad_xx, grad_xy, grad_yy = fe_transformation.get_orig_from_ref_second_derivative(
+        u_xixi * ones, u_xieta * ones, u_etaeta * ones, xi, eta
+    )
+    assert np.allclose(grad_xx, u_xx)
+    assert np.allclose(grad_xy, u_xy)
+    assert np.allclose(grad_yy, u_yy)
@@ -2,6 +2,7 @@
 # Added test cases for validating Quadrature routines by computing the areas.
 # The test cases are parametrized for different quadrature types and transformations.
 
+import math
 import pytest
 import numpy as np
 import tensorflow as tf
@@ -256,6 +257,81 @@ def test_dirichlet_boundary_data_vector():
 # check the cell number condition on get shape function and gradient routines
 
 
+def test_dirichlet_boundary_data_batched():
+    """Tests that the batched dirichlet boundary data matches the pointwise evaluation"""
+
+    Path("tests/dump").mkdir(parents=True, exist_ok=True)
+
+    domain = Geometry_2D("quadrilateral", "internal", 10, 10, "tests/dump")
+    cells, boundary_points = domain.generate_quad_mesh_internal(
+        x_limits=[0, 1], y_limits=[0, 1], n_cells_x=2, n_cells_y=2, num_boundary_points=10
+    )
+
+    # array-safe, scalar and pointwise-only (math) boundary functions
+    bound_function_dict = {
+        1000: lambda x, y: np.sin(x) + y,
+        1001: lambda x, y: 2.0,
+        1002: lambda x, y: math.exp(x) * y if x > 0.5 else y,
+        1003: lambda x, y: x * y,
+    }
+    bound_condition_dict = {
+        1000: "dirichlet",
+        1001: "dirichlet",
+        1002: "dirichlet",
+        1003: "dirichlet",
+    }
+
+    fespace = Fespace2D(
+        mesh=domain.mesh,
+        cells=cells,
+        boundary_points=boundary_points,
+        cell_type=domain.mesh_type,
+        fe_order=3,
+        fe_type="legendre",
+        quad_order=4,
+        quad_type="gauss-legendre",
+        fe_transformation_type="affine",
+        bound_function_dict=bound_function_dict,
+        bound_condition_dict=bound_condition_dict,
+        forcing_function=lambda x, y: np.ones_like(x),
+        output_path="tests/dump",
+        generate_mesh_plot=False,
+    )
+
+    x, y = fespace.generate_dirichlet_boundary_data()
+    expected_x = [pt for bound_pts in boundary_points.values() for pt in bound_pts]
+    expected_y = [
+        bound_function_dict[bound_id](pt[0], pt[1])
+        for bound_id, bound_pts in boundary_points.items()
+        for pt in bound_pts
+    ]
+
+    assert x.shape == (len(expected_x), 2) and y.shape == (len(expected_x), 1)
+    assert x.flags["C_CONTIGUOUS"] and y.flags["C_CONTIGUOUS"]
+    assert np.allclose(x, expected_x)
+    assert np.allclose(y[:, 0], expected_y)
+    assert fespace.total_dirichlet_dofs == len(expected_x)
+
+    # vector valued boundary functions
+    fespace.bound_function_dict = {
+        bound_id: lambda x, y: (x + y, x * y) for bound_id in bound_function_dict
+    }
+    x, y = fespace.generate_dirichlet_boundary_data_vector(1)
+    assert y.shape == (len(expected_x), 1)
+    assert np.allclose(y[:, 0], x[:, 0] * x[:, 1])
+
+    # boundary points of an external mesh, with the z-coordinate
+    fespace.boundary_points = {
+        bound_id: np.hstack([np.asarray(bound_pts), np.zeros((len(bound_pts), 1))])
+        for bound_id, bound_pts in boundary_points.items()
+    }
+    x, y = fespace.generate_dirichlet_boundary_data_vector(1)
+    assert x.shape == (len(expected_x), 2)
+    assert np.allclose(x, expected_x)
+
+    shutil.rmtree("tests/dump")
+
+
 def test_valid_cell_number():
     """Tests the invalid cell number condition"""
 
@@ -0,0 +1,93 @@
+# Added test cases for validating the recurrence based evaluation of the Jacobi polynomials
+# and the test functions of all the basis function classes.
+
+import pytest
+import numpy as np
+from scipy.special import jacobi
+
+from fastvpinns.FE.jacobi_recurrence import jacobi_polynomials, jacobi_polynomials_derivatives
+from fastvpinns.FE.basis_2d_QN_Jacobi import Basis2DQNJacobi
+from fastvpinns.FE.basis_2d_QN_Legendre import Basis2DQNLegendre
+from fastvpinns.FE.basis_2d_QN_Legendre_Special import Basis2DQNLegendreSpecial
+from fastvpinns.FE.basis_2d_QN_Chebyshev_2 import Basis2DQNChebyshev2
+
+
+@pytest.mark.parametrize("a, b", [(0, 0), (1, 1), (2, 2), (-0.5, -0.5), (0.5, 0.5), (0.3, -0.2)])
+def test_jacobi_polynomials_match_scipy(a, b):
+    """
+    Test case to validate the values and derivatives of the Jacobi polynomials against scipy.
+    """
+    x = np.linspace(-1, 1, 17)
+    values, first, second = jacobi_polynomials_derivatives(8, a, b, x)
+
+    assert values.shape == (9, 17)
+    for n in range(9):
+        assert np.allclose(values[n], jacobi(n, a, b)(x), rtol=1e-12, atol=1e-12)
+        assert np.allclose(first[n], jacobi(n, a, b).deriv()(x), rtol=1e-11, atol=1e-11)
+        assert np.allclose(second[n], jacobi(n, a, b).deriv(2)(x), rtol=1e-11, atol=1e-11)
+
+
+def test_jacobi_polynomials_edge_cases():
+    """
+    Test case to validate the Jacobi polynomials for a negative maximum degree and scalar points.
+    """
+    assert jacobi_polynomials(-1, 0, 0, [0.1, 0.2]).shape == (0, 2)
+    assert np.allclose(jacobi_polynomials(0, 1, 1, 0.5), [[1.0]])
+
+    # P_n(1) = binomial(n + a, n)
+    assert np.allclose(jacobi_polynomials(3, -0.5, -0.5, [1.0])[:, 0], [1.0, 0.5, 0.375, 0.3125])
+
+
+def legendre_test_functions(n_test, x):
+    """
+    Returns the test functions P_(n+1) - P_(n-1) and their derivatives, computed with scipy.
+    """
+    values = [jacobi(n + 1, 0, 0) - jacobi(n - 1, 0, 0) for n in range(1, n_test + 1)]
+    return [np.array([poly.deriv(k)(x) if k else poly(x) for poly in values]) for k in range(3)]
+
+
+def chebyshev_test_functions(n_test, x):
+    """
+    Returns the normalized Chebyshev test functions and their derivatives, computed with scipy.
+    """
+    p = lambda n: jacobi(n, -0.5, -0.5) * (1.0 / float(jacobi(n, -0.5, -0.5)(1.0)))
+    values = [p(n + 1) - p(n - 1) for n in range(1, n_test + 1)]
+    return [np.array([poly.deriv(k)(x) if k else poly(x) for poly in values]) for k in range(3)]
+
+
+@pytest.mark.parametrize("n_test", [1, 2, 3, 6])
+def test_basis_test_functions(n_test):
+    """
+    Test case to validate the 1D test functions of all the basis function classes against scipy.
+    """
+    x = np.linspace(-1, 1, 11)
+
+    legendre = legendre_test_functions(n_test, x)
+    basis = Basis2DQNLegendre(n_test**2)
+    assert np.allclose(basis.test_fcnx(n_test, x), legendre[0])
+    assert np.allclose(basis.test_fcny(n_test, x), legendre[0])
+    assert np.allclose(basis.dtest_fcn(n_test, x)[0], legendre[1])
+    assert np.allclose(basis.dtest_fcn(n_test, x)[1], legendre[2])
+
+    basis = Basis2DQNLegendreSpecial(n_test**2)
+    assert np.allclose(basis.test_fcn(n_test, x), legendre[0])
+    assert np.allclose(basis.test_grad_fcn(n_test, x), legendre[1])
+    assert np.allclose(basis.test_grad_grad_fcn(n_test, x), legendre[2])
+
+    chebyshev = chebyshev_test_functions(n_test, x)
+    basis = Basis2DQNChebyshev2(n_test**2)
+    assert np.allclose(basis.test_fcnx(n_test, x), chebyshev[0])
+    assert np.allclose(basis.test_fcny(n_test, x), chebyshev[0])
+    assert np.allclose(basis.dtest_fcn(n_test, x)[0], chebyshev[1])
+    assert np.allclose(basis.dtest_fcn(n_test, x)[1], chebyshev[2])
+
+    basis = Basis2DQNJacobi(n_test**2)
+    for n in range(n_test):
+        assert np.allclose(basis.test_fcnx(n_test, x)[n], jacobi(n, 0, 0)(x))
+        assert np.allclose(basis.dtest_fcn(n_test, x)[n], jacobi(n, 0, 0).deriv()(x))
+        assert np.allclose(basis.ddtest_fcn(n_test, x)[n], jacobi(n, 0, 0).deriv(2)(x))
+        assert np.allclose(basis.jacobi_wrapper(n, 1, 1, x), jacobi(n, 1, 1)(x))
+        assert np.allclose(basis.djacobi(n, 1, 1, x, 2), jacobi(n, 1, 1).deriv(2)(x))
+
+    with pytest.raises(ValueError):
+        basis.djacobi(2, 0, 0, x, 3)
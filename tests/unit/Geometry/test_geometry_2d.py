@@ -78,3 +78,35 @@ def test_plot_adaptive(mesh_generation_method):
         domain.write_vtk(solution, output_path, filename, data_names)
 
     shutil.rmtree("tests/dump")
+
+
+def test_plot_adaptive_mesh_cached_collection():
+    """
+    Test case for checking that the cell residual plot reuses the cached collection of the cells,
+    and only updates the colors of the cells.
+    """
+    Path("tests/dump").mkdir(parents=True, exist_ok=True)
+
+    domain = Geometry_2D("quadrilateral", "internal", 10, 10, "tests/dump")
+    cells, boundary_points = domain.generate_quad_mesh_internal(
+        x_limits=[0, 1], y_limits=[0, 1], n_cells_x=4, n_cells_y=3, num_boundary_points=100
+    )
+    residual = np.arange(cells.shape[0], dtype=np.float64)
+
+    domain.plot_adaptive_mesh(cells, residual, 0, dpi=50)
+    collection = domain.cell_residual_collection
+    assert Path("tests/dump/cell_residual_0.png").exists()
+    assert len(collection.get_paths()) == cells.shape[0]
+
+    domain.plot_adaptive_mesh(cells, 2.0 * residual, 1, dpi=50)
+    assert Path("tests/dump/cell_residual_1.png").exists()
+    assert domain.cell_residual_collection is collection
+    assert np.array_equal(collection.get_array(), 2.0 * residual)
+    assert collection.get_clim() == (0.0, 2.0 * residual[-1])
+
+    # a different mesh is drawn on a new figure
+    domain.plot_adaptive_mesh(cells[:5], residual[:5], 2, dpi=50)
+    assert domain.cell_residual_collection is not collection
+    assert len(domain.cell_residual_collection.get_paths()) == 5
+
+    shutil.rmtree("tests/dump")
@@ -45,6 +45,42 @@ def test_read_mesh(geometry_2d, boundary_sampling_method):
     shutil.rmtree("tests/dump")
 
 
+def test_read_mesh_matches_pointwise_ingest():
+    """
+    Test case to validate the batched ingest of read_mesh against the per-cell reordering of the points
+    and the per-edge sampling of the boundary points.
+    """
+    Path("tests/dump").mkdir(parents=True, exist_ok=True)
+
+    domain = Geometry_2D("quadrilateral", "external", 10, 10, "tests/dump")
+    cells, boundary_points = domain.read_mesh(
+        mesh_file="tests/support_files/circle_quad.mesh",
+        boundary_point_refinement_level=3,
+        bd_sampling_method="uniform",
+        refinement_level=0,
+    )
+
+    mesh = domain.mesh
+    expected_cells = mesh.points[mesh.cells_dict["quad"]][:, :, 0:2]
+    for i, cell in enumerate(expected_cells):
+        centroid = np.mean(cell, axis=0)
+        angles = np.arctan2(cell[:, 1] - centroid[1], cell[:, 0] - centroid[0])
+        expected_cells[i] = cell[np.argsort(angles)]
+    assert np.array_equal(cells, expected_cells)
+
+    expected_points = {}
+    boundary_coordinates = mesh.points[mesh.cells_dict["line"]]
+    for tag, edge in zip(mesh.cell_data["medit:ref"][0], boundary_coordinates):
+        new_points = np.linspace(edge[0], edge[1], pow(2, 3) + 1)
+        expected_points.setdefault(tag, []).append(new_points)
+
+    assert list(boundary_points.keys()) == list(expected_points.keys())
+    for tag, points in expected_points.items():
+        assert np.array_equal(boundary_points[tag], np.unique(np.vstack(points), axis=0))
+
+    shutil.rmtree("tests/dump")
+
+
 def test_read_mesh_invalid_file_extension(geometry_2d):
     """
     Test case for the read_mesh method of the Geometry_2D class with an invalid file extension.
@@ -134,3 +170,33 @@ def test_generate_quad_mesh_internal():
     assert cells.shape[0] == n_cells_x * n_cells_y
 
     shutil.rmtree("tests/dump")
+
+
+@pytest.mark.parametrize("n_cells_x, n_cells_y", [(1, 1), (4, 3), (7, 11)])
+def test_generate_quad_mesh_internal_structure(n_cells_x, n_cells_y):
+    """
+    Test case to validate the cells, the unique points and the connectivity of the internal mesh.
+    """
+    domain = Geometry_2D("quadrilateral", "internal", 10, 10, "tests/dump", is_optimized=True)
+    cells, _ = domain.generate_quad_mesh_internal(
+        x_limits=[-1, 2],
+        y_limits=[0, 0.5],
+        n_cells_x=n_cells_x,
+        n_cells_y=n_cells_y,
+        num_boundary_points=40,
+    )
+
+    x = np.linspace(-1, 2, n_cells_x + 1)
+    y = np.linspace(0, 0.5, n_cells_y + 1)
+    expected_cells = [
+        [[x[i], y[j]], [x[i + 1], y[j]], [x[i + 1], y[j + 1]], [x[i], y[j + 1]]]
+        for i in range(n_cells_x)
+        for j in range(n_cells_y)
+    ]
+    assert np.array_equal(cells, expected_cells)
+
+    # the mesh contains every grid point only once
+    points = domain.mesh.points
+    assert points.shape == ((n_cells_x + 1) * (n_cells_y + 1), 2)
+    assert np.unique(points, axis=0).shape[0] == points.shape[0]
+    assert np.array_equal(points[domain.mesh.cells_dict["quad"]], cells)
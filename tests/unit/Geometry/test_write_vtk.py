@@ -9,6 +9,7 @@ from fastvpinns.FE.fespace2d import Fespace2D
 from fastvpinns.data.datahandler2d import DataHandler2D
 
 import os
+import meshio
 import numpy as np
 from pathlib import Path
 
@@ -39,6 +40,33 @@ def test_write_vtk_internal():
     shutil.rmtree("tests/test_dump")
 
 
+def test_internal_vtk_from_structured_grid():
+    """
+    Test that the VTK file of the internal mesh is generated from the structured grid of the test points,
+    without generating a gmsh mesh file.
+    """
+    Path("tests/test_dump").mkdir(parents=True, exist_ok=True)
+
+    domain = Geometry_2D("quadrilateral", "internal", 7, 5, "tests/test_dump")
+    domain.generate_quad_mesh_internal(
+        x_limits=[0, 2], y_limits=[-1, 1], n_cells_x=4, n_cells_y=4, num_boundary_points=100
+    )
+
+    assert not os.path.exists(os.path.join("tests/test_dump", "internal.msh"))
+
+    mesh = meshio.read(os.path.join("tests/test_dump", "internal.vtk"))
+    test_points = domain.get_test_points()
+    assert np.array_equal(mesh.points[:, 0:2], test_points)
+    assert mesh.cells_dict["quad"].shape == ((7 - 1) * (5 - 1), 4)
+
+    # the solution is written on the same grid
+    domain.write_vtk(test_points, "tests/test_dump", "solution.vtk", ["x", "y"])
+    mesh = meshio.read(os.path.join("tests/test_dump", "solution.vtk"))
+    assert np.array_equal(mesh.point_data["y"].reshape(-1), test_points[:, 1])
+
+    shutil.rmtree("tests/test_dump")
+
+
 @pytest.mark.parametrize("mesh_generation_method", ["external", "internal"])
 def test_write_vtk_solution_mismatch(mesh_generation_method):
     """
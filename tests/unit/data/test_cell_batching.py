@@ -0,0 +1,203 @@
+# Added test cases for validating the uniform and the residual-driven sampling of the mini-batches of
+# cells, and the training step on a mini-batch of cells against the training step on all the cells.
+
+import numpy as np
+import pytest
+from pathlib import Path
+import shutil
+import tensorflow as tf
+
+from fastvpinns.Geometry.geometry_2d import Geometry_2D
+from fastvpinns.FE.fespace2d import Fespace2D
+from fastvpinns.data.datahandler2d import DataHandler2D
+from fastvpinns.data.cell_sampler import CellBatchSampler, ResidualImportanceSampler
+from fastvpinns.model.model import DenseModel
+from fastvpinns.physics.poisson2d import pde_loss_poisson
+
+
+def test_shuffled_epochs():
+    """
+    Test function for checking that every epoch visits every cell once, in a shuffled order.
+    """
+    sampler = CellBatchSampler(12, 4, seed=0)
+
+    batches = [sampler.next_batch().numpy() for _ in range(6)]
+    assert all(batch.shape == (4,) for batch in batches)
+    assert np.array_equal(np.sort(np.concatenate(batches[:3])), np.arange(12))
+    assert np.array_equal(np.sort(np.concatenate(batches[3:])), np.arange(12))
+    assert not np.array_equal(np.concatenate(batches[:3]), np.concatenate(batches[3:]))
+    assert sampler.epoch == 1
+
+    # without shuffling, the cells are visited in order, the incomplete batch is dropped
+    sampler = CellBatchSampler(10, 4, shuffle=False)
+    batches = [sampler.next_batch().numpy() for _ in range(3)]
+    assert np.array_equal(batches[1], [4, 5, 6, 7])
+    assert np.array_equal(batches[2], [0, 1, 2, 3])
+
+
+def test_scheduled_batch_size():
+    """
+    Test function for checking the batch size schedule, which is limited to the number of cells.
+    """
+    sampler = CellBatchSampler(20, lambda step: 2 * (step + 1), seed=1)
+
+    sizes = [sampler.next_batch().shape[0] for _ in range(12)]
+    assert sizes == [2, 4, 6, 8, 10, 12, 14, 16, 18, 20, 20, 20]
+
+    with pytest.raises(ValueError):
+        CellBatchSampler(20, 0)
+
+    with pytest.raises(ValueError):
+        CellBatchSampler(0, 4)
+
+
+def test_importance_sampler_is_unbiased():
+    """
+    Test function for checking that the cells are drawn in proportion to their residuals, and that
+    the weighted sum of the residuals of the batches is an unbiased estimate of the total residual.
+    """
+    residual = np.array([10.0, 1.0, 0.0, 5.0, 0.5, 3.5], dtype=np.float64)
+    sampler = ResidualImportanceSampler(6, 1000, uniform_fraction=0.2, dtype=tf.float64, seed=0)
+    sampler.refresh(residual)
+
+    probabilities = sampler.get_probabilities().numpy()
+    assert np.isclose(np.sum(probabilities), 1.0)
+    assert np.allclose(probabilities, 0.8 * residual / np.sum(residual) + 0.2 / 6)
+
+    estimates = []
+    counts = np.zeros(6)
+    for _ in range(50):
+        cell_ids, cell_weights = sampler.next_batch()
+        estimates.append(np.sum(cell_weights.numpy() * residual[cell_ids.numpy()]))
+        counts += np.bincount(cell_ids.numpy(), minlength=6)
+
+    assert sampler.step == 50
+    assert np.isclose(np.mean(estimates), np.sum(residual), rtol=1e-2)
+    assert np.allclose(counts / np.sum(counts), probabilities, atol=1e-2)
+
+    # moving average of the residuals of the sampled cells
+    sampler.update(tf.constant([0, 2]), tf.constant([2.0, 4.0], dtype=tf.float64))
+    assert np.allclose(sampler.residual_estimate.numpy(), [6.0, 1.0, 2.0, 5.0, 0.5, 3.5])
+
+    # uniform probabilities, if all the residuals vanish
+    sampler.refresh(np.zeros(6))
+    assert np.allclose(sampler.get_probabilities().numpy(), 1.0 / 6)
+
+
+@pytest.mark.parametrize(
+    "n_cells, batch_size, refresh_interval, uniform_fraction, momentum",
+    [
+        (0, 4, 10, 0.1, 0.5),
+        (10, 0, 10, 0.1, 0.5),
+        (10, 4, 0, 0.1, 0.5),
+        (10, 4, 10, 0.0, 0.5),
+        (10, 4, 10, 0.1, 1.0),
+    ],
+)
+def test_invalid_importance_sampler(
+    n_cells, batch_size, refresh_interval, uniform_fraction, momentum
+):
+    """
+    Test function for checking the behavior when invalid parameters are provided. It should raise a ValueError.
+    """
+    with pytest.raises(ValueError):
+        ResidualImportanceSampler(n_cells, batch_size, refresh_interval, uniform_fraction, momentum)
+
+
+def test_train_step_cells():
+    """
+    Test function for checking that the loss of the training step on a batch of cells is the
+    rescaled sum of the residuals of the cells of the batch.
+    """
+    output_folder = "tests/test_dump"
+    Path(output_folder).mkdir(parents=True, exist_ok=True)
+
+    domain = Geometry_2D("quadrilateral", "internal", 10, 10, output_folder)
+    cells, boundary_points = domain.generate_quad_mesh_internal(
+        x_limits=[0, 1], y_limits=[0, 1], n_cells_x=4, n_cells_y=3, num_boundary_points=40
+    )
+    fespace = Fespace2D(
+        mesh=domain.mesh,
+        cells=cells,
+        boundary_points=boundary_points,
+        cell_type=domain.mesh_type,
+        fe_order=3,
+        fe_type="jacobi",
+        quad_order=4,
+        quad_type="gauss-jacobi",
+        fe_transformation_type="bilinear",
+        bound_function_dict={key: lambda x, y: 0.0 * x for key in boundary_points},
+        bound_condition_dict={key: "dirichlet" for key in boundary_points},
+        forcing_function=lambda x, y: np.sin(np.pi * x) * np.sin(np.pi * y),
+        output_path=output_folder,
+        generate_mesh_plot=False,
+    )
+    datahandler = DataHandler2D(fespace, domain, dtype=tf.float64)
+    dirichlet_input, dirichlet_actual = datahandler.get_dirichlet_input()
+    bilinear_params_dict = datahandler.get_bilinear_params_dict_as_tensors(lambda: {"eps": 1.0})
+
+    model = DenseModel(
+        layer_dims=[2, 10, 10, 1],
+        learning_rate_dict={
+            "initial_learning_rate": 1e-3,
+            "use_lr_scheduler": False,
+            "decay_steps": 1000,
+            "decay_rate": 0.99,
+        },
+        params_dict={"n_cells": fespace.n_cells},
+        loss_function=pde_loss_poisson,
+        input_tensors_list=[datahandler.x_pde_list, dirichlet_input, dirichlet_actual],
+        orig_factor_matrices=[
+            datahandler.shape_val_mat_list,
+            datahandler.grad_x_mat_list,
+            datahandler.grad_y_mat_list,
+        ],
+        force_function_list=datahandler.forcing_function_list,
+        tensor_dtype=tf.float64,
+    )
+    weights = model.get_weights()
+
+    # residuals of all the cells with the initial weights
+    cells_residual = model.compute_cells_residual(
+        model.input_tensor,
+        model.pre_multiplier_val,
+        model.pre_multiplier_grad_x,
+        model.pre_multiplier_grad_y,
+        model.force_matrix,
+        bilinear_params_dict,
+    ).numpy()
+    full_loss = model.train_step(beta=10, bilinear_params_dict=bilinear_params_dict)
+    assert np.isclose(full_loss["loss_pde"].numpy(), np.sum(cells_residual))
+
+    # all the cells in a shuffled order
+    model.set_weights(weights)
+    cell_ids = tf.constant(np.random.default_rng(0).permutation(fespace.n_cells), dtype=tf.int32)
+    loss = model.train_step_cells(cell_ids, beta=10, bilinear_params_dict=bilinear_params_dict)
+    assert np.isclose(loss["loss_pde"].numpy(), full_loss["loss_pde"].numpy())
+    assert np.isclose(loss["loss"].numpy(), full_loss["loss"].numpy())
+
+    # a subset of the cells
+    model.set_weights(weights)
+    cell_ids = tf.constant([1, 5, 6, 10], dtype=tf.int32)
+    loss = model.train_step_cells(cell_ids, beta=10, bilinear_params_dict=bilinear_params_dict)
+    assert np.isclose(loss["loss_pde"].numpy(), 3.0 * np.sum(cells_residual[[1, 5, 6, 10]]))
+    assert np.allclose(loss["cells_residual"].numpy(), cells_residual[[1, 5, 6, 10]])
+
+    # importance weights of the cells
+    model.set_weights(weights)
+    cell_weights = tf.constant([0.5, 2.0, 1.0, 4.0], dtype=tf.float64)
+    loss = model.train_step_cells(
+        cell_ids, beta=10, bilinear_params_dict=bilinear_params_dict, cell_weights=cell_weights
+    )
+    assert np.isclose(
+        loss["loss_pde"].numpy(), np.sum(cell_weights.numpy() * cells_residual[[1, 5, 6, 10]])
+    )
+
+    # the importance sampler is refreshed with the residuals of all the cells at the first step
+    model.set_weights(weights)
+    sampler = ResidualImportanceSampler(fespace.n_cells, 4, dtype=tf.float64, seed=0)
+    model.train_step_importance(sampler, beta=10, bilinear_params_dict=bilinear_params_dict)
+    assert sampler.step == 1
+    assert model.get_cells_residual(bilinear_params_dict).shape == (12,)
+
+    shutil.rmtree(output_folder)
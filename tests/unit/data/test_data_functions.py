@@ -288,3 +288,172 @@ def test_num_test_points(setup_results):
         assert test_points.dtype == precision
         # check shape
         assert test_points.shape == (89 * 89, 2)
+
+
+@pytest.mark.parametrize("assembly_mode", ["cell", "vectorized"])
+def test_tensor_product_test_matrix_format(cd2d_test_data_internal, assembly_mode):
+    """
+    Test function for checking that the tensor-product test matrices are the same as the dense matrices.
+    """
+    bound_function_dict, bound_condition_dict, bilinear_params, rhs, exact_solution = (
+        cd2d_test_data_internal
+    )
+    output_folder = "tests/test_dump"
+    Path(output_folder).mkdir(parents=True, exist_ok=True)
+
+    domain = Geometry_2D("quadrilateral", "internal", 10, 10, output_folder)
+    cells, boundary_points = domain.generate_quad_mesh_internal(
+        x_limits=[0, 1], y_limits=[0, 1], n_cells_x=3, n_cells_y=2, num_boundary_points=100
+    )
+
+    fespace = Fespace2D(
+        mesh=domain.mesh,
+        cells=cells,
+        boundary_points=boundary_points,
+        cell_type=domain.mesh_type,
+        fe_order=4,
+        fe_type="jacobi",
+        quad_order=5,
+        quad_type="gauss-jacobi",
+        fe_transformation_type="bilinear",
+        bound_function_dict=bound_function_dict,
+        bound_condition_dict=bound_condition_dict,
+        forcing_function=rhs,
+        output_path=output_folder,
+        generate_mesh_plot=False,
+        assembly_mode=assembly_mode,
+    )
+
+    datahandler_dense = DataHandler2D(fespace, domain, dtype=tf.float64)
+    datahandler_tp = DataHandler2D(
+        fespace, domain, dtype=tf.float64, test_matrix_format="tensor_product"
+    )
+
+    for name in ["shape_val_mat_list", "grad_x_mat_list", "grad_y_mat_list"]:
+        dense = getattr(datahandler_dense, name)
+        tensor_product = getattr(datahandler_tp, name)
+        assert tensor_product.shape == dense.shape
+        assert tensor_product.dtype == tf.float64
+        assert np.allclose(tensor_product.to_dense().numpy(), dense.numpy(), atol=1e-14)
+
+    assert np.allclose(datahandler_tp.x_pde_list.numpy(), datahandler_dense.x_pde_list.numpy())
+    assert np.allclose(
+        datahandler_tp.forcing_function_list.numpy(),
+        datahandler_dense.forcing_function_list.numpy(),
+    )
+
+    with pytest.raises(ValueError):
+        DataHandler2D(fespace, domain, dtype=tf.float64, test_matrix_format="invalid_format")
+
+
+@pytest.mark.parametrize("test_matrix_format", ["affine", "auto"])
+def test_affine_test_matrix_format(cd2d_test_data_internal, test_matrix_format):
+    """
+    Test function for checking that the affine test matrices of a uniform mesh are the same as the dense matrices.
+    """
+    bound_function_dict, bound_condition_dict, bilinear_params, rhs, exact_solution = (
+        cd2d_test_data_internal
+    )
+    output_folder = "tests/test_dump"
+    Path(output_folder).mkdir(parents=True, exist_ok=True)
+
+    domain = Geometry_2D("quadrilateral", "internal", 10, 10, output_folder)
+    cells, boundary_points = domain.generate_quad_mesh_internal(
+        x_limits=[0, 1], y_limits=[0, 1], n_cells_x=3, n_cells_y=2, num_boundary_points=100
+    )
+
+    fespace = Fespace2D(
+        mesh=domain.mesh,
+        cells=cells,
+        boundary_points=boundary_points,
+        cell_type=domain.mesh_type,
+        fe_order=4,
+        fe_type="jacobi",
+        quad_order=5,
+        quad_type="gauss-jacobi",
+        fe_transformation_type="bilinear",
+        bound_function_dict=bound_function_dict,
+        bound_condition_dict=bound_condition_dict,
+        forcing_function=rhs,
+        output_path=output_folder,
+        generate_mesh_plot=False,
+    )
+
+    datahandler_dense = DataHandler2D(fespace, domain, dtype=tf.float64)
+    datahandler_affine = DataHandler2D(
+        fespace, domain, dtype=tf.float64, test_matrix_format=test_matrix_format
+    )
+
+    # the uniform mesh is made of rectangles, so the affine format is used
+    assert datahandler_affine.test_matrix_format == "affine"
+
+    for name in ["shape_val_mat_list", "grad_x_mat_list", "grad_y_mat_list"]:
+        dense = getattr(datahandler_dense, name)
+        affine = getattr(datahandler_affine, name)
+        assert affine.shape == dense.shape
+        assert affine.dtype == tf.float64
+        assert np.allclose(affine.to_dense().numpy(), dense.numpy(), atol=1e-13)
+
+
+@pytest.mark.parametrize("test_matrix_format", ["dense", "tensor_product", "affine"])
+def test_subdomain_data(cd2d_test_data_internal, test_matrix_format):
+    """
+    Test function for checking that the tensors of the subdomains are the tensors of their cells.
+    """
+    bound_function_dict, bound_condition_dict, bilinear_params, rhs, exact_solution = (
+        cd2d_test_data_internal
+    )
+    output_folder = "tests/test_dump"
+    Path(output_folder).mkdir(parents=True, exist_ok=True)
+
+    domain = Geometry_2D("quadrilateral", "internal", 10, 10, output_folder)
+    cells, boundary_points = domain.generate_quad_mesh_internal(
+        x_limits=[0, 1], y_limits=[0, 1], n_cells_x=4, n_cells_y=3, num_boundary_points=100
+    )
+
+    fespace = Fespace2D(
+        mesh=domain.mesh,
+        cells=cells,
+        boundary_points=boundary_points,
+        cell_type=domain.mesh_type,
+        fe_order=3,
+        fe_type="jacobi",
+        quad_order=4,
+        quad_type="gauss-jacobi",
+        fe_transformation_type="bilinear",
+        bound_function_dict=bound_function_dict,
+        bound_condition_dict=bound_condition_dict,
+        forcing_function=rhs,
+        output_path=output_folder,
+        generate_mesh_plot=False,
+    )
+
+    datahandler = DataHandler2D(
+        fespace, domain, dtype=tf.float64, test_matrix_format=test_matrix_format
+    )
+    partition = fespace.partition_cells(3)
+    subdomain_data = datahandler.get_subdomain_data(partition)
+
+    assert len(subdomain_data) == 3
+
+    n_quad = fespace.fe_cell[0].quad_actual_coordinates.shape[0]
+    x_pde = datahandler.x_pde_list.numpy().reshape(fespace.n_cells, n_quad, 2)
+    for part, data in enumerate(subdomain_data):
+        cell_ids = partition.part_cells[part]
+        assert np.array_equal(data["cell_ids"].numpy(), cell_ids)
+        assert np.array_equal(data["x_pde_list"].numpy(), x_pde[cell_ids].reshape(-1, 2))
+        assert np.array_equal(
+            data["forcing_function_list"].numpy(),
+            datahandler.forcing_function_list.numpy()[:, cell_ids],
+        )
+
+        for name in ["shape_val_mat_list", "grad_x_mat_list", "grad_y_mat_list"]:
+            full = getattr(datahandler, name)
+            if test_matrix_format != "dense":
+                full = full.to_dense()
+                data[name] = data[name].to_dense()
+            assert np.allclose(data[name].numpy(), full.numpy()[cell_ids], atol=1e-14)
+
+        assert np.array_equal(
+            data["interface"]["neighbour_parts"], partition.get_interface(part)["neighbour_parts"]
+        )
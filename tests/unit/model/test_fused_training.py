@@ -0,0 +1,187 @@
+# Added test cases for validating the fused training loop, which runs several training steps within a
+# single tf.function, against the same number of sequential training steps, and the XLA compiled
+# training step against the training step without XLA compilation.
+
+import numpy as np
+import pytest
+from pathlib import Path
+import shutil
+import tensorflow as tf
+
+from fastvpinns.Geometry.geometry_2d import Geometry_2D
+from fastvpinns.FE.fespace2d import Fespace2D
+from fastvpinns.data.datahandler2d import DataHandler2D
+from fastvpinns.model.fused_training import run_train_steps
+from fastvpinns.model.model import DenseModel
+from fastvpinns.model.model_inverse import DenseModel_Inverse
+from fastvpinns.physics.poisson2d import pde_loss_poisson
+from fastvpinns.physics.poisson2d_inverse import pde_loss_poisson_inverse
+
+
+@pytest.fixture
+def poisson_data():
+    """
+    Returns the data handler and the domain of the poisson problem on the unit square.
+    """
+    output_folder = "tests/test_dump"
+    Path(output_folder).mkdir(parents=True, exist_ok=True)
+
+    domain = Geometry_2D("quadrilateral", "internal", 10, 10, output_folder)
+    cells, boundary_points = domain.generate_quad_mesh_internal(
+        x_limits=[0, 1], y_limits=[0, 1], n_cells_x=3, n_cells_y=3, num_boundary_points=40
+    )
+    fespace = Fespace2D(
+        mesh=domain.mesh,
+        cells=cells,
+        boundary_points=boundary_points,
+        cell_type=domain.mesh_type,
+        fe_order=3,
+        fe_type="jacobi",
+        quad_order=4,
+        quad_type="gauss-jacobi",
+        fe_transformation_type="bilinear",
+        bound_function_dict={key: lambda x, y: 0.0 * x for key in boundary_points},
+        bound_condition_dict={key: "dirichlet" for key in boundary_points},
+        forcing_function=lambda x, y: np.sin(np.pi * x) * np.sin(np.pi * y),
+        output_path=output_folder,
+        generate_mesh_plot=False,
+    )
+    datahandler = DataHandler2D(fespace, domain, dtype=tf.float64)
+
+    yield datahandler, fespace
+
+    shutil.rmtree(output_folder)
+
+
+def get_model(datahandler, fespace, inverse=False, jit_compile=False):
+    """
+    Returns a model with a fixed initialization of the weights.
+    """
+    tf.keras.utils.set_random_seed(0)
+    dirichlet_input, dirichlet_actual = datahandler.get_dirichlet_input()
+    kwargs = {
+        "layer_dims": [2, 10, 10, 1],
+        "learning_rate_dict": {
+            "initial_learning_rate": 1e-3,
+            "use_lr_scheduler": False,
+            "decay_steps": 1000,
+            "decay_rate": 0.99,
+            "staircase": False,
+        },
+        "params_dict": {"n_cells": fespace.n_cells},
+        "input_tensors_list": [datahandler.x_pde_list, dirichlet_input, dirichlet_actual],
+        "orig_factor_matrices": [
+            datahandler.shape_val_mat_list,
+            datahandler.grad_x_mat_list,
+            datahandler.grad_y_mat_list,
+        ],
+        "force_function_list": datahandler.forcing_function_list,
+        "tensor_dtype": tf.float64,
+        "jit_compile": jit_compile,
+    }
+
+    if not inverse:
+        return DenseModel(loss_function=pde_loss_poisson, **kwargs)
+
+    sensor_points = tf.constant([[0.25, 0.5], [0.5, 0.5], [0.75, 0.25]], dtype=tf.float64)
+    sensor_values = tf.constant([[0.7], [1.0], [0.5]], dtype=tf.float64)
+    return DenseModel_Inverse(
+        loss_function=pde_loss_poisson_inverse,
+        sensor_list=[sensor_points, sensor_values],
+        inverse_params_dict=datahandler.get_inverse_params(lambda: {"eps": 2.0}),
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("inverse", [False, True])
+def test_train_n_steps_matches_train_step(poisson_data, inverse):
+    """
+    Test function for checking that the fused training steps record the same losses and reach the
+    same weights as the sequential training steps.
+    """
+    datahandler, fespace = poisson_data
+    bilinear_params_dict = datahandler.get_bilinear_params_dict_as_tensors(lambda: {"eps": 1.0})
+
+    model = get_model(datahandler, fespace, inverse)
+    losses = [
+        model.train_step(beta=10, bilinear_params_dict=bilinear_params_dict) for _ in range(5)
+    ]
+    sequential_loss = np.array([loss["loss"].numpy() for loss in losses]).reshape(-1)
+
+    model_fused = get_model(datahandler, fespace, inverse)
+    fused_loss = model_fused.train_n_steps(5, beta=10, bilinear_params_dict=bilinear_params_dict)
+
+    assert fused_loss["loss"].shape == (5,)
+    assert fused_loss["loss_dirichlet"].shape == (5,)
+    assert np.allclose(fused_loss["loss"].numpy(), sequential_loss)
+    for weight, weight_fused in zip(model.get_weights(), model_fused.get_weights()):
+        assert np.allclose(weight, weight_fused)
+
+    if inverse:
+        assert fused_loss["inverse_params"]["eps"].shape == (5,)
+        assert np.isclose(
+            fused_loss["inverse_params"]["eps"].numpy()[-1],
+            model_fused.inverse_params_dict["eps"].numpy(),
+        )
+
+    # the following chunk continues from the state of the previous chunk
+    fused_loss = model_fused.train_n_steps(3, beta=10, bilinear_params_dict=bilinear_params_dict)
+    for _ in range(3):
+        loss = model.train_step(beta=10, bilinear_params_dict=bilinear_params_dict)
+    assert fused_loss["loss"].shape == (3,)
+    assert np.isclose(fused_loss["loss"].numpy()[-1], np.reshape(loss["loss"].numpy(), []))
+
+
+def test_jit_compiled_train_step(poisson_data):
+    """
+    Test function for checking that the XLA compiled training step gives the same losses as the
+    training step without XLA compilation.
+    """
+    datahandler, fespace = poisson_data
+    bilinear_params_dict = datahandler.get_bilinear_params_dict_as_tensors(lambda: {"eps": 1.0})
+
+    model = get_model(datahandler, fespace)
+    losses = [
+        model.train_step(beta=10, bilinear_params_dict=bilinear_params_dict) for _ in range(3)
+    ]
+
+    model_xla = get_model(datahandler, fespace, jit_compile=True)
+    assert model_xla.jit_compile and not model.jit_compile
+    losses_xla = [
+        model_xla.train_step(beta=10, bilinear_params_dict=bilinear_params_dict) for _ in range(3)
+    ]
+
+    for loss, loss_xla in zip(losses, losses_xla):
+        assert np.isclose(loss["loss"].numpy(), loss_xla["loss"].numpy())
+
+    # the fused training loop runs the XLA compiled training step
+    fused_loss = model_xla.train_n_steps(2, beta=10, bilinear_params_dict=bilinear_params_dict)
+    assert fused_loss["loss"].shape == (2,)
+
+
+def test_run_train_steps_traces_once():
+    """
+    Test function for checking that the training step is traced once per trace of the fused training
+    loop, and that the loop is not traced again for a new number of steps given as a tensor.
+    """
+    counter = tf.Variable(0.0, dtype=tf.float64)
+    n_traces = []
+
+    def train_step():
+        n_traces.append(1)
+        counter.assign_add(1.0)
+        return {"loss": tf.reshape(counter * 2.0, [1, 1]), "nested": {"value": counter}}
+
+    @tf.function
+    def train_n_steps(n_steps):
+        return run_train_steps(train_step, n_steps)
+
+    output = train_n_steps(tf.constant(4, dtype=tf.int32))
+    assert len(n_traces) == 1
+    assert np.array_equal(output["loss"].numpy(), [2.0, 4.0, 6.0, 8.0])
+    assert np.array_equal(output["nested"]["value"].numpy(), [1.0, 2.0, 3.0, 4.0])
+
+    output = train_n_steps(tf.constant(2, dtype=tf.int32))
+    assert len(n_traces) == 1
+    assert train_n_steps.experimental_get_tracing_count() == 1
+    assert np.array_equal(output["loss"].numpy(), [10.0, 12.0])
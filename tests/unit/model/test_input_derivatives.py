@@ -0,0 +1,287 @@
+# Added test cases for validating the derivatives of the outputs of the networks with respect to their
+# inputs, which are back-propagated through the dense layers or computed in forward mode, against the
+# derivatives of the nested gradient tape, and the fused forward pass over several sets of points.
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from fastvpinns.model.input_derivatives import (
+    supports_dense_input_gradients,
+    dense_values_and_input_gradients,
+    fused_values_and_input_gradients,
+    forward_mode_input_gradients,
+    chain_input_gradients,
+    get_model_input_gradients,
+    get_fused_model_input_gradients,
+)
+from fastvpinns.model.model import DenseModel
+from fastvpinns.model.model_hard import DenseModel_Hard
+from fastvpinns.physics.poisson2d import pde_loss_poisson
+
+
+def get_layers(activation, n_outputs=1):
+    """
+    Returns the dense layers of a network with the given activation, built for two inputs.
+    """
+    tf.keras.utils.set_random_seed(0)
+    layer_list = [
+        tf.keras.layers.Dense(12, activation=activation, dtype=tf.float64),
+        tf.keras.layers.Dense(8, activation=activation, dtype=tf.float64),
+        tf.keras.layers.Dense(n_outputs, activation=None, dtype=tf.float64),
+    ]
+    for layer, input_dim in zip(layer_list, [2, 12, 8]):
+        layer.build((None, input_dim))
+        # random biases, so that the activations are not evaluated around zero only
+        layer.bias.assign(tf.random.normal(layer.bias.shape, dtype=tf.float64))
+
+    return layer_list
+
+
+def apply_layers(layer_list, inputs):
+    """
+    Applies the layers in order.
+    """
+    for layer in layer_list:
+        inputs = layer(inputs)
+
+    return inputs
+
+
+def tape_input_gradients(function, inputs, n_outputs):
+    """
+    Returns the outputs of the function and their derivatives with respect to the inputs, with a
+    gradient tape for every output.
+    """
+    with tf.GradientTape(persistent=True) as tape:
+        tape.watch(inputs)
+        outputs = function(inputs)
+        columns = [outputs[:, i] for i in range(n_outputs)]
+
+    gradients = [tape.gradient(column, inputs) for column in columns]
+
+    return outputs, [
+        tf.stack([gradient[:, dim] for gradient in gradients], axis=1) for dim in range(2)
+    ]
+
+
+@pytest.mark.parametrize(
+    "activation", ["tanh", "sigmoid", "softplus", "swish", "relu", "elu", "linear"]
+)
+@pytest.mark.parametrize("n_outputs", [1, 2])
+def test_dense_input_gradients(activation, n_outputs):
+    """
+    Test function for checking the analytic back-propagation of the derivatives through the dense layers.
+    """
+    layer_list = get_layers(activation, n_outputs)
+    inputs = tf.constant(np.random.default_rng(0).uniform(-1, 1, (50, 2)), dtype=tf.float64)
+
+    assert supports_dense_input_gradients(layer_list)
+
+    values, gradients = dense_values_and_input_gradients(layer_list, inputs)
+    values_tape, gradients_tape = tape_input_gradients(
+        lambda points: apply_layers(layer_list, points), inputs, n_outputs
+    )
+
+    assert values.shape == (50, n_outputs)
+    assert len(gradients) == 2
+    assert np.allclose(values.numpy(), values_tape.numpy())
+    for gradient, gradient_tape in zip(gradients, gradients_tape):
+        assert gradient.shape == (50, n_outputs)
+        assert np.allclose(gradient.numpy(), gradient_tape.numpy())
+
+
+def test_forward_mode_and_chained_input_gradients():
+    """
+    Test function for checking the derivatives computed in forward mode, for a whole function and for
+    a hard constraint function applied to the inputs and the outputs of the dense layers.
+    """
+    layer_list = get_layers("tanh")
+    inputs = tf.constant(np.random.default_rng(1).uniform(0, 1, (40, 2)), dtype=tf.float64)
+
+    def hard_constraint(points, values):
+        return points[:, 0:1] * (1.0 - points[:, 0:1]) * tf.sin(points[:, 1:2]) * values
+
+    def function(points):
+        return hard_constraint(points, apply_layers(layer_list, points))
+
+    values_tape, gradients_tape = tape_input_gradients(function, inputs, 1)
+
+    values, gradients = forward_mode_input_gradients(function, inputs)
+    assert np.allclose(values.numpy(), values_tape.numpy())
+    for gradient, gradient_tape in zip(gradients, gradients_tape):
+        assert np.allclose(gradient.numpy(), gradient_tape.numpy())
+
+    dense_values, dense_gradients = dense_values_and_input_gradients(layer_list, inputs)
+    values, gradients = chain_input_gradients(
+        hard_constraint, inputs, dense_values, dense_gradients
+    )
+    assert np.allclose(values.numpy(), values_tape.numpy())
+    for gradient, gradient_tape in zip(gradients, gradients_tape):
+        assert np.allclose(gradient.numpy(), gradient_tape.numpy())
+
+
+def test_weight_gradients_of_input_gradients():
+    """
+    Test function for checking that the gradients of a loss of the input derivatives with respect to
+    the weights match the gradients through the nested gradient tape.
+    """
+    layer_list = get_layers("tanh")
+    inputs = tf.constant(np.random.default_rng(2).uniform(-1, 1, (30, 2)), dtype=tf.float64)
+    weights = [weight for layer in layer_list for weight in layer.trainable_variables]
+
+    with tf.GradientTape() as tape:
+        values, (gradients_x, gradients_y) = dense_values_and_input_gradients(layer_list, inputs)
+        loss = tf.reduce_sum(tf.square(gradients_x + 2.0 * gradients_y) + values)
+
+    with tf.GradientTape() as tape_reference:
+        values_tape, (gradients_x_tape, gradients_y_tape) = tape_input_gradients(
+            lambda points: apply_layers(layer_list, points), inputs, 1
+        )
+        loss_tape = tf.reduce_sum(
+            tf.square(gradients_x_tape + 2.0 * gradients_y_tape) + values_tape
+        )
+
+    assert np.isclose(loss.numpy(), loss_tape.numpy())
+    for gradient, gradient_tape in zip(
+        tape.gradient(loss, weights), tape_reference.gradient(loss_tape, weights)
+    ):
+        assert np.allclose(gradient.numpy(), gradient_tape.numpy())
+
+
+def test_weight_gradients_through_tf_function_constraint():
+    """
+    Test function for checking the gradients with respect to the weights of a loss of the derivatives
+    of a hard constraint function, which is a tf.function, within a tf.function.
+    """
+    layer_list = get_layers("tanh")
+    inputs = tf.constant(np.random.default_rng(5).uniform(0, 1, (30, 2)), dtype=tf.float64)
+    weights = [weight for layer in layer_list for weight in layer.trainable_variables]
+
+    @tf.function
+    def hard_constraint(points, values):
+        return tf.tanh(4.0 * points[:, 0:1]) * tf.tanh(4.0 * (points[:, 1:2] - 1.0)) * values
+
+    @tf.function
+    def get_gradients():
+        with tf.GradientTape() as tape:
+            values, gradients = dense_values_and_input_gradients(layer_list, inputs)
+            _, (gradients_x, gradients_y) = chain_input_gradients(
+                hard_constraint, inputs, values, gradients
+            )
+            loss = tf.reduce_sum(tf.square(gradients_x) + tf.square(gradients_y))
+        return tape.gradient(loss, weights)
+
+    with tf.GradientTape() as tape_reference:
+        _, (gradients_x_tape, gradients_y_tape) = tape_input_gradients(
+            lambda points: hard_constraint.python_function(
+                points, apply_layers(layer_list, points)
+            ),
+            inputs,
+            1,
+        )
+        loss_tape = tf.reduce_sum(tf.square(gradients_x_tape) + tf.square(gradients_y_tape))
+
+    for gradient, gradient_tape in zip(
+        get_gradients(), tape_reference.gradient(loss_tape, weights)
+    ):
+        assert np.allclose(gradient.numpy(), gradient_tape.numpy())
+
+
+def test_fused_values_and_input_gradients():
+    """
+    Test function for checking that the fused forward pass over several sets of points gives the same
+    outputs and derivatives as the separate evaluation of every set.
+    """
+    layer_list = get_layers("tanh", 2)
+    rng = np.random.default_rng(4)
+    points_list = [
+        tf.constant(rng.uniform(-1, 1, (n_points, 2)), dtype=tf.float64) for n_points in [30, 7, 3]
+    ]
+
+    values_list, gradients = fused_values_and_input_gradients(
+        layer_list, tf.concat(points_list, axis=0), [30, 7, 3]
+    )
+    values, gradients_separate = dense_values_and_input_gradients(layer_list, points_list[0])
+
+    assert len(values_list) == 3
+    assert np.allclose(values_list[0].numpy(), values.numpy())
+    for gradient, gradient_separate in zip(gradients, gradients_separate):
+        assert gradient.shape == (30, 2)
+        assert np.allclose(gradient.numpy(), gradient_separate.numpy())
+    for values, points in zip(values_list[1:], points_list[1:]):
+        assert np.allclose(values.numpy(), apply_layers(layer_list, points).numpy())
+
+
+def test_unsupported_layers():
+    """
+    Test function for checking that the networks with other layers or activations are not propagated
+    analytically.
+    """
+    assert not supports_dense_input_gradients([])
+    assert not supports_dense_input_gradients(
+        [tf.keras.layers.Dense(4, activation=lambda x: tf.sin(x))]
+    )
+    assert not supports_dense_input_gradients([tf.keras.layers.Attention()])
+
+
+@pytest.mark.parametrize("model_class", [DenseModel, DenseModel_Hard])
+@pytest.mark.parametrize("forward_mode", [False, True])
+def test_model_input_gradients(model_class, forward_mode):
+    """
+    Test function for checking the input derivatives of the models, which are propagated through the
+    dense layers (with the hard constraint applied in forward mode), or computed in forward mode for
+    the models with other layers, also along with the outputs at the dirichlet points.
+    """
+    rng = np.random.default_rng(3)
+    n_cells, n_test, n_quad = 4, 3, 5
+    points = tf.constant(rng.uniform(0, 1, (n_cells * n_quad, 2)), dtype=tf.float64)
+    test_matrix = tf.constant(rng.uniform(size=(n_cells, n_test, n_quad)), dtype=tf.float64)
+
+    kwargs = {
+        "layer_dims": [2, 10, 10, 1],
+        "learning_rate_dict": {
+            "initial_learning_rate": 1e-3,
+            "use_lr_scheduler": False,
+            "decay_steps": 1000,
+            "decay_rate": 0.99,
+            "staircase": False,
+        },
+        "params_dict": {"n_cells": n_cells},
+        "loss_function": pde_loss_poisson,
+        "input_tensors_list": [points, points[:3], tf.zeros((3, 1), dtype=tf.float64)],
+        "orig_factor_matrices": [test_matrix, test_matrix, test_matrix],
+        "force_function_list": tf.zeros((n_test, n_cells), dtype=tf.float64),
+        "tensor_dtype": tf.float64,
+    }
+    if model_class is DenseModel_Hard:
+
+        def hard_constraint(inputs, x):
+            inputs = tf.cast(inputs, x.dtype)
+            return inputs[:, 0:1] * (1.0 - inputs[:, 0:1]) * x
+
+        kwargs["hard_constraint_function"] = hard_constraint
+
+    model = model_class(**kwargs)
+    assert model.dense_input_gradients
+    model.dense_input_gradients = not forward_mode
+
+    values, gradients = get_model_input_gradients(
+        model, points, getattr(model, "hard_constraint_function", None)
+    )
+    values_tape, gradients_tape = tape_input_gradients(model, points, 1)
+
+    assert np.allclose(values.numpy(), values_tape.numpy())
+    for gradient, gradient_tape in zip(gradients, gradients_tape):
+        assert np.allclose(gradient.numpy(), gradient_tape.numpy())
+
+    if model_class is DenseModel:
+        # the dirichlet points are evaluated in the same forward pass as the quadrature points
+        assert model.fused_input_tensor.shape == (n_cells * n_quad + 3, 2)
+        values, gradients, (values_dirichlet,) = get_fused_model_input_gradients(
+            model, points, [model.dirichlet_input], model.fused_input_tensor
+        )
+        assert np.allclose(values.numpy(), values_tape.numpy())
+        assert np.allclose(values_dirichlet.numpy(), model(model.dirichlet_input).numpy())
+        for gradient, gradient_tape in zip(gradients, gradients_tape):
+            assert np.allclose(gradient.numpy(), gradient_tape.numpy())
@@ -0,0 +1,41 @@
+import math
+import numpy as np
+import pytest
+from fastvpinns.utils.compute_utils import evaluate_function_at_points
+
+
+# Create a fixture for the points
+@pytest.fixture
+def points():
+    x = np.linspace(0, 1, 12).reshape(3, 4)
+    y = np.linspace(-1, 2, 12).reshape(3, 4)
+    return x, y
+
+
+def test_evaluate_array_safe_function(points):
+    x, y = points
+    values = evaluate_function_at_points(lambda x, y: np.sin(x) * y, x, y)
+    assert values.shape == x.shape
+    assert np.allclose(values, np.sin(x) * y)
+
+
+def test_evaluate_constant_function(points):
+    x, y = points
+    values = evaluate_function_at_points(lambda x, y: 2.0, x, y)
+    assert values.shape == x.shape
+    assert np.allclose(values, 2.0)
+
+
+@pytest.mark.parametrize(
+    "function",
+    [
+        lambda x, y: math.sin(x) * y,  # raises TypeError for arrays
+        lambda x, y: x * y if x > 0.5 else x + y,  # raises ValueError for arrays
+    ],
+)
+def test_evaluate_pointwise_fallback(points, function):
+    x, y = points
+    values = evaluate_function_at_points(function, x, y)
+    expected = np.array([function(a, b) for a, b in zip(x.flatten(), y.flatten())])
+    assert values.shape == x.shape
+    assert np.allclose(values.flatten(), expected)
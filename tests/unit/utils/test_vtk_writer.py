@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+import meshio
+import xml.etree.ElementTree as ET
+from fastvpinns.utils.vtk_writer import write_legacy_vtk, write_vtu, SolutionWriter
+
+
+# Create a fixture for a small quadrilateral mesh with the point data
+@pytest.fixture
+def mesh():
+    x, y = np.meshgrid(np.linspace(0, 1, 4), np.linspace(0, 2, 3))
+    points = np.column_stack([x.reshape(-1), y.reshape(-1)])
+    index = np.arange(12).reshape(3, 4)[:-1, :-1].reshape(-1)
+    connectivity = np.column_stack([index, index + 1, index + 5, index + 4])
+    solution = np.column_stack([np.sin(points[:, 0]), points[:, 1]])
+    return points, connectivity, solution
+
+
+@pytest.mark.parametrize("writer, extension", [(write_legacy_vtk, "vtk"), (write_vtu, "vtu")])
+def test_write_binary_files(tmp_path, mesh, writer, extension):
+    points, connectivity, solution = mesh
+    file_name = tmp_path / f"solution.{extension}"
+    writer(file_name, points, connectivity, {"u": solution[:, 0], "v": solution[:, 1]})
+
+    result = meshio.read(file_name)
+    assert np.array_equal(result.points[:, 0:2], points)
+    assert np.array_equal(result.cells_dict["quad"], connectivity)
+    assert np.array_equal(result.point_data["u"].reshape(-1), solution[:, 0])
+    assert np.array_equal(result.point_data["v"].reshape(-1), solution[:, 1])
+
+
+def test_solution_writer_vtu_series(tmp_path, mesh):
+    points, connectivity, solution = mesh
+    writer = SolutionWriter(points, connectivity, str(tmp_path), "vtu", "prediction")
+    for epoch in range(3):
+        writer(solution * (epoch + 1), ["u", "v"], time=100 * epoch)
+
+    datasets = ET.parse(tmp_path / "prediction.pvd").getroot().findall(".//DataSet")
+    assert [dataset.attrib["timestep"] for dataset in datasets] == ["0", "100", "200"]
+
+    result = meshio.read(tmp_path / datasets[-1].attrib["file"])
+    assert np.array_equal(result.point_data["v"].reshape(-1), 3 * solution[:, 1])
+
+
+def test_solution_writer_xdmf_series(tmp_path, mesh):
+    points, connectivity, solution = mesh
+    writer = SolutionWriter(points, connectivity, str(tmp_path), "xdmf", "prediction")
+    for epoch in range(3):
+        writer.write_step(solution * (epoch + 1), ["u", "v"])
+
+    # the geometry is written once, and one data block is appended per step
+    binary_size = (tmp_path / "prediction.bin").stat().st_size
+    assert binary_size == points.nbytes + connectivity.size * 8 + 3 * solution.nbytes
+
+    def read_item(item, dtype):
+        dims = [int(dim) for dim in item.attrib["Dimensions"].split()]
+        offset = int(item.attrib["Seek"])
+        values = np.fromfile(tmp_path / item.text, dtype=dtype, count=np.prod(dims), offset=offset)
+        return values.reshape(dims)
+
+    grids = ET.parse(tmp_path / "prediction.xdmf").getroot().findall(".//Grid[@Name='mesh']")
+    assert len(grids) == 3
+    for step, grid in enumerate(grids):
+        assert np.array_equal(read_item(grid.find("Geometry/DataItem"), "<f8"), points)
+        assert np.array_equal(read_item(grid.find("Topology/DataItem"), "<i8"), connectivity)
+        values = read_item(grid.find("Attribute[@Name='u']/DataItem"), "<f8")
+        assert np.array_equal(values, (step + 1) * solution[:, 0])
+
+
+def test_solution_writer_invalid_input(tmp_path, mesh):
+    points, connectivity, solution = mesh
+    with pytest.raises(ValueError):
+        SolutionWriter(points, connectivity, str(tmp_path), "vtk")
+
+    writer = SolutionWriter(points, connectivity, str(tmp_path))
+    with pytest.raises(ValueError):
+        writer(solution, ["u", "v", "w"])
+    with pytest.raises(ValueError):
+        writer(solution[:-1], ["u", "v"])